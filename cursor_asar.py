@@ -0,0 +1,269 @@
+import os
+import re
+import json
+import mmap
+import struct
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# asar 파일 무결성 정보의 블록 크기 (Electron 기본값)
+INTEGRITY_BLOCK_SIZE = 4 * 1024 * 1024
+
+# 변경되지 않은 항목을 복사할 때의 단위
+COPY_CHUNK_SIZE = 16 * 1024 * 1024
+
+# 압축 해제 없이 번들만 꺼내 작업할 디렉토리
+STAGING_DIR = Path.home() / '.cache' / 'cursor_translator' / 'asar'
+
+# Electron 실행 파일의 퓨즈 표시 (이어서 버전 1바이트, 퓨즈 수 1바이트, 퓨즈마다 '0'/'1'/'r')
+FUSE_SENTINEL = b'dL7pKGdnNz796PbbjQWNKmHXBZaB9tsX'
+FUSE_ASAR_INTEGRITY = 4  # EnableEmbeddedAsarIntegrityValidation
+
+# Windows 실행 파일의 INTEGRITY 리소스에 들어 있는 app.asar 헤더 해시 항목
+_WINDOWS_INTEGRITY_RE = re.compile(rb'"file"\s*:\s*"resources(?:\\\\|/)app\.asar"')
+
+
+class AsarIntegrityError(RuntimeError):
+    """Electron이 app.asar 헤더 해시를 검사하는 설치본의 아카이브를 다시 쓰려는 경우"""
+
+
+def integrity_protection(archive_path) -> List[str]:
+    """
+    Electron이 시작할 때 app.asar를 검사하는지 확인 (검사하는 설치본의 아카이브를 고치면 실행되지 않음)
+
+    macOS는 Info.plist의 ElectronAsarIntegrity, Windows는 실행 파일의 INTEGRITY 리소스,
+    모든 플랫폼은 실행 파일의 EnableEmbeddedAsarIntegrityValidation 퓨즈를 확인합니다.
+
+    Returns:
+        발견한 검사 설명 목록 (비어 있으면 검사하지 않는 설치본)
+    """
+    app_dir = Path(archive_path).resolve().parent.parent
+    found = []
+
+    plist = app_dir / 'Info.plist'
+    if plist.is_file() and b'ElectronAsarIntegrity' in plist.read_bytes():
+        found.append(f"{plist}의 ElectronAsarIntegrity")
+
+    executables = [path for path in app_dir.glob('*') if path.suffix.lower() == '.exe' or path.name.lower() == 'cursor']
+    executables += list((app_dir / 'MacOS').glob('*'))
+    for executable in executables:
+        if not executable.is_file() or executable.stat().st_size == 0:
+            continue
+        with open(executable, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = data.find(FUSE_SENTINEL)
+            if position >= 0:
+                fuses = position + len(FUSE_SENTINEL) + 2
+                if data[position + len(FUSE_SENTINEL) + 1] > FUSE_ASAR_INTEGRITY and \
+                        data[fuses + FUSE_ASAR_INTEGRITY:fuses + FUSE_ASAR_INTEGRITY + 1] == b'1':
+                    found.append(f"{executable}의 EnableEmbeddedAsarIntegrityValidation 퓨즈")
+            if executable.suffix.lower() == '.exe' and _WINDOWS_INTEGRITY_RE.search(data):
+                found.append(f"{executable}의 INTEGRITY 리소스")
+    return found
+
+
+def _integrity(data: bytes) -> Dict:
+    """asar 항목의 무결성 정보 (전체 SHA-256 + 블록별 SHA-256)"""
+    return {
+        'algorithm': 'SHA256',
+        'hash': hashlib.sha256(data).hexdigest(),
+        'blockSize': INTEGRITY_BLOCK_SIZE,
+        'blocks': [hashlib.sha256(data[i:i + INTEGRITY_BLOCK_SIZE]).hexdigest()
+                   for i in range(0, max(len(data), 1), INTEGRITY_BLOCK_SIZE)],
+    }
+
+
+class AsarArchive:
+    """
+    app.asar 읽기/쓰기
+
+    헤더(Chromium pickle로 감싼 JSON 색인)만 해석하고 파일 내용은 메모리 맵에서 바로 읽습니다.
+    쓰기는 바뀐 항목만 교체하고 나머지는 원래 순서대로 그대로 흘려 보내며, 헤더의 크기와 오프셋만 갱신합니다.
+    """
+
+    def __init__(self, archive_path):
+        self.archive_path = Path(archive_path)
+        self._file = open(self.archive_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            # [4][헤더 pickle 크기] [pickle 본문 크기][JSON 길이][JSON + 4바이트 정렬]
+            _, header_pickle_size, _, json_length = struct.unpack_from('<4I', self._map, 0)
+            self.header = json.loads(self._map[16:16 + json_length].decode('utf-8'))
+            self.base_offset = 8 + header_pickle_size
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def entries(self, node=None, prefix='') -> Iterator[Tuple[str, Dict]]:
+        """모든 파일 항목 ('/'로 구분된 경로, 항목 정보) - 디렉토리는 제외"""
+        node = node if node is not None else self.header
+        for name, child in node.get('files', {}).items():
+            path = f"{prefix}{name}"
+            if 'files' in child:
+                yield from self.entries(child, path + '/')
+            else:
+                yield path, child
+
+    def find(self, path: str) -> Optional[Dict]:
+        node = self.header
+        for part in path.strip('/').split('/'):
+            node = node.get('files', {}).get(part)
+            if node is None:
+                return None
+        return node if 'files' not in node else None
+
+    def find_file(self, name: str) -> Optional[str]:
+        """이름이 name인 첫 번째 파일의 아카이브 내 경로"""
+        for path, entry in self.entries():
+            if path.rsplit('/', 1)[-1] == name and 'offset' in entry and not entry.get('unpacked'):
+                return path
+        return None
+
+    def read(self, path: str) -> bytes:
+        """항목 내용 (압축 해제 없이 오프셋에서 바로 읽음)"""
+        entry = self.find(path)
+        if entry is None or 'offset' not in entry:
+            raise KeyError(f"아카이브에 없는 파일입니다: {path}")
+        start = self.base_offset + int(entry['offset'])
+        return self._map[start:start + entry['size']]
+
+    def write(self, output_path, replacements: Dict[str, bytes], force: bool = False):
+        """
+        바뀐 항목만 교체한 아카이브 쓰기 (임시 파일에 쓴 뒤 원자적으로 교체)
+
+        Args:
+            output_path: 저장할 경로 (원본 아카이브 경로여도 됨)
+            replacements: {아카이브 내 경로: 새 내용}
+            force: 설치본이 아카이브 무결성을 검사해도 원본 위치에 쓸지 여부
+
+        Raises:
+            AsarIntegrityError: 무결성을 검사하는 설치본의 아카이브를 덮어쓰려는 경우 (force가 아니면)
+        """
+        output_path = Path(output_path)
+        if not force and output_path.resolve() == self.archive_path.resolve():
+            # 헤더가 바뀌면 해시가 달라져 Cursor가 실행되지 않으므로 쓰기 전에 거부
+            protection = integrity_protection(self.archive_path)
+            if protection:
+                raise AsarIntegrityError(f"설치본이 app.asar 무결성을 검사하므로 아카이브를 고치지 않습니다: "
+                                         f"{', '.join(protection)}")
+
+        header = json.loads(json.dumps(self.header))
+        packed = []
+        for path, entry in self.entries(header):
+            if 'offset' in entry and not entry.get('unpacked'):
+                packed.append((int(entry['offset']), path, entry))
+        packed.sort(key=lambda item: item[0])
+
+        missing = set(replacements) - {path for _, path, _ in packed}
+        if missing:
+            raise KeyError(f"아카이브에 없는 파일입니다: {', '.join(sorted(missing))}")
+
+        # 새 오프셋 계산 (원래 순서 유지)
+        sources = []
+        offset = 0
+        for original_offset, path, entry in packed:
+            if path in replacements:
+                data = replacements[path]
+                entry['size'] = len(data)
+                if 'integrity' in entry:
+                    entry['integrity'] = _integrity(data)
+                sources.append(data)
+            else:
+                sources.append((self.base_offset + original_offset, entry['size']))
+            entry['offset'] = str(offset)
+            offset += entry['size']
+
+        header_json = json.dumps(header, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        padding = (4 - len(header_json) % 4) % 4
+        pickle_payload = struct.pack('<I', len(header_json)) + header_json + b'\0' * padding
+        header_pickle = struct.pack('<I', len(pickle_payload)) + pickle_payload
+
+        temp_file = output_path.with_name(output_path.name + '.tmp')
+        with open(temp_file, 'wb') as f:
+            f.write(struct.pack('<II', 4, len(header_pickle)))
+            f.write(header_pickle)
+            for source in sources:
+                if isinstance(source, bytes):
+                    f.write(source)
+                    continue
+                start, size = source
+                for position in range(start, start + size, COPY_CHUNK_SIZE):
+                    f.write(self._map[position:min(position + COPY_CHUNK_SIZE, start + size)])
+
+        if output_path.exists():
+            shutil.copymode(output_path, temp_file)
+        if output_path.resolve() == self.archive_path.resolve():
+            # Windows에서는 열려 있는 파일을 교체할 수 없으므로 먼저 닫음
+            self.close()
+        os.replace(temp_file, output_path)
+
+
+def find_asar_archive(cursor_path) -> Optional[Path]:
+    """Cursor 설치 경로 아래의 resources/app.asar"""
+    if not cursor_path:
+        return None
+    archive = Path(cursor_path) / 'resources' / 'app.asar'
+    return archive if archive.is_file() else None
+
+
+@contextmanager
+def staged_asar_file(archive_path, name='workbench.desktop.main.js', staging_dir=None):
+    """
+    아카이브에서 파일 하나만 꺼내 작업한 뒤, 바뀌었으면 아카이브에 다시 넣음
+
+    아카이브 전체를 풀지 않고 해당 항목만 오프셋에서 읽어 작업 디렉토리에 씁니다.
+
+    Yields:
+        작업할 로컬 파일 경로
+
+    Raises:
+        FileNotFoundError: 아카이브에 해당 파일이 없는 경우
+        AsarIntegrityError: 파일이 바뀌었지만 설치본이 아카이브 무결성을 검사하는 경우
+    """
+    archive_path = Path(archive_path)
+    with AsarArchive(archive_path) as archive:
+        inner_path = archive.find_file(name)
+        if not inner_path:
+            raise FileNotFoundError(f"{archive_path}에서 {name}을(를) 찾을 수 없습니다.")
+        original = archive.read(inner_path)
+
+    staging_dir = Path(staging_dir) if staging_dir else STAGING_DIR
+    key = hashlib.sha256(str(archive_path.resolve()).encode('utf-8')).hexdigest()[:16]
+    local_path = staging_dir / key / name
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(local_path, 'wb') as f:
+        f.write(original)
+    logger.info(f"{archive_path}에서 {inner_path}을(를) 꺼냈습니다 ({len(original)} 바이트)")
+    protection = integrity_protection(archive_path)
+    if protection:
+        logger.warning(f"이 설치본은 app.asar 무결성을 검사하므로 변경 내용을 아카이브에 다시 넣지 않습니다: "
+                       f"{', '.join(protection)}")
+
+    yield local_path
+
+    with open(local_path, 'rb') as f:
+        modified = f.read()
+    if modified == original:
+        return
+
+    with AsarArchive(archive_path) as archive:
+        archive.write(archive_path, {inner_path: modified})
+    logger.info(f"변경된 {inner_path}을(를) 아카이브에 다시 넣었습니다: {archive_path}")
@@ -0,0 +1,584 @@
+import os
+import json
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cursor_placeholders import protect, restore
+from cursor_normalize import expand_translation
+from cursor_memory import TranslationMemory
+from cursor_planner import pending_strings, schedule
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class BackendUnavailable(RuntimeError):
+    """
+    실행 도중 백엔드를 더 이상 쓸 수 없게 된 경우 (예: 모든 DeepL 키의 한도 소진)
+
+    항목별 실패와 달리 남은 배치도 모두 실패하므로 update_translation_json은 출력 파일을 쓰지 않고
+    중단하며, 저널에 기록된 배치는 다음 실행에서 이어받습니다.
+    """
+
+
+class TranslationBackend:
+    """
+    번역 백엔드 기본 클래스
+
+    하위 클래스는 batch_translate만 구현하면 되고, 처리 한도와 비용은 클래스 속성으로 선언합니다.
+    번역 파일 갱신(update_translation_json)과 배치 동시 요청(translate_batches)은 모든 백엔드가 공유합니다.
+    """
+
+    name = 'base'
+    max_batch_size = 50       # 요청 한 번에 보낼 수 있는 최대 항목 수
+    max_concurrency = 1       # 동시에 처리할 수 있는 최대 요청 수
+    cost_per_char = 0.0       # 문자당 비용 (EUR)
+    latency = 0.0             # 배치 하나의 예상 처리 시간 (초)
+    protects_placeholders = True  # 기계 번역 전에 자리표시자를 토큰으로 보호할지 여부
+    xml_placeholders = False      # 토큰을 XML 태그로 보낼지 여부 (태그 처리를 지원하는 엔진)
+
+    def is_available(self) -> bool:
+        """현재 환경에서 이 백엔드를 사용할 수 있는지 여부"""
+        return True
+
+    def batch_translate(self, texts: List[str], target_lang: str) -> List[str]:
+        """
+        텍스트 배치 번역
+
+        Args:
+            texts: 번역할 텍스트 목록
+            target_lang: 대상 언어 코드
+
+        Returns:
+            번역된 텍스트 목록 (번역하지 못한 항목은 원문 그대로)
+        """
+        raise NotImplementedError
+
+    def translate_text(self, text: str, target_lang: str) -> str:
+        """단일 텍스트 번역"""
+        if not text:
+            return ""
+        return self.batch_translate([text], target_lang)[0]
+
+    def is_miss(self, source: str, result: str) -> bool:
+        """번역 결과가 실제 번역이 아닌지 (다음 실행에서 다시 시도해야 하는지) 판단"""
+        return not result
+
+    def _translate_masked(self, texts: List[str], target_lang: str, context: Optional[str] = None) -> List[Optional[str]]:
+        """
+        토큰으로 보호된 텍스트 번역 (태그 처리나 문맥 옵션이 필요한 백엔드가 재정의)
+
+        요청이 실패한 항목은 원문 대신 None을 돌려주어야 합니다 (원문을 번역으로 저장하지 않도록).
+        """
+        return self.batch_translate(texts, target_lang)
+
+    def translate_protected(self, texts: List[str], target_lang: str, context: Optional[str] = None) -> List[Optional[str]]:
+        """
+        자리표시자({0}, ${name}, &&, \\n, HTML 태그, 단축키 등)를 토큰으로 보호하여 배치 번역
+
+        Args:
+            context: 번역에 참고할 문맥 (번역되지 않으며, 지원하지 않는 백엔드는 무시)
+
+        Returns:
+            번역된 텍스트 목록, 번역하지 못했거나 (요청 실패 포함) 토큰이 손실되거나 변형된 결과는
+            None (다음 실행에서 다시 시도)
+        """
+        if not self.protects_placeholders:
+            return [None if result is None or self.is_miss(text, result) else result
+                    for text, result in zip(texts, self.batch_translate(texts, target_lang))]
+
+        protected = [protect(text, xml=self.xml_placeholders) for text in texts]
+        translated = self._translate_masked([masked for masked, _ in protected], target_lang, context)
+
+        results = []
+        for text, (masked, tokens), result in zip(texts, protected, translated):
+            if result is None or self.is_miss(masked, result):
+                results.append(None)
+                continue
+            restored = restore(result, tokens, xml=self.xml_placeholders)
+            if restored is None:
+                logger.warning(f"자리표시자가 손상된 번역을 거부합니다: {text!r} -> {result!r}")
+            results.append(restored)
+        return results
+
+    def translate_batches(self, batches: List[Tuple[List[str], Optional[str]]],
+                          target_lang: str) -> Iterator[List[Optional[str]]]:
+        """
+        (텍스트 목록, 문맥) 배치들을 최대 max_concurrency개씩 동시에 translate_protected로 번역
+
+        결과는 입력 순서대로 돌려주므로 호출자는 배치가 끝날 때마다 저널에 기록할 수 있고,
+        끝났지만 아직 돌려주지 않은 배치는 동시 요청 수보다 많아지지 않습니다.
+        BackendUnavailable 등의 예외는 앞 배치의 결과를 모두 돌려준 뒤 전파되며,
+        아직 시작하지 않은 배치는 취소됩니다.
+        """
+        workers = min(self.max_concurrency, len(batches))
+        if workers <= 1:
+            for texts, context in batches:
+                yield self.translate_protected(texts, target_lang, context)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            window = deque()
+            try:
+                for texts, context in batches:
+                    window.append(executor.submit(self.translate_protected, texts, target_lang, context))
+                    if len(window) >= workers:
+                        yield window.popleft().result()
+                while window:
+                    yield window.popleft().result()
+            finally:
+                for future in window:
+                    future.cancel()
+
+    def estimate_cost(self, texts: List[str]) -> float:
+        """텍스트 목록을 번역하는 데 드는 예상 비용"""
+        return sum(len(text) for text in texts) * self.cost_per_char
+
+    def translate_file(self, input_file: str, output_file: str, target_lang: str) -> Tuple[int, int]:
+        """
+        파일 내 텍스트 번역
+
+        Args:
+            input_file: 번역할 텍스트가 있는 파일 경로
+            output_file: 번역 결과를 저장할 파일 경로
+            target_lang: 대상 언어 코드
+
+        Returns:
+            (번역된 항목 수, 총 항목 수)
+        """
+        if not os.path.exists(input_file):
+            logger.error(f"입력 파일이 존재하지 않습니다: {input_file}")
+            return (0, 0)
+
+        with open(input_file, 'r', encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+
+        translated = self.batch_translate(texts, target_lang)
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for text in translated:
+                f.write(f"{text}\n")
+
+        return (len(translated), len(texts))
+
+    def update_translation_json(self, template_file: str, output_file: str, target_lang: str,
+                                batch_size: Optional[int] = None, normalize: bool = True,
+                                memory: Optional[TranslationMemory] = None, fuzzy: Optional[str] = 'context',
+                                char_budget: Optional[int] = None) -> Tuple[int, int]:
+        """
+        번역 JSON 파일 업데이트
+
+        번역 결과는 배치가 끝날 때마다 저널 파일(<output_file>.journal.jsonl)에 한 줄씩 추가되고,
+        모든 배치가 끝나면 출력 JSON으로 정리됩니다. 중간에 중단되더라도 다시 실행하면
+        저널에 기록된 항목은 번역하지 않고 이어서 진행합니다.
+
+        Args:
+            template_file: 템플릿 JSON 파일 경로
+            output_file: 출력 JSON 파일 경로
+            target_lang: 대상 언어 코드
+            batch_size: 한 번에 번역 요청할 항목 수 (기본값: 백엔드의 max_batch_size)
+            normalize: 대소문자/공백/끝 문장 부호만 다른 문자열을 묶어 한 번만 번역할지 여부
+            memory: 비슷한 이전 원문을 찾을 번역 메모리 (기본값: 출력 파일의 기존 번역으로 생성)
+            fuzzy: 비슷한 이전 번역의 활용 방법
+                   'context' - 이전 원문과 번역을 문맥으로 함께 보내 배치 단위로 번역 (문맥은 과금되지 않음)
+                   'prefill' - API 호출 없이 이전 번역으로 채우고 <output_file>.fuzzy.json에 검토 대상으로 기록
+                   None - 사용하지 않음
+            char_budget: 이번 실행에서 번역 API로 보낼 최대 글자 수 (메뉴, 설정 문자열부터 배정하고
+                         나머지는 미번역으로 남겨 다음 실행에서 번역, None이면 제한 없음)
+
+        Returns:
+            (번역된 항목 수, 총 항목 수)
+
+        Raises:
+            BackendUnavailable: 실행 도중 백엔드를 쓸 수 없게 된 경우 (출력 파일은 그대로 두고 저널 유지)
+        """
+        if not os.path.exists(template_file):
+            logger.error(f"템플릿 파일이 존재하지 않습니다: {template_file}")
+            return (0, 0)
+
+        batch_size = batch_size or self.max_batch_size
+        journal_file = f"{output_file}.journal.jsonl"
+
+        # 기존 번역 파일 로드 (있는 경우)
+        existing_translations = {}
+        if os.path.exists(output_file):
+            try:
+                with open(output_file, 'r', encoding='utf-8') as f:
+                    existing_translations = json.load(f)
+            except Exception as e:
+                logger.warning(f"기존 번역 파일을 로드하는 중 오류 발생: {str(e)}")
+
+        # 템플릿 로드
+        with open(template_file, 'r', encoding='utf-8') as f:
+            template = json.load(f)
+
+        # 이전 실행에서 저널에 기록된 항목 (이어서 진행)
+        journaled = set(key for key, _ in self._read_journal(journal_file))
+        if journaled:
+            logger.info(f"저널에서 {len(journaled)}개 항목을 이어받습니다: {journal_file}")
+
+        # 번역 필요한 항목 선택 (이미 번역되었거나 저널에 있는 항목, 정규형이 같은 항목은 건너뛰기)
+        to_translate, groups, reused, similar, representatives = pending_strings(
+            template, existing_translations, target_lang, journaled, normalize, memory, fuzzy)
+        if len(groups) - len(reused) < len(to_translate):
+            logger.info(f"정규화: {len(to_translate)}개 중 {len(groups) - len(reused)}개만 번역합니다.")
+        if similar:
+            logger.info(f"번역 메모리: {len(similar)}개 항목에 비슷한 이전 번역이 있습니다 ({fuzzy}).")
+
+        # 메뉴, 설정 문자열부터 번역하고, 예산이 있으면 넘치는 항목은 다음 실행으로 미룸
+        billed = representatives + (list(similar) if fuzzy != 'prefill' else [])
+        scheduled, deferred = schedule({target_lang: billed}, char_budget)
+        if deferred[target_lang]:
+            logger.info(f"글자 수 예산 {char_budget:,}자: {len(deferred[target_lang])}개 항목을 다음 실행으로 미룹니다.")
+        allowed = set(scheduled[target_lang])
+        new_texts = set(representatives)
+        representatives = [text for text in scheduled[target_lang] if text in new_texts]
+        if fuzzy != 'prefill':
+            similar = {text: match for text, match in similar.items() if text in allowed}
+
+        # 배치 단위로 번역하고 즉시 저널에 기록 (BackendUnavailable은 병합 전에 그대로 전파되어
+        # 남은 항목이 원문으로 저장되지 않고, 완료된 배치는 저널에 남음)
+        if to_translate:
+            self._repair_journal(journal_file)
+            with open(journal_file, 'a', encoding='utf-8') as journal:
+                def write_group(members, source, translated):
+                    for key in members:
+                        value = expand_translation(key, source, translated)
+                        journal.write(json.dumps({'key': key, 'value': value}, ensure_ascii=False) + '\n')
+                        if memory is not None:
+                            memory.add(key, target_lang, value)
+
+                for representative, (source, translated) in reused.items():
+                    write_group(groups[representative], source, translated)
+
+                if fuzzy == 'prefill':
+                    for representative, (_, translated, _) in similar.items():
+                        write_group(groups[representative], representative, translated)
+                    self._save_fuzzy_review(f"{output_file}.fuzzy.json", groups, similar)
+                else:
+                    # 같은 이전 원문을 문맥으로 쓰는 항목끼리 모아 배치마다 한 번만 요청하고, 배치 안의
+                    # 이전 원문과 번역을 모두 문맥으로 보냄 (문맥은 과금되지 않음)
+                    matched = sorted(similar.items(), key=lambda item: item[1][0])
+                    batches = []
+                    for start in range(0, len(matched), batch_size):
+                        chunk = matched[start:start + batch_size]
+                        context = "\n".join(dict.fromkeys(f"{source}\n{translated}" for _, (source, translated, _) in chunk))
+                        batches.append(([representative for representative, _ in chunk], context))
+                    for (batch, _), translated_texts in zip(batches, self.translate_batches(batches, target_lang)):
+                        for representative, value in zip(batch, translated_texts):
+                            if value is None or self.is_miss(representative, value):
+                                continue
+                            write_group(groups[representative], representative, value)
+                        journal.flush()
+                        os.fsync(journal.fileno())
+
+                # 배치는 최대 max_concurrency개씩 동시에 요청하고, 끝난 순서가 아닌 요청 순서대로 저널에 기록
+                batches = [(representatives[start:start + batch_size], None)
+                           for start in range(0, len(representatives), batch_size)]
+                done = 0
+                for (batch, _), translated_texts in zip(batches, self.translate_batches(batches, target_lang)):
+                    for representative, value in zip(batch, translated_texts):
+                        # 번역되지 않았거나 거부된 항목은 미번역으로 남겨 다음 실행에서 다시 시도
+                        if value is None or self.is_miss(representative, value):
+                            continue
+                        write_group(groups[representative], representative, value)
+
+                    journal.flush()
+                    os.fsync(journal.fileno())
+                    done += len(batch)
+                    logger.info(f"번역 진행 중: {done}/{len(representatives)}")
+
+        # 저널 내용을 템플릿에 병합
+        for key, value in self._read_journal(journal_file):
+            if key in template and not existing_translations.get(key):
+                template[key] = value
+
+        # 기존 번역 추가
+        for key, value in existing_translations.items():
+            if key in template and value:
+                template[key] = value
+
+        # 키 기준으로 정렬하여 저장 (임시 파일에 쓴 뒤 교체하고 저널 삭제)
+        temp_file = f"{output_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({key: template[key] for key in sorted(template)}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, output_file)
+        if os.path.exists(journal_file):
+            os.remove(journal_file)
+
+        # 번역된 항목 수 계산
+        translated_count = sum(1 for value in template.values() if value)
+        return (translated_count, len(template))
+
+    @staticmethod
+    def _save_fuzzy_review(review_file: str, groups: Dict[str, List[str]], similar: Dict[str, Tuple[str, str, float]]):
+        """이전 번역으로 미리 채운 항목을 검토 목록에 추가 ({원문: {'source': 이전 원문, 'similarity': 유사도}})"""
+        review = {}
+        if os.path.exists(review_file):
+            try:
+                with open(review_file, 'r', encoding='utf-8') as f:
+                    review = json.load(f)
+            except Exception:
+                review = {}
+        for representative, (source, _, score) in similar.items():
+            for key in groups[representative]:
+                review[key] = {'source': source, 'similarity': round(score, 3)}
+        with open(review_file, 'w', encoding='utf-8') as f:
+            json.dump(review, f, ensure_ascii=False, indent=2)
+        logger.info(f"이전 번역으로 채운 {len(similar)}개 항목을 검토 목록에 기록했습니다: {review_file}")
+
+    @staticmethod
+    def _repair_journal(journal_file: str):
+        """
+        중단된 실행이 남긴 잘린 마지막 줄 정리 (이어서 추가한 첫 항목이 잘린 줄에 붙지 않도록)
+
+        마지막 줄이 완결된 항목이면 줄바꿈만 추가하고, 잘린 항목이면 잘라냅니다.
+        """
+        if not os.path.exists(journal_file):
+            return
+        with open(journal_file, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if not size:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            # 마지막 줄의 시작 위치 찾기 (저널은 배치마다 fsync하므로 잘린 줄은 짧음)
+            start = size
+            while start > 0:
+                step = min(start, 4096)
+                f.seek(start - step)
+                newline = f.read(step).rfind(b'\n')
+                if newline >= 0:
+                    start = start - step + newline + 1
+                    break
+                start -= step
+            f.seek(start)
+            try:
+                json.loads(f.read().decode('utf-8'))
+                f.write(b'\n')
+            except ValueError:
+                logger.warning(f"저널의 잘린 마지막 줄을 정리합니다: {journal_file}")
+                f.truncate(start)
+
+    @staticmethod
+    def _read_journal(journal_file: str):
+        """저널 파일의 (원문, 번역문) 항목을 순서대로 읽기 (마지막 줄이 잘린 경우 무시)"""
+        if not os.path.exists(journal_file):
+            return
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                yield entry['key'], entry['value']
+
+
+class DictionaryBackend(TranslationBackend):
+    """사전(용어집) 기반 오프라인 번역 백엔드 - 사전에 있는 문자열만 번역"""
+
+    name = 'dictionary'
+    max_batch_size = 10000
+    max_concurrency = 1
+    cost_per_char = 0.0
+    latency = 0.0
+    protects_placeholders = False  # 원문 그대로 사전을 조회
+
+    def __init__(self, dictionaries: Optional[Dict[str, Dict[str, str]]] = None, glossary_dir: Optional[str] = None):
+        """
+        Args:
+            dictionaries: {언어 코드: {원문: 번역문}} (기본값: 내장 샘플 번역)
+            glossary_dir: glossary_<lang>.json 용어집 파일이 있는 디렉토리 (선택사항)
+        """
+        if dictionaries is None:
+            from cursor_translator import DeepLTranslator
+            dictionaries = DeepLTranslator.SAMPLE_TRANSLATIONS
+        self.dictionaries = {lang.lower(): dict(entries) for lang, entries in dictionaries.items()}
+
+        if glossary_dir and os.path.isdir(glossary_dir):
+            for file_name in sorted(os.listdir(glossary_dir)):
+                if not (file_name.startswith('glossary_') and file_name.endswith('.json')):
+                    continue
+                lang = file_name[len('glossary_'):-len('.json')].lower()
+                try:
+                    with open(os.path.join(glossary_dir, file_name), 'r', encoding='utf-8') as f:
+                        entries = json.load(f)
+                    self.dictionaries.setdefault(lang, {}).update({k: v for k, v in entries.items() if v})
+                except Exception as e:
+                    logger.warning(f"용어집을 로드하는 중 오류 발생 ({file_name}): {str(e)}")
+
+    def batch_translate(self, texts: List[str], target_lang: str) -> List[str]:
+        entries = self.dictionaries.get(target_lang.lower(), {})
+        return [entries.get(text, text) for text in texts]
+
+    def is_miss(self, source: str, result: str) -> bool:
+        return not result or result == source
+
+
+class ArgosBackend(TranslationBackend):
+    """Argos Translate(CTranslate2) 기반 CPU 오프라인 번역 백엔드 (argostranslate 패키지 필요)"""
+
+    name = 'argos'
+    max_batch_size = 32
+    max_concurrency = 1   # CPU 모델은 프로세스 안에서 병렬 처리가 이득이 없음
+    cost_per_char = 0.0
+    latency = 5.0
+
+    def __init__(self, source_lang: str = 'en'):
+        self.source_lang = source_lang
+        self._translations = {}
+
+    def _get_translation(self, target_lang: str):
+        """설치된 언어 모델에서 source_lang -> target_lang 번역기 찾기"""
+        target_lang = target_lang.lower()
+        if target_lang not in self._translations:
+            try:
+                import argostranslate.translate
+                languages = {lang.code: lang for lang in argostranslate.translate.get_installed_languages()}
+                source = languages.get(self.source_lang)
+                target = languages.get(target_lang)
+                self._translations[target_lang] = source.get_translation(target) if source and target else None
+            except ImportError:
+                self._translations[target_lang] = None
+        return self._translations[target_lang]
+
+    def is_available(self) -> bool:
+        try:
+            import argostranslate.translate  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def batch_translate(self, texts: List[str], target_lang: str) -> List[str]:
+        translation = self._get_translation(target_lang)
+        if translation is None:
+            logger.warning(f"Argos 언어 모델이 설치되어 있지 않습니다: {self.source_lang} -> {target_lang}")
+            return list(texts)
+        return [translation.translate(text) if text else text for text in texts]
+
+    def is_miss(self, source: str, result: str) -> bool:
+        # 언어 모델이 없으면 원문이 그대로 돌아오므로 다음 백엔드로 넘김
+        return not result or result == source
+
+
+class FakeBackend(TranslationBackend):
+    """테스트용 결정적 백엔드 - 네트워크 없이 항상 같은 결과를 돌려줌"""
+
+    name = 'fake'
+    max_batch_size = 10000
+    max_concurrency = 1
+    cost_per_char = 0.0
+    latency = 0.0
+    protects_placeholders = False
+
+    def batch_translate(self, texts: List[str], target_lang: str) -> List[str]:
+        return [f"[{target_lang.lower()}] {text}" if text else text for text in texts]
+
+
+class BackendRouter(TranslationBackend):
+    """
+    여러 백엔드를 비용/지연 순으로 연결하는 스케줄러
+
+    각 배치는 가장 저렴한(또는 가장 빠른) 백엔드부터 차례로 거치며,
+    앞 단계에서 번역하지 못한 항목만 다음 백엔드로 넘어갑니다.
+    """
+
+    name = 'auto'
+
+    def __init__(self, backends: List[TranslationBackend], prefer: str = 'cost'):
+        """
+        Args:
+            backends: 사용할 백엔드 목록
+            prefer: 'cost'(비용 우선) 또는 'latency'(지연 우선)
+        """
+        available = [backend for backend in backends if backend.is_available()]
+        if prefer == 'latency':
+            key = lambda backend: (backend.latency, backend.cost_per_char)
+        else:
+            key = lambda backend: (backend.cost_per_char, backend.latency)
+        self.backends = sorted(available, key=key)
+        self.max_batch_size = min(backend.max_batch_size for backend in self.backends) if self.backends else 50
+        self.max_concurrency = max(backend.max_concurrency for backend in self.backends) if self.backends else 1
+        # 배치가 여러 스레드에서 동시에 번역되므로 백엔드마다 자신의 동시 요청 수만큼만 들여보내고,
+        # 백엔드 제외는 잠금 안에서 처리
+        self._slots = {backend: threading.BoundedSemaphore(backend.max_concurrency) for backend in self.backends}
+        self._lock = threading.Lock()
+        logger.info(f"번역 백엔드 순서: {' -> '.join(backend.name for backend in self.backends)}")
+
+    def batch_translate(self, texts: List[str], target_lang: str) -> List[str]:
+        return [result if result is not None else text
+                for text, result in zip(texts, self.translate_protected(texts, target_lang))]
+
+    def translate_protected(self, texts: List[str], target_lang: str, context: Optional[str] = None) -> List[Optional[str]]:
+        # 각 백엔드가 자신의 방식으로 자리표시자를 보호하도록 위임
+        results: List[Optional[str]] = [None] * len(texts)
+        pending = list(range(len(texts)))
+
+        for backend in list(self.backends):
+            if not pending:
+                break
+            try:
+                with self._slots[backend]:
+                    translated = backend.translate_protected([texts[i] for i in pending], target_lang, context)
+            except BackendUnavailable as e:
+                # 이번 실행에서는 다음 백엔드로만 보내고, 남은 백엔드가 없으면 호출자에게 알림
+                with self._lock:
+                    if backend in self.backends:
+                        logger.warning(f"{backend.name} 백엔드를 제외합니다: {str(e)}")
+                        self.backends.remove(backend)
+                    if not self.backends:
+                        raise
+                continue
+            remaining = []
+            for i, result in zip(pending, translated):
+                if result is None or backend.is_miss(texts[i], result):
+                    remaining.append(i)
+                else:
+                    results[i] = result
+            pending = remaining
+
+        # 어느 백엔드도 번역하지 못한 항목은 None (다음 실행에서 다시 시도)
+        return results
+
+    def is_miss(self, source: str, result: str) -> bool:
+        return not result or result == source
+
+    def estimate_cost(self, texts: List[str]) -> float:
+        # 최악의 경우 (모든 항목이 가장 비싼 백엔드까지 가는 경우)
+        return max((backend.estimate_cost(texts) for backend in self.backends), default=0.0)
+
+
+BACKEND_NAMES = ['auto', 'deepl', 'dictionary', 'argos', 'fake']
+
+
+def create_backend(name: str = 'deepl', api_key: Optional[str] = None, prefer: str = 'cost') -> TranslationBackend:
+    """
+    이름으로 번역 백엔드 생성
+
+    Args:
+        name: 'deepl', 'dictionary', 'argos', 'fake' 또는 'auto'(사용 가능한 백엔드를 모두 연결)
+        api_key: DeepL API 키 (deepl/auto에서 사용)
+        prefer: auto 모드의 라우팅 기준 ('cost' 또는 'latency')
+    """
+    from cursor_translator import DeepLTranslator
+
+    if name == 'deepl':
+        return DeepLTranslator(api_key)
+    if name == 'dictionary':
+        return DictionaryBackend()
+    if name == 'argos':
+        return ArgosBackend()
+    if name == 'fake':
+        return FakeBackend()
+    if name == 'auto':
+        backends = [DictionaryBackend(), ArgosBackend()]
+        if api_key:
+            backends.append(DeepLTranslator(api_key))
+        return BackendRouter(backends, prefer=prefer)
+
+    raise ValueError(f"알 수 없는 번역 백엔드입니다: {name}")
@@ -0,0 +1,198 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from cursor_patcher import patch_bundle, verify_patch
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 원본(번역하지 않은) 번들을 가리키는 언어 이름
+ORIGINAL = 'original'
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_stamp(path) -> list:
+    """파일을 다시 읽지 않고 바뀌었는지 판단할 값 (크기, 수정 시각, 변경 시각, inode)"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_ino]
+
+
+def translations_digest(translations: Dict[str, str]) -> str:
+    """번역 사전 내용의 해시 (키 순서와 무관)"""
+    return _sha256(json.dumps(translations, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+
+
+class BundleStore:
+    """
+    언어별로 미리 패치해 둔 번들 저장소
+
+    번들과 같은 디렉토리에 '원본 해시 + 번역 해시'로 이름 붙인 번들을 만들어 두고,
+    언어 전환 시 복사 후 이름 바꾸기 한 번으로 교체합니다.
+    Cursor 업데이트로 번들이 바뀌면 이전 원본으로 만든 번들은 자동으로 폐기됩니다.
+    """
+
+    def __init__(self, js_file_path, resolve_original: Optional[Callable[[bytes], bytes]] = None):
+        """
+        Args:
+            js_file_path: 설치된 workbench 번들 경로
+            resolve_original: 처음 보는 번들이 이미 패치되어 있을 때 원본을 복원하는 함수 (예: 역패치 기록 사용)
+        """
+        self.js_file_path = Path(js_file_path)
+        self.state_file = self.js_file_path.with_name(self.js_file_path.name + '.bundles.json')
+        self.resolve_original = resolve_original
+        self.state = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'source_sha256': None, 'current': None, 'bundles': {}}
+
+    def _save_state(self):
+        temp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.state_file)
+
+    def _bundle_path(self, name):
+        return self.js_file_path.with_name(f"{self.js_file_path.name}.{name}")
+
+    def _write_bundle(self, path, data):
+        temp_file = path.with_name(path.name + '.tmp')
+        with open(temp_file, 'wb') as f:
+            f.write(data)
+        shutil.copymode(self.js_file_path, temp_file)
+        os.replace(temp_file, path)
+
+    def _invalidate(self):
+        """이전 원본으로 만든 번들 모두 삭제"""
+        for entry in self.state['bundles'].values():
+            self._bundle_path(entry['file']).unlink(missing_ok=True)
+        self.state = {'source_sha256': None, 'current': None, 'bundles': {}}
+
+    def _read_original(self) -> bytes:
+        with open(self._bundle_path(self.state['bundles'][ORIGINAL]['file']), 'rb') as f:
+            return f.read()
+
+    def _record_installed(self):
+        """설치된 번들이 확인된 상태임을 기록 (다음 확인에서 크기와 시각이 같으면 해시 생략)"""
+        self.state['installed_stamp'] = _file_stamp(self.js_file_path)
+        self._save_state()
+
+    def refresh(self, load: bool = True) -> Optional[bytes]:
+        """
+        설치된 번들을 확인하여 원본 번들 데이터 반환
+
+        설치된 번들이 원본이나 미리 만든 번들 중 하나가 아니면 Cursor가 업데이트된 것으로 보고
+        저장소를 비운 뒤 새 원본을 등록합니다. 마지막 확인 이후 크기와 시각이 바뀌지 않았으면
+        설치된 번들을 읽거나 해시하지 않습니다.
+
+        Args:
+            load: 원본 번들 데이터가 필요한지 여부 (False이면 확인만 하고 None 반환 가능)
+        """
+        if ORIGINAL in self.state['bundles'] and self.state.get('installed_stamp') == _file_stamp(self.js_file_path):
+            return self._read_original() if load else None
+
+        with open(self.js_file_path, 'rb') as f:
+            data = f.read()
+        digest = _sha256(data)
+
+        if digest == self.state['source_sha256']:
+            self._record_installed()
+            return data
+
+        known = [entry['sha256'] for entry in self.state['bundles'].values()]
+        if self.state.get('installed_sha256'):
+            # 등록 당시 이미 패치되어 있던 번들
+            known.append(self.state['installed_sha256'])
+        if digest in known:
+            self._record_installed()
+            return self._read_original() if load else None
+
+        if self.state['source_sha256']:
+            logger.info("번들이 변경되어 미리 만든 언어별 번들을 폐기합니다.")
+        self._invalidate()
+
+        original = self.resolve_original(data) if self.resolve_original else data
+        source = _sha256(original)
+        name = f"{ORIGINAL}.{source[:12]}"
+        self._write_bundle(self._bundle_path(name), original)
+        self.state['source_sha256'] = source
+        self.state['current'] = ORIGINAL if original == data else None
+        self.state['installed_sha256'] = digest
+        self.state['bundles'][ORIGINAL] = {'file': name, 'sha256': source, 'translation_sha256': None}
+        self._record_installed()
+        return original
+
+    def build(self, language: str, translations: Dict[str, str]) -> Optional[Path]:
+        """
+        언어별 번들을 미리 패치하여 저장 (원본과 번역이 같으면 재사용)
+
+        Returns:
+            만들어진 번들 경로, 적용할 번역이 없으면 None
+
+        Raises:
+            ValueError: 패치된 리터럴 검증이나 치환 구간 주변 검증에 실패한 경우
+        """
+        source = self.refresh()
+        digest = translations_digest(translations)
+        entry = self.state['bundles'].get(language)
+        if entry and entry['translation_sha256'] == digest and self._bundle_path(entry['file']).exists():
+            logger.info(f"{language} 번들이 이미 최신입니다: {self._bundle_path(entry['file'])}")
+            return self._bundle_path(entry['file'])
+
+        patched, edits, regions = patch_bundle(source, translations)
+        if not edits:
+            logger.warning(f"{language}: 적용된 번역이 없어 번들을 만들지 않습니다.")
+            return None
+        # 전환할 때는 검증하지 않으므로 만들 때 설치본 패치와 같은 검증을 거침
+        problems = verify_patch(source, patched, edits, regions)
+        if problems:
+            raise ValueError(f"{language} 번들 검증 실패: {'; '.join(problems)}")
+
+        name = f"{language}.{self.state['source_sha256'][:12]}.{digest[:12]}"
+        path = self._bundle_path(name)
+        self._write_bundle(path, patched)
+        if entry and entry['file'] != name:
+            self._bundle_path(entry['file']).unlink(missing_ok=True)
+
+        self.state['bundles'][language] = {'file': name, 'sha256': _sha256(patched), 'translation_sha256': digest}
+        self._save_state()
+        logger.info(f"{language} 번들 생성 완료: {path} ({len(edits)}개 위치)")
+        return path
+
+    def switch(self, language: str) -> bool:
+        """
+        설치된 번들을 미리 만든 언어 번들로 교체 (복사 후 원자적 이름 바꾸기)
+
+        하드 링크로 교체하면 설치된 번들과 미리 만든 번들이 같은 inode를 공유하여, 설치된 번들을
+        제자리에서 고치는 도구가 미리 만든 번들까지 바꾸게 되므로 복사합니다.
+
+        Args:
+            language: 언어 코드 또는 ORIGINAL
+        """
+        self.refresh(load=False)
+        entry = self.state['bundles'].get(language)
+        if not entry or not self._bundle_path(entry['file']).exists():
+            logger.error(f"{language} 번들이 없습니다. 먼저 --build-bundles로 만드세요.")
+            return False
+
+        prebuilt = self._bundle_path(entry['file'])
+        temp_file = self.js_file_path.with_name(self.js_file_path.name + '.switch.tmp')
+        temp_file.unlink(missing_ok=True)
+        shutil.copy2(prebuilt, temp_file)
+        os.replace(temp_file, self.js_file_path)
+
+        self.state['current'] = language
+        self._record_installed()
+        logger.info(f"UI 언어 전환 완료: {language}")
+        return True
@@ -0,0 +1,164 @@
+import os
+import glob
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from cursor_normalize import canonical_key
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+TRANSLATION_FILE_PREFIX = 'cursor_translations_'
+TEMPLATE_LANGUAGE = 'template'
+
+
+class SourceTable:
+    """원문 문자열 <-> 정수 ID (원문마다 문자열 하나만 보관)"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, text: str) -> int:
+        """원문의 ID (처음 보는 원문이면 새로 등록)"""
+        source_id = self._ids.get(text)
+        if source_id is None:
+            source_id = len(self.strings)
+            self._ids[text] = source_id
+            self.strings.append(text)
+        return source_id
+
+    def lookup(self, text: str) -> Optional[int]:
+        """등록된 원문의 ID, 없으면 None"""
+        return self._ids.get(text)
+
+    def __getitem__(self, source_id: int) -> str:
+        return self.strings[source_id]
+
+    def __contains__(self, text) -> bool:
+        return text in self._ids
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class TranslationCatalog:
+    """
+    여러 언어의 번역 사전을 하나의 원문 표 위에 보관
+
+    영어 원문은 SourceTable에 한 번만 저장하고, 언어마다 원문 ID 위치에 번역문을 두는
+    목록(번역이 없으면 None)만 가집니다. 언어 간 비교나 번역률 계산은 ID 단위로 처리합니다.
+    """
+
+    def __init__(self, sources: Optional[SourceTable] = None):
+        self.sources = sources if sources is not None else SourceTable()
+        self.columns: Dict[str, List[Optional[str]]] = {}
+        self._canonical: List[str] = []
+
+    @classmethod
+    def from_directory(cls, directory: str = '.', languages: Optional[Iterable[str]] = None) -> 'TranslationCatalog':
+        """
+        디렉토리의 cursor_translations_<언어>.json 파일로 카탈로그 생성
+
+        Args:
+            directory: 번역 파일이 있는 디렉토리
+            languages: 불러올 언어 코드 (기본값: 템플릿을 제외한 모든 언어)
+        """
+        catalog = cls()
+        wanted = {lang.lower() for lang in languages} if languages else None
+        for path in sorted(glob.glob(os.path.join(directory, f'{TRANSLATION_FILE_PREFIX}*.json'))):
+            lang = os.path.basename(path)[len(TRANSLATION_FILE_PREFIX):-len('.json')].lower()
+            if lang == TEMPLATE_LANGUAGE or (wanted is not None and lang not in wanted):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    catalog.merge(lang, json.load(f))
+            except Exception as e:
+                logger.warning(f"번역 파일을 불러오지 못했습니다 ({path}): {e}")
+        return catalog
+
+    @property
+    def languages(self) -> List[str]:
+        return sorted(self.columns)
+
+    def _column(self, lang: str, size: int) -> List[Optional[str]]:
+        column = self.columns.setdefault(lang.lower(), [])
+        if len(column) < size:
+            column.extend([None] * (size - len(column)))
+        return column
+
+    def set(self, lang: str, source: str, translation: Optional[str]) -> int:
+        """원문의 번역 지정 (빈 번역은 미번역), 원문 ID 반환"""
+        source_id = self.sources.intern(source)
+        self._column(lang, source_id + 1)[source_id] = translation or None
+        return source_id
+
+    def merge(self, lang: str, entries: Dict[str, str], overwrite: bool = True) -> List[int]:
+        """
+        {원문: 번역문} 사전을 언어에 병합
+
+        Args:
+            overwrite: 이미 번역된 원문도 새 번역으로 바꿀지 여부
+
+        Returns:
+            번역이 추가되거나 바뀐 원문 ID 목록
+        """
+        intern = self.sources.intern
+        ids = [(intern(source), translation) for source, translation in entries.items() if translation]
+        column = self._column(lang, len(self.sources))
+        changed = []
+        for source_id, translation in ids:
+            current = column[source_id]
+            if current != translation and (overwrite or current is None):
+                column[source_id] = translation
+                changed.append(source_id)
+        return changed
+
+    def canonical_keys(self) -> List[str]:
+        """원문 ID 위치의 정규형 목록 (원문마다 한 번만 계산하고 새 원문만 추가로 계산)"""
+        strings = self.sources.strings
+        if len(self._canonical) < len(strings):
+            self._canonical.extend(canonical_key(text) for text in strings[len(self._canonical):])
+        return self._canonical
+
+    def get(self, lang: str, source: str) -> Optional[str]:
+        source_id = self.sources.lookup(source)
+        return None if source_id is None else self.get_by_id(lang, source_id)
+
+    def get_by_id(self, lang: str, source_id: int) -> Optional[str]:
+        column = self.columns.get(lang.lower())
+        return column[source_id] if column is not None and source_id < len(column) else None
+
+    def translations(self, lang: str) -> Dict[str, str]:
+        """언어의 {원문: 번역문} 사전 (패치 등 기존 인터페이스용)"""
+        strings = self.sources.strings
+        return {strings[source_id]: translation
+                for source_id, translation in enumerate(self.columns.get(lang.lower(), ())) if translation}
+
+    def ids(self, sources: Iterable[str]) -> List[int]:
+        """원문 목록의 ID 목록 (처음 보는 원문은 등록)"""
+        return [self.sources.intern(source) for source in sources]
+
+    def missing(self, lang: str, source_ids: Optional[Iterable[int]] = None) -> List[int]:
+        """번역되지 않은 원문 ID (기본값: 모든 원문 기준)"""
+        source_ids = range(len(self.sources)) if source_ids is None else source_ids
+        column = self._column(lang, len(self.sources))
+        return [source_id for source_id in source_ids if column[source_id] is None]
+
+    def coverage(self, source_ids: Optional[Iterable[int]] = None) -> Dict[str, Tuple[int, int]]:
+        """
+        언어별 번역률
+
+        Args:
+            source_ids: 기준 원문 ID (기본값: 모든 원문, 보통은 템플릿의 원문)
+
+        Returns:
+            {언어 코드: (번역된 항목 수, 전체 항목 수)}
+        """
+        source_ids = list(range(len(self.sources)) if source_ids is None else source_ids)
+        result = {}
+        for lang in self.languages:
+            column = self._column(lang, len(self.sources))
+            result[lang] = (sum(1 for source_id in source_ids if column[source_id] is not None), len(source_ids))
+        return result
@@ -0,0 +1,97 @@
+import re
+import json
+import base64
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(path) -> str:
+    """파일 내용의 SHA-256 해시 (16진수 문자열, 1MiB씩 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def checksum_value(digest: bytes) -> str:
+    """product.json의 checksums 값 형식 (SHA-256의 base64, 끝의 '=' 제거)"""
+    return base64.b64encode(digest).decode('ascii').rstrip('=')
+
+
+def find_product_json(js_file_path) -> Optional[Tuple[Path, str]]:
+    """
+    번들에 해당하는 product.json과 checksums 키
+
+    checksums의 키는 product.json 옆 out 디렉토리 기준의 상대 경로입니다
+    (예: vs/workbench/workbench.desktop.main.js).
+
+    Returns:
+        (product.json 경로, checksums 키), 찾지 못하면 None
+    """
+    js_file_path = Path(js_file_path)
+    for directory in list(js_file_path.parents)[:5]:
+        product_file = directory / 'product.json'
+        if not product_file.exists():
+            continue
+        try:
+            return product_file, js_file_path.relative_to(directory / 'out').as_posix()
+        except ValueError:
+            return None
+    return None
+
+
+def refresh_checksum(js_file_path, digest: bytes) -> bool:
+    """
+    product.json에 기록된 번들의 체크섬을 새 내용의 해시로 갱신
+
+    번들 파일을 다시 읽지 않도록 쓰면서 계산한 다이제스트를 받습니다. 나머지 내용과
+    서식은 그대로 두고 해당 값만 바꾼 뒤 원자적으로 교체합니다.
+
+    Args:
+        js_file_path: 설치된 번들 경로
+        digest: 번들 내용의 SHA-256 다이제스트 (bytes)
+
+    Returns:
+        product.json을 고쳤으면 True (체크섬 항목이 없거나 이미 같으면 False)
+    """
+    found = find_product_json(js_file_path)
+    if not found:
+        return False
+    product_file, key = found
+
+    try:
+        with open(product_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        checksums = json.loads(content).get('checksums') or {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"product.json을 읽을 수 없습니다: {product_file} ({e})")
+        return False
+
+    value = checksum_value(digest)
+    if key not in checksums or checksums[key] == value:
+        return False
+
+    # 값 문자열만 바꿔 원래 들여쓰기와 키 순서를 유지
+    pattern = re.compile(r'("%s"\s*:\s*")[^"]*(")' % re.escape(key))
+    updated, count = pattern.subn(lambda m: m.group(1) + value + m.group(2), content, count=1)
+    if not count:
+        logger.warning(f"product.json에서 {key} 체크섬을 찾을 수 없습니다: {product_file}")
+        return False
+
+    temp_file = product_file.with_name(product_file.name + '.tmp')
+    try:
+        with open(temp_file, 'w', encoding='utf-8', newline='') as f:
+            f.write(updated)
+        temp_file.replace(product_file)
+    except OSError as e:
+        logger.warning(f"product.json 체크섬 갱신 중 오류 발생: {e}")
+        return False
+
+    logger.info(f"product.json 체크섬 갱신: {key}")
+    return True
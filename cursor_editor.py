@@ -0,0 +1,258 @@
+import os
+import re
+import json
+import bisect
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from cursor_catalog import TranslationCatalog
+from cursor_placeholders import has_placeholders
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+TEMPLATE_FILE = 'cursor_translations_template.json'
+
+# 원문 유형 (편집기 필터용)
+KEY_TYPES = ['label', 'sentence', 'placeholder', 'menu']
+
+# indent=2로 저장된 번역 파일의 항목 한 줄: "원문": "번역문",
+_ENTRY_LINE_RE = re.compile(r'^(\s*)("(?:[^"\\]|\\.)*")\s*:\s*("(?:[^"\\]|\\.)*")(,?)\s*$')
+
+
+def classify_key(source: str) -> str:
+    """
+    원문 유형
+
+    'menu' - 메뉴 니모닉(&&)이 있는 메뉴 항목
+    'placeholder' - {0}, ${name} 같은 자리표시자가 있는 메시지
+    'sentence' - 문장 부호로 끝나거나 단어가 많은 문장
+    'label' - 그 밖의 짧은 레이블
+    """
+    if '&&' in source:
+        return 'menu'
+    if has_placeholders(source):
+        return 'placeholder'
+    if source.rstrip().endswith(('.', '!', '?', ':')) or len(source.split()) > 6:
+        return 'sentence'
+    return 'label'
+
+
+class TranslationEditorStore:
+    """
+    번역 편집기의 데이터 (원문 ID 단위)
+
+    표시 순서는 템플릿(없으면 번역 파일)의 원문 순서를 따르며, 화면에는 보이는 행만
+    요청되므로 행 데이터는 미리 만들지 않습니다. 검색과 필터는 UI 스레드 밖에서 호출해도
+    되도록 읽기만 하며, 편집 내용은 저장할 때까지 edits에만 보관합니다.
+    """
+
+    def __init__(self, lang: str, directory: str = '.', catalog: Optional[TranslationCatalog] = None):
+        self.lang = lang.lower()
+        self.directory = directory
+        self.translation_file = os.path.join(directory, f'cursor_translations_{self.lang}.json')
+        self.catalog = catalog if catalog is not None else TranslationCatalog.from_directory(directory, [self.lang])
+        self.edits: Dict[int, str] = {}
+
+        template_file = os.path.join(directory, TEMPLATE_FILE)
+        template = self._load_keys(template_file)
+        if template is None:
+            template = self._load_keys(self.translation_file) or []
+        self.rows: List[int] = self.catalog.ids(template)
+        self._row_of = {source_id: row for row, source_id in enumerate(self.rows)}
+
+        # 이전 템플릿에 없던 원문 = 지난 버전 이후 새로 생기거나 바뀐 원문
+        previous = self._load_keys(template_file + '.previous')
+        self.changed = set() if previous is None else set(self.rows) - set(self.catalog.ids(previous))
+
+        # 검색용 텍스트(행마다 한 줄로 이은 소문자 문자열)와 유형은 처음 필요할 때 만듦
+        self._source_text: Optional[Tuple[str, List[int]]] = None
+        self._translation_text: Optional[Tuple[str, List[int]]] = None
+        self._types: Optional[List[str]] = None
+
+    @staticmethod
+    def _load_keys(path) -> Optional[List[str]]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return list(json.load(f))
+        except Exception as e:
+            logger.warning(f"파일을 불러오지 못했습니다 ({path}): {e}")
+            return None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def source(self, source_id: int) -> str:
+        return self.catalog.sources[source_id]
+
+    def translation(self, source_id: int) -> str:
+        if source_id in self.edits:
+            return self.edits[source_id]
+        return self.catalog.get_by_id(self.lang, source_id) or ''
+
+    def type_of(self, source_id: int) -> str:
+        """표시 중인 원문의 유형 (KEY_TYPES 중 하나)"""
+        return self._classify()[self._row_of[source_id]]
+
+    def _column(self) -> List[Optional[str]]:
+        column = self.catalog.columns.get(self.lang, [])
+        if len(column) < len(self.catalog.sources):
+            column = self.catalog._column(self.lang, len(self.catalog.sources))
+        return column
+
+    def set_translation(self, source_id: int, text: str):
+        """편집 내용 기록 (저장 전까지 번역 파일은 바뀌지 않음)"""
+        if text == (self.catalog.get_by_id(self.lang, source_id) or ''):
+            self.edits.pop(source_id, None)
+        else:
+            self.edits[source_id] = text
+
+    @staticmethod
+    def _join(texts: List[str]) -> Tuple[str, List[int]]:
+        """행마다 한 줄로 이은 소문자 검색 텍스트와 각 행의 시작 위치"""
+        starts = []
+        position = 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + 1
+        return '\n'.join(texts), starts
+
+    @staticmethod
+    def _find_rows(query: str, search_text: Tuple[str, List[int]]) -> Set[int]:
+        """검색 텍스트에서 query가 들어 있는 행 번호 (str.find로 행을 건너뛰며 검색)"""
+        text, starts = search_text
+        rows = set()
+        position = text.find(query)
+        while position >= 0:
+            row = bisect.bisect_right(starts, position) - 1
+            rows.add(row)
+            if row + 1 >= len(starts):
+                break
+            position = text.find(query, starts[row + 1])
+        return rows
+
+    def prepare(self):
+        """검색 텍스트와 유형을 미리 만들어 첫 검색도 바로 끝나도록 함 (불러오는 스레드에서 호출)"""
+        self._build_search_text()
+        self._classify()
+
+    def _classify(self) -> List[str]:
+        if self._types is None:
+            strings = self.catalog.sources.strings
+            self._types = [classify_key(strings[source_id]) for source_id in self.rows]
+        return self._types
+
+    def _build_search_text(self):
+        if self._source_text is None:
+            strings = self.catalog.sources.strings
+            self._source_text = self._join([strings[source_id].casefold().replace('\n', ' ') for source_id in self.rows])
+        if self._translation_text is None:
+            column = self._column()
+            self._translation_text = self._join([(column[source_id] or '').casefold().replace('\n', ' ')
+                                                 for source_id in self.rows])
+
+    def _match_rows(self, query: str, edits: Dict[int, str]) -> Set[int]:
+        self._build_search_text()
+
+        rows = self._find_rows(query, self._source_text)
+        # 편집 중인 항목은 저장된 번역 대신 편집 내용으로 검색
+        for row in self._find_rows(query, self._translation_text):
+            if self.rows[row] not in edits:
+                rows.add(row)
+        for source_id, text in edits.items():
+            if query in text.casefold() and source_id in self._row_of:
+                rows.add(self._row_of[source_id])
+        return rows
+
+    def filter(self, query: str = '', untranslated: bool = False, changed: bool = False,
+               key_type: Optional[str] = None, edits: Optional[Dict[int, str]] = None) -> List[int]:
+        """
+        조건에 맞는 원문 ID 목록 (표시 순서 유지)
+
+        Args:
+            query: 원문 또는 번역문에 포함된 문자열 (대소문자 무시)
+            untranslated: 번역되지 않은 항목만
+            changed: 이전 템플릿 이후 새로 생기거나 바뀐 원문만
+            key_type: KEY_TYPES 중 하나 (None이면 전체)
+            edits: 검색에 쓸 편집 내용 (다른 스레드에서 호출할 때는 UI 스레드에서 만든 복사본,
+                   기본값: 현재 편집 내용)
+        """
+        edits = self.edits if edits is None else edits
+        rows = range(len(self.rows))
+        if query:
+            rows = sorted(self._match_rows(query.casefold(), edits))
+        if key_type:
+            types = self._classify()
+            rows = [row for row in rows if types[row] == key_type]
+
+        ids = self.rows
+        result = [ids[row] for row in rows]
+        if changed:
+            result = [source_id for source_id in result if source_id in self.changed]
+        if untranslated:
+            column = self._column()
+            result = [source_id for source_id in result if not edits.get(source_id, column[source_id])]
+        return result
+
+    def save(self) -> int:
+        """
+        편집한 항목만 번역 파일에 반영
+
+        편집한 항목이 모두 indent=2 형식의 항목 줄로 있으면 그 줄만 다시 쓰고, 그렇지 않으면
+        파일 전체를 불러와 병합한 뒤 다시 씁니다 (임시 파일에 쓴 뒤 교체).
+
+        Returns:
+            저장한 항목 수
+
+        Raises:
+            ValueError: 기존 번역 파일이 올바른 JSON이 아닌 경우 (파일은 바꾸지 않음)
+        """
+        if not self.edits:
+            return 0
+
+        edited = {self.source(source_id): text for source_id, text in self.edits.items()}
+        pending = dict(edited)
+        lines = []
+        if os.path.exists(self.translation_file):
+            with open(self.translation_file, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+
+        # 편집한 원문으로 시작하는 줄만 정규식으로 확인
+        prefixes = tuple(f"{json.dumps(key, ensure_ascii=False)}: " for key in pending)
+        for index, line in enumerate(lines):
+            if not line.lstrip().startswith(prefixes):
+                continue
+            match = _ENTRY_LINE_RE.match(line)
+            if not match:
+                continue
+            key = json.loads(match.group(2))
+            if key in pending:
+                value = json.dumps(pending.pop(key), ensure_ascii=False)
+                lines[index] = f"{match.group(1)}{match.group(2)}: {value}{match.group(4)}"
+
+        if pending:
+            # 줄 단위로 고칠 수 없는 항목이 있으면 (한 줄로 저장된 파일, \uXXXX로 이스케이프된 원문,
+            # 파일에 없던 원문 등) 전체를 불러와 병합한 뒤 다시 씀
+            translations = {}
+            if os.path.exists(self.translation_file):
+                with open(self.translation_file, 'r', encoding='utf-8') as f:
+                    translations = json.load(f)
+            translations.update(edited)
+            content = json.dumps(translations, ensure_ascii=False, indent=2)
+        else:
+            content = '\n'.join(lines)
+
+        temp_file = self.translation_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_file, self.translation_file)
+
+        saved = len(self.edits)
+        for source_id, text in self.edits.items():
+            self.catalog.set(self.lang, self.source(source_id), text)
+        self.edits.clear()
+        self._translation_text = None
+        logger.info(f"번역 편집 저장: {saved}개 항목 ({self.translation_file})")
+        return saved
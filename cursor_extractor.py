@@ -1,12 +1,239 @@
 import os
 import re
 import json
+import hashlib
 from pathlib import Path
 import logging
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+
+from cursor_checksums import file_sha256
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 번역 가능한 문자열 추출 패턴
+EXTRACTION_PATTERNS = [
+    r'["\']((?:\s*\{[^{}]*\}\s*[,]?)*\s*\{[^{}]*label[^{}]*["\']\s*:\s*["\'](.*?)["\'][^{}]*\}(?:\s*\{[^{}]*\}\s*[,]?)*)["\']\s*,',
+    r'["\']((?:\s*\{[^{}]*\}\s*[,]?)*\s*\{[^{}]*title[^{}]*["\']\s*:\s*["\'](.*?)["\'][^{}]*\}(?:\s*\{[^{}]*\}\s*[,]?)*)["\']\s*,',
+    r'[\'"]label[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+    r'[\'"]categoryLabel[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+    r'[\'"]placeholder[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+    r'[\'"]detail[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+    r'[\'"]title[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+    r'[\'"]message[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+    r'[\'"]buttonLabel[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+    r'[\'"]failureMessage[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+    r'[\'"]successMessage[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+    r'[\'"]value[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+    r'[\'"]aria-label[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+    r'[\'"]name[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+]
+
+# 병렬 추출 시 샤드 하나의 크기 (바이트)
+SHARD_SIZE = 2 * 1024 * 1024
+
+# 샤드 경계에 걸친 문자열을 놓치지 않도록 다음 샤드를 추가로 읽는 크기 (바이트)
+SHARD_OVERLAP = 64 * 1024
+
+# 전체 UI 추출 시 스캔할 파일 패턴 (resources/app 기준)
+RESOURCE_PATTERNS = [
+    'out/**/*.js',
+    'out/**/nls.messages.json',
+    'extensions/*/package.nls.json',
+    'extensions/*/dist/**/*.js',
+]
+
+# 샤드 경계로 사용할 리터럴 종료 지점 (따옴표 뒤 구분자)
+_LITERAL_BOUNDARY = re.compile(rb'["\'][,;})\]]')
+
+
+def _scan_text(content, limit=None):
+    """
+    텍스트에서 패턴에 맞는 문자열을 모두 찾아 집합으로 반환
+    
+    Args:
+        content: 스캔할 텍스트
+        limit: 지정하면 이 위치 이전에서 시작한 매치만 채택
+    """
+    extracted_strings = set()
+    
+    for pattern in EXTRACTION_PATTERNS:
+        for match in re.finditer(pattern, content):
+            if limit is not None and match.start() >= limit:
+                break
+            # 일부 패턴은 그룹을 두 개 가질 수 있음 (마지막 그룹 사용)
+            extracted_strings.add(match.group(match.re.groups))
+    
+    return extracted_strings
+
+
+def _plan_shards(js_file_path, shard_size):
+    """
+    파일을 리터럴 경계에 맞춘 (시작, 끝) 바이트 구간으로 분할
+    
+    각 경계는 명목상 분할 지점 이후에 처음 나타나는 리터럴 종료 지점(따옴표 + 구분자)
+    바로 뒤로 옮겨지므로, 샤드가 문자열 리터럴 한가운데에서 시작하지 않습니다.
+    """
+    with open(js_file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            boundaries = [0]
+            position = shard_size
+            
+            while position < size:
+                match = _LITERAL_BOUNDARY.search(data, position, min(size, position + SHARD_OVERLAP))
+                if not match:
+                    # 경계를 찾지 못하면 다음 후보 지점으로 넘어감 (샤드가 커짐)
+                    position += SHARD_OVERLAP
+                    continue
+                boundary = match.start() + 1
+                if boundary > boundaries[-1]:
+                    boundaries.append(boundary)
+                position = boundary + shard_size
+            
+            boundaries.append(size)
+    
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _scan_shard(task):
+    """
+    샤드 하나를 스캔 (ProcessPoolExecutor 작업자에서 실행)
+    
+    파일을 읽기 전용 메모리 맵으로 열어 OS 페이지 캐시를 프로세스 간에 공유합니다.
+    샤드 끝 이후 SHARD_OVERLAP 만큼을 함께 스캔하되, 샤드 안에서 시작한 매치만 채택하여
+    경계에 걸친 문자열은 정확히 한 샤드에서만 수집됩니다.
+    """
+    js_file_path, start, end = task
+    
+    with open(js_file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # 샤드 경계는 ASCII 구분자이므로 UTF-8 문자 중간에서 잘리지 않음
+            limit = len(data[start:end].decode('utf-8', errors='ignore'))
+            content = data[start:min(len(data), end + SHARD_OVERLAP)].decode('utf-8', errors='ignore')
+    
+    return _scan_text(content, limit)
+
+
+def _scan_nls_json(content):
+    """NLS 메시지 파일(nls.messages.json, package.nls.json)에서 문자열 추출"""
+    data = json.loads(content)
+    values = data.values() if isinstance(data, dict) else data
+    
+    extracted_strings = set()
+    for value in values:
+        # package.nls.json 항목은 {"message": ..., "comment": [...]} 형태일 수 있음
+        if isinstance(value, dict):
+            value = value.get('message')
+        if isinstance(value, str):
+            extracted_strings.add(value)
+    
+    return extracted_strings
+
+
+def _scan_resource_file(path):
+    """리소스 파일 하나를 스캔 (ProcessPoolExecutor 작업자에서 실행)"""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as file:
+        content = file.read()
+    
+    if path.endswith('.json'):
+        try:
+            return _scan_nls_json(content)
+        except ValueError:
+            logger.warning(f"NLS 파일을 파싱할 수 없습니다: {path}")
+            return set()
+    return _scan_text(content)
+
+
+def find_resource_files(app_dir):
+    """resources/app 아래에서 UI 문자열이 들어 있는 JS 번들과 NLS 파일 목록을 찾기"""
+    app_dir = Path(app_dir)
+    files = set()
+    
+    for pattern in RESOURCE_PATTERNS:
+        for path in app_dir.glob(pattern):
+            if path.is_file() and 'node_modules' not in path.parts:
+                files.add(path)
+    
+    return sorted(files)
+
+
+class ExtractionCache:
+    """파일별 추출 결과 캐시 (크기/수정 시각이 바뀐 파일만 해시로 재확인)"""
+    
+    def __init__(self, cache_file=None):
+        self.cache_file = Path(cache_file) if cache_file else Path.home() / '.cursor_translator' / 'extract_cache.json'
+        # 추출 패턴이 바뀌면 이전 결과를 재사용하지 않음
+        self.patterns_digest = hashlib.sha256(json.dumps(EXTRACTION_PATTERNS).encode('utf-8')).hexdigest()
+        self.entries = {}
+        
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+                if cache.get('patterns') == self.patterns_digest:
+                    self.entries = cache.get('files', {})
+            except Exception as e:
+                logger.warning(f"추출 캐시를 로드하는 중 오류 발생: {str(e)}")
+    
+    def lookup(self, path):
+        """
+        변경되지 않은 파일의 캐시된 문자열 반환
+        
+        Returns:
+            (문자열 목록 또는 None, 파일 해시 또는 None)
+        """
+        entry = self.entries.get(str(path))
+        if not entry:
+            return None, None
+        
+        stat = os.stat(path)
+        if entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+            return entry['strings'], entry['hash']
+        
+        digest = file_sha256(path)
+        if entry['hash'] == digest:
+            # 내용은 같고 수정 시각만 바뀐 경우 (재설치, 복원 등)
+            entry['size'] = stat.st_size
+            entry['mtime'] = stat.st_mtime_ns
+            return entry['strings'], digest
+        
+        return None, digest
+    
+    def store(self, path, strings, digest=None):
+        """파일의 추출 결과 저장"""
+        stat = os.stat(path)
+        self.entries[str(path)] = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'hash': digest or file_sha256(path),
+            'strings': sorted(strings),
+        }
+    
+    def prune(self):
+        """
+        디스크에서 사라진 파일(업데이트로 이름이 바뀐 번들 등)의 항목 제거
+        
+        Returns:
+            제거한 항목 수
+        """
+        missing = [path for path in self.entries if not os.path.exists(path)]
+        for path in missing:
+            del self.entries[path]
+        return len(missing)
+    
+    def save(self):
+        """캐시 파일 저장 (사라진 파일의 항목은 제외)"""
+        self.prune()
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'patterns': self.patterns_digest, 'files': self.entries}, f, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"추출 캐시를 저장하는 중 오류 발생: {str(e)}")
+
+
 class CursorExtractor:
     def __init__(self, js_file_path, strings_file=None):
         """
@@ -22,47 +249,35 @@ class CursorExtractor:
         if not self.js_file_path.exists():
             raise FileNotFoundError(f"파일을 찾을 수 없습니다: {js_file_path}")
 
-    def extract_strings(self):
+    def extract_strings(self, workers=None):
         """
         JS 파일에서 번역 가능한 문자열을 추출
         
+        Args:
+            workers: 병렬 스캔에 사용할 프로세스 수 (기본값: CPU 코어 수, 1이면 단일 프로세스)
+        
         Returns:
             str: 추출된 문자열이 저장된 파일 경로
         """
         logger.info(f"JS 파일에서 문자열 추출 시작: {self.js_file_path}")
         
-        # 다양한 패턴의 문자열 추출
-        patterns = [
-            r'["\']((?:\s*\{[^{}]*\}\s*[,]?)*\s*\{[^{}]*label[^{}]*["\']\s*:\s*["\'](.*?)["\'][^{}]*\}(?:\s*\{[^{}]*\}\s*[,]?)*)["\']\s*,',
-            r'["\']((?:\s*\{[^{}]*\}\s*[,]?)*\s*\{[^{}]*title[^{}]*["\']\s*:\s*["\'](.*?)["\'][^{}]*\}(?:\s*\{[^{}]*\}\s*[,]?)*)["\']\s*,',
-            r'[\'"]label[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-            r'[\'"]categoryLabel[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-            r'[\'"]placeholder[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-            r'[\'"]detail[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-            r'[\'"]title[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-            r'[\'"]message[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-            r'[\'"]buttonLabel[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-            r'[\'"]failureMessage[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-            r'[\'"]successMessage[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-            r'[\'"]value[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-            r'[\'"]aria-label[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-            r'[\'"]name[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
-        ]
-        
         extracted_strings = set()
         
-        with open(self.js_file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            content = file.read()
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                if matches:
-                    if isinstance(matches[0], tuple):
-                        # 일부 패턴은 그룹을 두 개 가질 수 있음
-                        for match in matches:
-                            extracted_strings.add(match[-1])  # 마지막 그룹 사용
-                    else:
-                        extracted_strings.update(matches)
+        file_size = self.js_file_path.stat().st_size
+        workers = workers or os.cpu_count() or 1
+        
+        if workers > 1 and file_size > SHARD_SIZE:
+            # 큰 번들은 샤드로 나누어 여러 프로세스에서 병렬 스캔
+            shards = _plan_shards(self.js_file_path, SHARD_SIZE)
+            logger.info(f"{len(shards)}개 샤드를 {workers}개 프로세스로 스캔합니다.")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                tasks = [(str(self.js_file_path), start, end) for start, end in shards]
+                # map은 입력 순서대로 결과를 돌려주므로 병합 순서가 결정적임
+                for shard_strings in executor.map(_scan_shard, tasks):
+                    extracted_strings.update(shard_strings)
+        else:
+            with open(self.js_file_path, 'r', encoding='utf-8', errors='ignore') as file:
+                extracted_strings = _scan_text(file.read())
         
         # 불필요한 문자열 필터링
         filtered_strings = self._filter_strings(extracted_strings)
@@ -77,6 +292,74 @@ class CursorExtractor:
         logger.info(f"총 {len(sorted_strings)}개의 문자열을 추출하여 {self.strings_file}에 저장했습니다.")
         return self.strings_file
 
+    def extract_all_strings(self, app_dir=None, workers=None, cache_file=None):
+        """
+        resources/app 아래의 모든 JS 번들과 NLS 파일에서 번역 가능한 문자열을 추출
+        
+        Args:
+            app_dir: resources/app 디렉토리 (기본값: JS 파일 위치에서 유추)
+            workers: 병렬 스캔에 사용할 프로세스 수 (기본값: CPU 코어 수)
+            cache_file: 파일별 추출 캐시 경로 또는 ExtractionCache 객체 (기본값: ~/.cursor_translator/extract_cache.json)
+        
+        Returns:
+            str: 추출된 문자열이 저장된 파일 경로
+        """
+        # .../resources/app/out/vs/workbench/workbench.desktop.main.js
+        app_dir = Path(app_dir) if app_dir else self.js_file_path.parents[3]
+        files = find_resource_files(app_dir)
+        logger.info(f"{app_dir}에서 {len(files)}개의 리소스 파일을 찾았습니다.")
+        
+        cache = cache_file if isinstance(cache_file, ExtractionCache) else ExtractionCache(cache_file)
+        extracted_strings = set()
+        pending = []
+        
+        for path in files:
+            strings, digest = cache.lookup(path)
+            if strings is None:
+                pending.append((path, digest))
+            else:
+                extracted_strings.update(strings)
+        
+        logger.info(f"변경되지 않은 파일 {len(files) - len(pending)}개는 캐시를 사용합니다.")
+        
+        if pending:
+            workers = workers or os.cpu_count() or 1
+            # 큰 번들은 샤드로 나누어 다른 파일들과 함께 병렬 스캔
+            tasks = []
+            for index, (path, _) in enumerate(pending):
+                if workers > 1 and path.suffix == '.js' and path.stat().st_size > SHARD_SIZE:
+                    tasks.extend((index, _scan_shard, (str(path), start, end))
+                                 for start, end in _plan_shards(path, SHARD_SIZE))
+                else:
+                    tasks.append((index, _scan_resource_file, str(path)))
+            
+            results = [set() for _ in pending]
+            if workers > 1 and len(tasks) > 1:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [(index, executor.submit(scan, arg)) for index, scan, arg in tasks]
+                    for index, future in futures:
+                        results[index].update(future.result())
+            else:
+                for index, scan, arg in tasks:
+                    results[index].update(scan(arg))
+            
+            for (path, digest), strings in zip(pending, results):
+                cache.store(path, strings, digest)
+                extracted_strings.update(strings)
+        
+        if pending or cache.prune():
+            cache.save()
+        
+        # 불필요한 문자열 필터링
+        sorted_strings = sorted(self._filter_strings(extracted_strings))
+        
+        with open(self.strings_file, 'w', encoding='utf-8') as file:
+            for string in sorted_strings:
+                file.write(f"{string}\n")
+        
+        logger.info(f"총 {len(sorted_strings)}개의 문자열을 추출하여 {self.strings_file}에 저장했습니다.")
+        return self.strings_file
+
     def _filter_strings(self, strings):
         """문자열 필터링"""
         filtered = set()
@@ -126,6 +409,16 @@ class CursorExtractor:
                 if string:
                     template[string] = ""
         
+        # 원문이 바뀌었으면 이전 템플릿을 보관 (편집기의 '변경됨' 필터에서 사용)
+        if os.path.exists(output_file):
+            try:
+                with open(output_file, 'r', encoding='utf-8') as file:
+                    previous = json.load(file)
+                if set(previous) != set(template):
+                    os.replace(output_file, output_file + '.previous')
+            except (OSError, ValueError):
+                pass
+        
         with open(output_file, 'w', encoding='utf-8') as file:
             json.dump(template, file, ensure_ascii=False, indent=2)
         
@@ -211,6 +504,8 @@ def main():
     parser.add_argument('--cursor-path', help='Cursor 설치 경로')
     parser.add_argument('--output', help='출력 파일 경로')
     parser.add_argument('--test-mode', action='store_true', help='테스트 모드')
+    parser.add_argument('--workers', type=int, help='병렬 추출 프로세스 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--all-files', action='store_true', help='모든 JS 번들과 NLS 파일에서 추출')
     
     args = parser.parse_args()
     
@@ -238,7 +533,10 @@ def main():
     
     output_file = args.output or "cursor_strings.txt"
     extractor = CursorExtractor(js_file, output_file)
-    strings_file = extractor.extract_strings()
+    if args.all_files:
+        strings_file = extractor.extract_all_strings(workers=args.workers)
+    else:
+        strings_file = extractor.extract_strings(workers=args.workers)
     template_file = extractor.generate_translation_template()
     
     logger.info(f"추출 완료: {strings_file}")
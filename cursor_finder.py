@@ -6,6 +6,8 @@ import platform
 import json
 from pathlib import Path
 
+import cursor_wsl
+
 class CursorFinder:
     def __init__(self):
         self.system = platform.system().lower()
@@ -43,13 +45,13 @@ class CursorFinder:
             if not path.exists():
                 return False
             workbench_path = path / 'resources' / 'app' / 'out' / 'vs' / 'workbench'
-            return (workbench_path / 'workbench.desktop.main.js').exists()
+            return (workbench_path / 'workbench.desktop.main.js').exists() or (path / 'resources' / 'app.asar').is_file()
         else:
             # Linux/macOS에서의 검증
             if not path.exists():
                 return False
             workbench_path = path / 'resources' / 'app' / 'out' / 'vs' / 'workbench'
-            return (workbench_path / 'workbench.desktop.main.js').exists()
+            return (workbench_path / 'workbench.desktop.main.js').exists() or (path / 'resources' / 'app.asar').is_file()
 
     def _find_in_windows(self):
         """Windows에서 Cursor 설치 경로를 찾습니다."""
@@ -104,33 +106,24 @@ class CursorFinder:
 
     def _find_in_wsl(self):
         """WSL에서 Cursor 설치 경로를 찾습니다."""
-        possible_paths = []
+        # 1. Windows에 직접 조회 (레지스트리, %LOCALAPPDATA%) - 파일 시스템 탐색 없음
+        for cursor_path in cursor_wsl.find_cursor_install():
+            if self._is_valid_cursor_path(cursor_path):
+                return cursor_path
         
-        # 1. /mnt/c/Users/ 아래의 모든 사용자 디렉토리 검색
+        # 2. 조회 결과가 오래되었을 수 있으므로 캐시 없이 다시 조회
+        for cursor_path in cursor_wsl.find_cursor_install(refresh=True):
+            if self._is_valid_cursor_path(cursor_path):
+                return cursor_path
+        
+        # 3. 상호 운용을 쓸 수 없는 경우 /mnt/c/Users/ 아래의 사용자 디렉토리만 확인
+        #    (/mnt/c 전체 탐색은 9P에서 수십 분이 걸리므로 하지 않음)
         users_dir = '/mnt/c/Users'
         if os.path.exists(users_dir):
             for user in os.listdir(users_dir):
-                user_path = os.path.join(users_dir, user)
-                if os.path.isdir(user_path):
-                    # AppData 경로 확인
-                    appdata_path = os.path.join(user_path, 'AppData', 'Local', 'Programs', 'cursor')
-                    if self._is_valid_cursor_path(appdata_path):
-                        return appdata_path
-                    possible_paths.append(appdata_path)
-
-        # 2. workbench.desktop.main.js 파일 직접 검색
-        try:
-            find_cmd = ['find', '/mnt/c', '-name', 'workbench.desktop.main.js', '-type', 'f']
-            result = subprocess.run(find_cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                for path in result.stdout.splitlines():
-                    if 'workbench' in path:
-                        cursor_path = path.split('/workbench')[0]
-                        if self._is_valid_cursor_path(cursor_path):
-                            return cursor_path
-                        possible_paths.append(cursor_path)
-        except Exception:
-            pass
+                appdata_path = os.path.join(users_dir, user, 'AppData', 'Local', 'Programs', 'cursor')
+                if self._is_valid_cursor_path(appdata_path):
+                    return appdata_path
 
         return None
 
@@ -167,8 +160,8 @@ class CursorFinder:
 
         return None
 
-    def find_cursor_installation(self):
-        """Cursor 설치 경로를 찾습니다."""
+    def cached_installation(self):
+        """검색 없이 캐시나 CURSOR_PATH 환경 변수로 알 수 있는 설치 경로 (없으면 None)"""
         # 1. 캐시된 경로 확인
         cached_path = self._load_cached_path()
         if cached_path:
@@ -180,10 +173,18 @@ class CursorFinder:
             self._save_cached_path(env_path)
             return env_path
 
+        return None
+
+    def find_cursor_installation(self):
+        """Cursor 설치 경로를 찾습니다."""
+        path = self.cached_installation()
+        if path:
+            return path
+
         # 3. 시스템별 검색
         if self.system == 'windows':
             path = self._find_in_windows()
-        elif 'microsoft-standard-wsl' in platform.uname().release.lower():
+        elif cursor_wsl.is_wsl():
             path = self._find_in_wsl()
         else:
             path = self._find_in_linux()
@@ -226,6 +227,19 @@ def find_main_js_file(cursor_path):
     
     return None
 
+def find_nls_messages_file(js_file_path):
+    """workbench 번들 옆의 NLS 메시지 테이블(out/nls.messages.json) 찾기"""
+    if not js_file_path:
+        return None
+    
+    # .../out/vs/workbench/workbench.desktop.main.js 에서 out 디렉토리까지 올라가며 확인
+    for directory in list(Path(js_file_path).parents)[:3]:
+        nls_path = directory / 'nls.messages.json'
+        if nls_path.exists():
+            return nls_path
+    
+    return None
+
 def find_settings_json():
     """Cursor 설정 파일 경로 찾기"""
     system = platform.system()
@@ -240,15 +254,13 @@ def find_settings_json():
     
     # Linux 및 WSL
     elif system == "Linux":
-        # WSL 여부 확인
-        try:
-            with open('/proc/version', 'r') as f:
-                if 'Microsoft' in f.read():
-                    # WSL일 경우 Windows 경로 사용
-                    username = os.environ.get('USER')
-                    return Path(f'/mnt/c/Users/{username}/AppData/Roaming/Cursor/User/settings.json')
-        except:
-            pass
+        # WSL일 경우 Windows에 %APPDATA%를 조회하여 Windows 쪽 경로 사용 (WSL 사용자 이름은 Windows와 다를 수 있음)
+        if cursor_wsl.is_wsl():
+            settings_path = cursor_wsl.find_settings_file()
+            if settings_path:
+                return settings_path
+            username = os.environ.get('USER')
+            return Path(f'/mnt/c/Users/{username}/AppData/Roaming/Cursor/User/settings.json')
         
         # 일반 Linux 경로
         return Path(os.environ.get('HOME')) / '.config' / 'Cursor' / 'User' / 'settings.json'
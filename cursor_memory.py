@@ -0,0 +1,148 @@
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from cursor_normalize import canonical_key
+from cursor_catalog import TranslationCatalog
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 이 값 이상으로 비슷하면 (문자 3-gram 자카드 유사도) 이전 번역을 활용
+FUZZY_THRESHOLD = 0.6
+
+# MinHash 서명 길이(해시 구간 수)와 LSH 밴드 구성 (밴드 수 x 밴드당 행 수 = 서명 길이)
+# 밴드당 행이 2개이면 흔한 3-gram의 버킷에 원문 수천 개가 몰려 조회가 느려지므로 4개로 나누고,
+# 줄어든 재현율은 밴드 수(16개)로 보충 (유사도 0.6인 원문이 한 밴드 이상 겹칠 확률 약 0.9)
+NUM_PERMUTATIONS = 64
+BAND_ROWS = 4
+
+# 버킷 하나에서 확인할 최대 원문 수 (최근에 추가된 원문부터)
+MAX_BUCKET_SCAN = 64
+
+# 정확한 유사도를 다시 계산할 후보 수 (공유 밴드가 많은 순)
+MAX_CANDIDATES = 8
+
+
+def shingles(text: str) -> Set[str]:
+    """정규형(대소문자, 공백, 끝 문장 부호 무시)의 문자 3-gram 집합"""
+    key = f" {canonical_key(text)} "
+    if len(key) < 3:
+        return {key}
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    """두 3-gram 집합의 자카드 유사도"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class TranslationMemory:
+    """
+    이전에 번역한 원문에 대한 유사 문자열 색인 (MinHash + LSH)
+
+    원문이 조금 바뀐 경우 ("Enable auto-run mode" -> "Enable auto-run mode for agents")
+    예전 원문과 번역을 찾아 미리 채우거나 번역 API에 문맥으로 넘길 수 있게 합니다.
+    원문과 언어별 번역은 TranslationCatalog에 두고, 색인은 원문 ID마다 한 번만 만듭니다.
+    """
+
+    def __init__(self, threshold: float = FUZZY_THRESHOLD, catalog: Optional[TranslationCatalog] = None):
+        self.threshold = threshold
+        self.catalog = catalog if catalog is not None else TranslationCatalog()
+        self._indexed = 0
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(NUM_PERMUTATIONS // BAND_ROWS)]
+        self._index_new_sources()
+
+    @classmethod
+    def from_directory(cls, directory: str = '.', threshold: float = FUZZY_THRESHOLD) -> 'TranslationMemory':
+        """디렉토리의 모든 cursor_translations_<언어>.json으로 색인 생성"""
+        memory = cls(threshold, TranslationCatalog.from_directory(directory))
+        logger.info(f"번역 메모리: 원문 {len(memory)}개")
+        return memory
+
+    def __len__(self):
+        return len(self.catalog.sources)
+
+    @staticmethod
+    def _signature(grams: Set[str]) -> Tuple[int, ...]:
+        """
+        one permutation hashing으로 만든 MinHash 서명
+
+        3-gram마다 해시를 한 번만 계산하고 (프로세스 안에서만 쓰는 색인이므로 str 해시 사용)
+        해시 값으로 나눈 구간별 최솟값을 서명으로 씁니다. 빈 구간은 다음 구간의 값으로 채웁니다.
+        """
+        mins = [None] * NUM_PERMUTATIONS
+        for h in map(hash, grams):
+            slot = h % NUM_PERMUTATIONS
+            current = mins[slot]
+            if current is None or h < current:
+                mins[slot] = h
+        if None in mins:
+            # 채워진 구간에서 거꾸로 돌며 빈 구간을 바로 다음 구간 값으로 채움 (다음 구간은 이미 채워져 있음)
+            start = next(slot for slot, value in enumerate(mins) if value is not None)
+            for offset in range(1, NUM_PERMUTATIONS):
+                slot = (start - offset) % NUM_PERMUTATIONS
+                if mins[slot] is None:
+                    mins[slot] = mins[(slot + 1) % NUM_PERMUTATIONS]
+        return tuple(mins)
+
+    @staticmethod
+    def _band_keys(signature: Tuple[int, ...]) -> List[int]:
+        """밴드별 버킷 키 (밴드의 행 묶음 해시, 튜플을 키로 두지 않아 색인 메모리를 줄임)"""
+        return [hash(signature[start:start + BAND_ROWS]) for start in range(0, NUM_PERMUTATIONS, BAND_ROWS)]
+
+    def _index_new_sources(self):
+        """카탈로그에 새로 등록된 원문을 색인에 추가"""
+        strings = self.catalog.sources.strings
+        buckets = self._buckets
+        for source_id in range(self._indexed, len(strings)):
+            for bucket, key in zip(buckets, self._band_keys(self._signature(shingles(strings[source_id])))):
+                members = bucket.get(key)
+                if members is None:
+                    bucket[key] = [source_id]
+                else:
+                    members.append(source_id)
+        self._indexed = len(strings)
+
+    def add(self, source: str, lang: str, translation: str):
+        """원문의 번역 추가 (처음 보는 원문이면 색인에 등록)"""
+        if not source or not translation:
+            return
+        self.catalog.set(lang, source, translation)
+        self._index_new_sources()
+
+    def update(self, lang: str, entries: Dict[str, str]):
+        """{원문: 번역문} 사전의 번역된 항목을 모두 추가"""
+        self.catalog.merge(lang, entries)
+        self._index_new_sources()
+
+    def lookup(self, text: str, lang: str) -> Optional[Tuple[str, str, float]]:
+        """
+        text와 가장 비슷한, lang 번역이 있는 이전 원문
+
+        Returns:
+            (이전 원문, 이전 번역문, 유사도), 기준 이상으로 비슷한 항목이 없으면 None
+        """
+        self._index_new_sources()
+        column = self.catalog.columns.get(lang.lower(), [])
+        strings = self.catalog.sources.strings
+        grams = shingles(text)
+        candidates = []
+        for bucket, key in zip(self._buckets, self._band_keys(self._signature(grams))):
+            candidates.extend(bucket.get(key, ())[-MAX_BUCKET_SCAN:])
+
+        # 공유 밴드가 많은 순으로, lang 번역이 있는 원문만 MAX_CANDIDATES개까지 비교
+        best = None
+        checked = 0
+        for source_id, _ in Counter(candidates).most_common():
+            if checked == MAX_CANDIDATES:
+                break
+            if source_id >= len(column) or column[source_id] is None or strings[source_id] == text:
+                continue
+            checked += 1
+            score = similarity(grams, shingles(strings[source_id]))
+            if score >= self.threshold and (best is None or score > best[2]):
+                best = (strings[source_id], column[source_id], score)
+        return best
@@ -0,0 +1,90 @@
+import re
+from typing import Callable, Dict, List, Tuple
+
+# 정규화 시 떼어 내는 끝 문장 부호 (긴 것부터, 번역문의 전각 부호 포함)
+_TRAILING_PUNCTUATION = ['...', '…', ':', '.', '!', '?', '：', '。', '！', '？']
+
+# 번역문이 전각 부호를 쓰면 원문 부호도 전각으로 맞춤 (중국어/일본어)
+_FULLWIDTH = {':': '：', '.': '。', '!': '！', '?': '？'}
+
+_CORE_RE = re.compile(r'^(\s*)(.*?)(\s*)$', re.DOTALL)
+
+
+def split_string(text: str) -> Tuple[str, str, str, str]:
+    """
+    문자열을 (앞 공백, 본문, 끝 문장 부호, 뒤 공백)으로 분리
+
+    예: '  Save As...' -> ('  ', 'Save As', '...', '')
+    """
+    leading, body, trailing = _CORE_RE.match(text).groups()
+    punctuation = ''
+
+    for mark in _TRAILING_PUNCTUATION:
+        if body.endswith(mark) and len(body) > len(mark):
+            punctuation = mark
+            body = body[:-len(mark)].rstrip()
+            break
+
+    return leading, body, punctuation, trailing
+
+
+def canonical_key(text: str) -> str:
+    """대소문자, 공백, 끝 문장 부호('...'와 '…' 포함) 차이를 무시한 그룹 키"""
+    _, body, _, _ = split_string(text)
+    return ' '.join(body.split()).casefold()
+
+
+def group_strings(texts: List[str], key: Callable[[str], str] = canonical_key) -> Dict[str, List[str]]:
+    """
+    정규형이 같은 문자열끼리 묶기
+
+    Args:
+        key: 정규형 함수 (미리 계산해 둔 정규형을 쓰는 경우 지정)
+
+    Returns:
+        {대표 원문: [같은 그룹의 원문 목록]} - 대표는 그룹에서 처음 나온 원문이며 목록에도 포함됨
+    """
+    groups = {}
+    representatives = {}
+
+    for text in texts:
+        # 본문이 없는 문자열은 단독 그룹
+        group = key(text) or text
+        representative = representatives.setdefault(group, text)
+        groups.setdefault(representative, []).append(text)
+
+    return groups
+
+
+def _match_case(translated: str, representative: str, body: str) -> str:
+    """대표 원문과 원문 본문의 대소문자 차이를 번역문에 반영 (대소문자가 있는 언어에만 영향)"""
+    if not translated or representative == body:
+        return translated
+    if body.isupper() and len(body) > 1:
+        return translated.upper()
+    if body[:1].isupper() and not representative[:1].isupper():
+        return translated[:1].upper() + translated[1:]
+    if body[:1].islower() and representative[:1].isupper():
+        return translated[:1].lower() + translated[1:]
+    return translated
+
+
+def expand_translation(text: str, representative: str, translated: str) -> str:
+    """
+    대표 원문의 번역을 같은 그룹의 다른 원문에 맞게 변형
+
+    번역문의 끝 문장 부호를 떼고 원문의 것('...' 또는 '…' 그대로)과 앞뒤 공백을 다시 붙이며,
+    대소문자 차이를 반영합니다.
+    """
+    if text == representative or not translated:
+        return translated
+
+    leading, body, punctuation, trailing = split_string(text)
+    _, representative_body, _, _ = split_string(representative)
+    _, translated_body, translated_punctuation, _ = split_string(translated)
+
+    if translated_punctuation in _FULLWIDTH.values():
+        punctuation = _FULLWIDTH.get(punctuation, punctuation)
+
+    translated_body = _match_case(translated_body, representative_body, body)
+    return f"{leading}{translated_body}{punctuation}{trailing}"
@@ -0,0 +1,512 @@
+import os
+import re
+import csv
+import json
+import pickle
+import hashlib
+import logging
+from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 원본이 이보다 짧으면 치환하지 않음 (오탐지 방지)
+MIN_SOURCE_LENGTH = 3
+
+# 치환표 직렬화 형식 버전 (이스케이프 규칙이 바뀌면 올려서 디스크 캐시를 무효화)
+TABLE_FORMAT_VERSION = 1
+TABLE_CACHE_DIR = Path.home() / '.cursor_translator' / 'tables'
+
+# 디스크에 남길 치환표 수와 전체 크기 상한 (최근에 쓴 것부터 남기고 나머지 삭제)
+MAX_CACHED_TABLE_FILES = 16
+MAX_TABLE_CACHE_BYTES = 256 * 1024 * 1024
+
+# 따옴표 위치마다 시작하는 문자열 리터럴 (겹치는 후보도 모두 찾기 위해 전방 탐색 사용)
+_LITERAL_CANDIDATE_RE = re.compile(rb'(?=(["\'])((?:\\.|(?!\1)[^\\\n\r])*)\1)', re.DOTALL)
+
+# 지정한 위치에서 시작하는 문자열 리터럴 하나
+_LITERAL_AT_RE = re.compile(rb'(["\'])(?:\\.|(?!\1)[^\\\n\r])*\1', re.DOTALL)
+
+# 어떤 따옴표 안에 넣어도 안전한 리터럴 본문 (두 종류의 따옴표와 줄 종결자가 모두 이스케이프됨)
+_SAFE_BODY_RE = re.compile(r'(?:\\.|[^"\'\\\n\r\u2028\u2029])*\Z', re.DOTALL)
+
+# 전체 토큰화용: 문자열/템플릿 리터럴과 주석 (괄호 균형은 이 토큰 밖에서만 셈)
+_JS_TOKEN_RE = re.compile(
+    rb'"(?:\\.|[^"\\\n\r])*"|\'(?:\\.|[^\'\\\n\r])*\'|`(?:\\.|[^`\\])*`|//[^\n]*|/\*.*?\*/',
+    re.DOTALL
+)
+
+# 괄호 균형 검사 시 치환 구간 앞뒤로 함께 보는 범위 (바이트)
+VERIFY_WINDOW = 64
+
+_LINE_TERMINATORS = {'\n': '\\n', '\r': '\\r', '\u2028': '\\u2028', '\u2029': '\\u2029'}
+
+
+def js_escape(text: str, quotes: str = '"\'') -> str:
+    """
+    원문 표기(이스케이프가 풀리지 않은 소스 형태) 문자열을 JS 문자열 리터럴 본문으로 안전하게 변환
+
+    이미 이스케이프된 시퀀스(\\n, \\", \\u2028 등)는 그대로 두고, 이스케이프되지 않은 따옴표,
+    줄 종결자, 끝에 홀로 남은 백슬래시만 이스케이프합니다.
+
+    Args:
+        text: 추출된 원문 또는 번역문
+        quotes: 이스케이프할 따옴표 문자
+    """
+    result = []
+    i = 0
+    length = len(text)
+
+    while i < length:
+        char = text[i]
+        if char == '\\':
+            if i + 1 < length and text[i + 1] not in _LINE_TERMINATORS:
+                # 기존 이스케이프 시퀀스 유지
+                result.append(text[i:i + 2])
+                i += 2
+                continue
+            result.append('\\\\')
+        elif char in quotes:
+            result.append('\\' + char)
+        elif char in _LINE_TERMINATORS:
+            result.append(_LINE_TERMINATORS[char])
+        else:
+            result.append(char)
+        i += 1
+
+    return ''.join(result)
+
+
+def _is_escaped(data: bytes, position: int) -> bool:
+    """position의 문자가 백슬래시로 이스케이프되어 있는지 (앞의 연속된 백슬래시 수가 홀수)"""
+    count = 0
+    while position - count - 1 >= 0 and data[position - count - 1] == 0x5C:
+        count += 1
+    return count % 2 == 1
+
+
+class ReplacementTable:
+    """
+    번역 사전에서 미리 계산한 치환표
+
+    따옴표 종류별로 '소스에 나타나는 원문 리터럴 본문' -> '이스케이프된 번역문 본문'을 바이트로 보관하므로,
+    번들을 패치할 때는 사전 조회만 하면 됩니다. 번역문은 생성 시 한 번 검증되며,
+    리터럴 본문으로 안전하지 않은 항목은 제외됩니다.
+    """
+
+    def __init__(self, translations: Dict[str, str]):
+        self.entries = {b'"': {}, b"'": {}}
+        self.sources = {b'"': {}, b"'": {}}
+        self.rejected = []
+        # 이스케이프 후 같은 리터럴이 되는 원문들 (예: "Don't"와 "Don\'t") - 마지막 항목이 사용됨
+        self.collisions = {}
+
+        for original, translated in translations.items():
+            if not translated or len(original) < MIN_SOURCE_LENGTH:
+                continue
+
+            # 번역문은 두 종류의 따옴표를 모두 이스케이프하여 어느 리터럴 안에서도 안전하게 만듦
+            replacement = js_escape(translated)
+            if not _SAFE_BODY_RE.match(replacement):
+                self.rejected.append(original)
+                continue
+
+            for quote in ('"', "'"):
+                key = js_escape(original, quote).encode('utf-8')
+                previous = self.sources[quote.encode()].get(key)
+                if previous is not None and previous != original:
+                    self.collisions.setdefault(key.decode('utf-8'), {previous}).add(original)
+                self.entries[quote.encode()][key] = replacement.encode('utf-8')
+                self.sources[quote.encode()][key] = original
+
+        if self.rejected:
+            logger.warning(f"리터럴로 안전하게 변환할 수 없는 번역 {len(self.rejected)}개를 제외합니다.")
+
+    def __len__(self):
+        return len(self.entries[b'"'])
+
+    def lookup(self, quote: bytes, body: bytes):
+        """리터럴 본문에 해당하는 (원문, 치환 본문) 또는 None"""
+        replacement = self.entries[quote].get(body)
+        if replacement is None:
+            return None
+        return self.sources[quote][body], replacement
+
+
+class TableCache:
+    """
+    번역 파일별 치환표 캐시
+
+    번역 파일 내용의 해시를 키로 치환표를 디스크에 직렬화해 두어, 사전이 바뀌지 않았으면
+    다음 실행에서 다시 만들지 않고 불러옵니다. 상주 모드(서비스, 감시)에서는 최근에 쓴
+    capacity개 언어의 치환표를 메모리에 유지합니다. 디스크 캐시는 파일 수정 시각을 마지막
+    사용 시각으로 삼아, 새 치환표를 저장할 때 오래된 파일부터 정리합니다.
+    """
+
+    def __init__(self, cache_dir=None, capacity=4, max_files=MAX_CACHED_TABLE_FILES,
+                 max_bytes=MAX_TABLE_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else TABLE_CACHE_DIR
+        self.capacity = capacity
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._tables = OrderedDict()
+
+    def _cache_file(self, digest):
+        return self.cache_dir / f"{digest}.v{TABLE_FORMAT_VERSION}.pickle"
+
+    def load(self, translation_file) -> ReplacementTable:
+        """번역 파일의 치환표 (메모리 -> 디스크 캐시 -> 새로 만들기 순)"""
+        with open(translation_file, 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+
+        table = self._tables.get(digest)
+        if table is not None:
+            self._tables.move_to_end(digest)
+            return table
+
+        cache_file = self._cache_file(digest)
+        try:
+            with open(cache_file, 'rb') as f:
+                table = pickle.load(f)
+            # 마지막 사용 시각 갱신 (정리할 때 최근에 쓴 파일을 남기도록)
+            os.utime(cache_file)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"치환표 캐시를 읽을 수 없어 다시 만듭니다: {e}")
+
+        if not isinstance(table, ReplacementTable):
+            table = ReplacementTable(json.loads(content.decode('utf-8')))
+            self._save(cache_file, table)
+
+        self._tables[digest] = table
+        while len(self._tables) > self.capacity:
+            self._tables.popitem(last=False)
+        return table
+
+    def _save(self, cache_file, table):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_file.with_name(cache_file.name + '.tmp')
+            with open(temp_file, 'wb') as f:
+                pickle.dump(table, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+            self._evict()
+        except OSError as e:
+            logger.warning(f"치환표 캐시 저장 중 오류 발생: {e}")
+
+    def _evict(self):
+        """최근에 쓴 max_files개, max_bytes 이하만 남기고 오래된 치환표 파일 삭제 (이전 형식 버전 포함)"""
+        files = []
+        for path in self.cache_dir.glob('*.pickle'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, path))
+        files.sort(reverse=True)
+
+        total = 0
+        for index, (_, size, path) in enumerate(files):
+            total += size
+            # 방금 저장한 가장 최근 파일은 상한을 넘더라도 남김
+            if index and (index >= self.max_files or total > self.max_bytes):
+                path.unlink(missing_ok=True)
+
+    def __len__(self):
+        return len(self._tables)
+
+
+def find_matches(data: bytes, table: ReplacementTable) -> List[Tuple[int, int, bytes, str]]:
+    """
+    번들에서 사전에 있는 문자열 리터럴을 한 번의 스캔으로 모두 찾기 (겹치는 후보 포함)
+
+    Returns:
+        [(시작, 끝, 치환 리터럴, 원문)] - 시작 위치 순
+    """
+    matches = []
+    for match in _LITERAL_CANDIDATE_RE.finditer(data):
+        start = match.start()
+        if _is_escaped(data, start):
+            # 다른 문자열 안의 \" 는 리터럴의 시작이 아님
+            continue
+        quote, body = match.group(1), match.group(2)
+        found = table.lookup(quote, body)
+        if found is None:
+            continue
+        original, replacement = found
+        end = start + len(body) + 2
+        matches.append((start, end, quote + replacement + quote, original))
+    return matches
+
+
+def select_edits(matches):
+    """겹치는 후보 중 앞에서 시작한 것부터 겹치지 않게 선택"""
+    edits = []
+    last_end = -1
+    for match in matches:
+        if match[0] >= last_end:
+            edits.append(match)
+            last_end = match[1]
+    return edits
+
+
+def apply_edits(data: bytes, edits) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """
+    선택된 치환을 적용
+
+    Returns:
+        (패치된 데이터, 패치 후 기준 치환 구간 목록)
+    """
+    parts = []
+    regions = []
+    position = 0
+    offset = 0
+
+    for start, end, replacement, _ in edits:
+        parts.append(data[position:start])
+        parts.append(replacement)
+        new_start = start + offset
+        regions.append((new_start, new_start + len(replacement)))
+        offset += len(replacement) - (end - start)
+        position = end
+
+    parts.append(data[position:])
+    return b''.join(parts), regions
+
+
+def check_regions(data: bytes, regions) -> List[int]:
+    """
+    치환된 구간만 검사하여 각 구간이 정확히 하나의 완결된 문자열 리터럴인지 확인
+
+    Returns:
+        문제가 있는 구간의 시작 위치 목록 (비어 있으면 정상)
+    """
+    broken = []
+    for start, end in regions:
+        match = _LITERAL_AT_RE.match(data, start)
+        if not match or match.end() != end:
+            broken.append(start)
+    return broken
+
+
+def count_string_literals(data: bytes) -> int:
+    """번들 전체를 토큰화하여 문자열 리터럴 수 세기 (백그라운드 프로세스에서 실행)"""
+    return sum(1 for match in _JS_TOKEN_RE.finditer(data) if data[match.start()] in b'"\'')
+
+
+def _bracket_balance(data: bytes) -> Tuple[int, int, int]:
+    """리터럴과 주석 밖의 (), [], {} 균형"""
+    outside = _JS_TOKEN_RE.sub(b'', data)
+    return (outside.count(b'(') - outside.count(b')'),
+            outside.count(b'[') - outside.count(b']'),
+            outside.count(b'{') - outside.count(b'}'))
+
+
+def verify_patch(original: bytes, patched: bytes, edits, regions, full: bool = False,
+                 executor: Optional[Executor] = None) -> List[str]:
+    """
+    패치된 번들 검증
+
+    치환 구간마다 완결된 문자열 리터럴인지, 구간 주변의 따옴표/괄호 균형이 원본과 같은지 확인합니다.
+    full이면 원본과 패치본 전체를 백그라운드 프로세스에서 토큰화하여 문자열 리터럴 수를 비교합니다.
+
+    Args:
+        executor: full 검증에 쓸 프로세스 풀 (상주 서비스처럼 시작할 때 한 번 만든 풀을 공유,
+                  없으면 검증마다 만들고 종료)
+
+    Returns:
+        문제 설명 목록 (비어 있으면 정상)
+    """
+    problems = []
+    owned = None
+    futures = None
+    if full:
+        # 구간 검사와 동시에 진행
+        if executor is None:
+            executor = owned = ProcessPoolExecutor(max_workers=2)
+        futures = [executor.submit(count_string_literals, original), executor.submit(count_string_literals, patched)]
+
+    try:
+        broken = check_regions(patched, regions)
+        if broken:
+            problems.append(f"완결된 리터럴이 아닌 치환 구간 {len(broken)}개 (첫 위치: {broken[0]})")
+
+        for index, ((start, end, _, original_text), (new_start, new_end)) in enumerate(zip(edits, regions)):
+            # 창이 이웃한 치환 구간에 걸치지 않도록 (걸치면 잘린 리터럴이 서로 달라짐)
+            lead = min(VERIFY_WINDOW, start - (edits[index - 1][1] if index else 0))
+            trail = min(VERIFY_WINDOW, (edits[index + 1][0] if index + 1 < len(edits) else len(original)) - end)
+            before = original[start - lead:end + trail]
+            after = patched[new_start - lead:new_end + trail]
+            if _bracket_balance(before) != _bracket_balance(after):
+                problems.append(f"위치 {new_start}의 '{original_text}' 주변 괄호/따옴표 균형이 달라졌습니다.")
+                break
+
+        if futures:
+            before_count, after_count = (future.result() for future in futures)
+            if before_count != after_count:
+                problems.append(f"문자열 리터럴 수가 달라졌습니다: {before_count} -> {after_count}")
+    finally:
+        if owned:
+            owned.shutdown(wait=True)
+
+    return problems
+
+
+def patch_bundle(data: bytes, translations: Dict[str, str]):
+    """
+    번들 데이터에 번역 적용
+
+    Returns:
+        (패치된 데이터, 적용된 치환 목록 [(시작, 끝, 치환 리터럴, 원문)], 패치 후 치환 구간 목록)
+
+    Raises:
+        ValueError: 치환된 구간이 올바른 문자열 리터럴이 아닌 경우
+    """
+    table = translations if isinstance(translations, ReplacementTable) else ReplacementTable(translations)
+    edits = select_edits(find_matches(data, table))
+    patched, regions = apply_edits(data, edits)
+
+    broken = check_regions(patched, regions)
+    if broken:
+        raise ValueError(f"번역 적용 후 문자열 리터럴 검증 실패: {len(broken)}개 구간 (첫 위치: {broken[0]})")
+
+    return patched, edits, regions
+
+
+def build_report(data: bytes, translations: Dict[str, str]) -> Dict:
+    """
+    번들에 쓰지 않고 번역 적용 결과를 미리 계산 (patch_bundle과 같은 한 번의 스캔 사용)
+
+    Returns:
+        {
+            'entries': {원문: {'occurrences': 적용될 위치 수, 'overlapped': 겹쳐서 건너뛸 위치 수}},
+            'unmatched': 번들에서 찾지 못한 원문 목록,
+            'overlaps': [{'position', 'original', 'inside'}] - 앞선 치환에 가려지는 후보,
+            'ambiguous': [{'literal', 'originals'}] - 이스케이프 후 같은 리터럴이 되는 원문들,
+            'rejected': 리터럴로 안전하게 변환할 수 없는 번역의 원문 목록,
+        }
+    """
+    table = translations if isinstance(translations, ReplacementTable) else ReplacementTable(translations)
+    matches = find_matches(data, table)
+    edits = select_edits(matches)
+    selected = {match[0] for match in edits}
+
+    entries = {}
+    for quote in table.sources.values():
+        for original in quote.values():
+            entries.setdefault(original, {'occurrences': 0, 'overlapped': 0})
+
+    overlaps = []
+    covering = None
+    edit_index = 0
+    for start, end, _, original in matches:
+        # 이 후보를 덮는 직전 선택 치환 찾기
+        while edit_index < len(edits) and edits[edit_index][0] <= start:
+            covering = edits[edit_index]
+            edit_index += 1
+
+        if start in selected:
+            entries[original]['occurrences'] += 1
+        else:
+            entries[original]['overlapped'] += 1
+            overlaps.append({'position': start, 'original': original, 'inside': covering[3] if covering else None})
+
+    return {
+        'bundle_size': len(data),
+        'applied_positions': len(edits),
+        'entries': entries,
+        'unmatched': sorted(original for original, counts in entries.items() if not counts['occurrences']),
+        'overlaps': overlaps,
+        'ambiguous': [{'literal': literal, 'originals': sorted(originals)} for literal, originals in sorted(table.collisions.items())],
+        'rejected': sorted(table.rejected),
+    }
+
+
+def save_report(report: Dict, output_file) -> None:
+    """
+    드라이런 보고서 저장 (.csv이면 원문별 표, 그 외에는 JSON 전체)
+
+    CSV 상태 값: unmatched(0곳), single(1곳), multiple(여러 곳), ambiguous(다른 원문과 충돌), rejected(적용 불가)
+    """
+    output_file = str(output_file)
+    if not output_file.lower().endswith('.csv'):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return
+
+    ambiguous = {original for item in report['ambiguous'] for original in item['originals']}
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['original', 'occurrences', 'overlapped', 'status'])
+        for original, counts in sorted(report['entries'].items()):
+            occurrences = counts['occurrences']
+            if original in ambiguous:
+                status = 'ambiguous'
+            elif occurrences == 0:
+                status = 'unmatched'
+            else:
+                status = 'single' if occurrences == 1 else 'multiple'
+            writer.writerow([original, occurrences, counts['overlapped'], status])
+        for original in report['rejected']:
+            writer.writerow([original, 0, 0, 'rejected'])
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_reverse_log(original: bytes, patched: bytes, edits, regions) -> Dict:
+    """
+    패치를 되돌리기 위한 역패치 기록 생성 (번들 전체 사본 대신 바뀐 구간만 보관)
+
+    Returns:
+        {'original_sha256', 'patched_sha256', 'edits': [[패치 후 시작 위치, 삽입된 리터럴, 원래 리터럴]]}
+    """
+    reverse_edits = []
+    for (start, end, _, _), (new_start, new_end) in zip(edits, regions):
+        reverse_edits.append([
+            new_start,
+            patched[new_start:new_end].decode('utf-8', 'surrogateescape'),
+            original[start:end].decode('utf-8', 'surrogateescape'),
+        ])
+
+    return {
+        'version': 1,
+        'original_sha256': _sha256(original),
+        'patched_sha256': _sha256(patched),
+        'edits': reverse_edits,
+    }
+
+
+def reverse_patch(patched: bytes, log: Dict) -> bytes:
+    """
+    역패치 기록으로 원본 복원 (한 번의 순차 처리)
+
+    Raises:
+        ValueError: 번들이 기록과 다르거나 복원 결과가 원본 해시와 일치하지 않는 경우
+    """
+    if _sha256(patched) != log['patched_sha256']:
+        raise ValueError("번들이 역패치 기록을 만든 이후 변경되었습니다.")
+
+    parts = []
+    position = 0
+    for start, inserted, original in log['edits']:
+        inserted = inserted.encode('utf-8', 'surrogateescape')
+        end = start + len(inserted)
+        if patched[start:end] != inserted:
+            raise ValueError(f"역패치 위치 {start}의 내용이 기록과 다릅니다.")
+        parts.append(patched[position:start])
+        parts.append(original.encode('utf-8', 'surrogateescape'))
+        position = end
+
+    parts.append(patched[position:])
+    restored = b''.join(parts)
+
+    if _sha256(restored) != log['original_sha256']:
+        raise ValueError("복원된 번들이 원본 해시와 일치하지 않습니다.")
+    return restored
@@ -0,0 +1,94 @@
+import re
+from typing import List, Optional, Tuple
+
+# 번역 엔진이 건드리면 안 되는 구간 (앞에 있을수록 우선)
+PLACEHOLDER_PATTERNS = [
+    r'</?[A-Za-z][^<>]*>',                                      # HTML 태그
+    r'`[^`\n]+`',                                               # 인라인 코드
+    r'\$\{[^{}]*\}',                                            # 템플릿 치환 ${name}
+    r'\{[A-Za-z0-9_.]+\}',                                      # 인덱스/이름 자리표시자 {0}, {name}
+    r'%(?:\d+\$)?[sdif]',                                       # printf 형식 %s, %1$s
+    r'\\u[0-9A-Fa-f]{4}|\\x[0-9A-Fa-f]{2}|\\.',                 # JS 이스케이프 \n, \t, \uXXXX
+    r'&&',                                                      # 메뉴 니모닉
+    r'\b(?:Ctrl|Cmd|Alt|Shift|Option|Meta|Win)(?:\+[A-Za-z0-9]+)+\b',  # 단축키
+]
+
+_PLACEHOLDER_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in PLACEHOLDER_PATTERNS))
+
+# 일반 텍스트 모드 토큰 (번역 엔진이 단어로 취급하지 않는 괄호 문자 사용)
+_PLAIN_TOKEN = '⟦{}⟧'
+_PLAIN_TOKEN_RE = re.compile('⟦(\\d+)⟧')
+
+# XML 모드 토큰 (DeepL tag_handling=xml에서 그대로 유지되는 빈 태그)
+_XML_TOKEN = '<x id="{}"/>'
+_XML_TOKEN_RE = re.compile(r'<x id="(\d+)"\s*/>')
+
+
+def _xml_escape(text: str) -> str:
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _xml_unescape(text: str) -> str:
+    return text.replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
+
+
+def has_placeholders(text: str) -> bool:
+    """보호가 필요한 구간이 있는지 여부"""
+    return bool(_PLACEHOLDER_RE.search(text))
+
+
+def protect(text: str, xml: bool = False) -> Tuple[str, List[str]]:
+    """
+    자리표시자와 마크업을 안정적인 토큰으로 치환
+
+    Args:
+        text: 원문
+        xml: True이면 XML 태그 토큰을 쓰고 나머지 텍스트를 XML 이스케이프 (DeepL tag_handling=xml용)
+
+    Returns:
+        (토큰으로 치환된 텍스트, 원래 구간 목록 - 토큰 번호 순)
+    """
+    tokens = []
+    parts = []
+    position = 0
+
+    for match in _PLACEHOLDER_RE.finditer(text):
+        plain = text[position:match.start()]
+        parts.append(_xml_escape(plain) if xml else plain)
+        parts.append((_XML_TOKEN if xml else _PLAIN_TOKEN).format(len(tokens)))
+        tokens.append(match.group(0))
+        position = match.end()
+
+    plain = text[position:]
+    parts.append(_xml_escape(plain) if xml else plain)
+    return ''.join(parts), tokens
+
+
+def restore(masked: str, tokens: List[str], xml: bool = False) -> Optional[str]:
+    """
+    번역된 텍스트의 토큰을 원래 구간으로 복원
+
+    Returns:
+        복원된 텍스트, 토큰이 사라지거나 중복/변형된 경우 None
+    """
+    token_re = _XML_TOKEN_RE if xml else _PLAIN_TOKEN_RE
+    found = [int(index) for index in token_re.findall(masked)]
+    if sorted(found) != list(range(len(tokens))):
+        return None
+
+    parts = []
+    position = 0
+    for match in token_re.finditer(masked):
+        plain = masked[position:match.start()]
+        parts.append(_xml_unescape(plain) if xml else plain)
+        parts.append(tokens[int(match.group(1))])
+        position = match.end()
+
+    plain = masked[position:]
+    parts.append(_xml_unescape(plain) if xml else plain)
+    restored = ''.join(parts)
+
+    # 토큰 문자가 변형되어 남아 있으면 거부
+    if not xml and ('⟦' in restored or '⟧' in restored):
+        return None
+    return restored
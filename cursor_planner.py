@@ -0,0 +1,239 @@
+import os
+import re
+import json
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from cursor_normalize import canonical_key, group_strings
+from cursor_memory import TranslationMemory
+from cursor_catalog import TranslationCatalog
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 번역 우선순위 (작을수록 먼저 번역)
+PRIORITY_HIGH = 0     # 메뉴 항목, 설정 화면 문자열
+PRIORITY_LABEL = 1    # 짧은 레이블 (버튼, 제목)
+PRIORITY_NORMAL = 2   # 문장, 설명
+
+# 설정 화면에 나오는 문자열로 보는 단어 (정규형 기준)
+_SETTINGS_RE = re.compile(r'setting|preference|option|configur')
+
+# 한 번의 요청으로 보내는 항목 수 (DeepL 한도와 같음, 키별 배분 계산용)
+PLAN_BATCH_SIZE = 50
+
+
+def string_priority(text: str, key: Optional[str] = None) -> int:
+    """원문의 번역 우선순위 (PRIORITY_HIGH, PRIORITY_LABEL, PRIORITY_NORMAL), key는 미리 계산한 정규형"""
+    if '&&' in text:
+        return PRIORITY_HIGH
+    key = canonical_key(text) if key is None else key
+    if _SETTINGS_RE.search(key):
+        return PRIORITY_HIGH
+    if len(key.split()) <= 3:
+        return PRIORITY_LABEL
+    return PRIORITY_NORMAL
+
+
+def pending_strings(template: Iterable[str], existing: Dict[str, str], target_lang: str,
+                    journaled: Iterable[str] = (), normalize: bool = True,
+                    memory: Optional[TranslationMemory] = None, fuzzy: Optional[str] = 'context',
+                    key: Callable[[str], str] = canonical_key):
+    """
+    번역 API로 보낼 원문 선택 (update_translation_json과 비용 계획이 같은 기준을 쓰도록 공유)
+
+    Args:
+        template: 템플릿의 원문 목록
+        existing: 기존 번역 {원문: 번역문}
+        journaled: 이전 실행의 저널에 이미 기록된 원문
+        normalize: 정규형이 같은 원문을 묶어 한 번만 번역할지 여부
+        memory: 비슷한 이전 원문을 찾을 번역 메모리 (fuzzy가 None이면 사용하지 않음)
+        fuzzy: 'context', 'prefill' 또는 None
+        key: 정규형 함수 (미리 계산해 둔 정규형을 쓰는 경우 지정)
+
+    Returns:
+        (번역할 원문 목록, {대표 원문: 그룹 원문 목록}, {대표 원문: (원문, 번역문)} 재사용,
+         {대표 원문: (이전 원문, 이전 번역문, 유사도)}, 새로 번역할 대표 원문 목록)
+    """
+    journaled = set(journaled)
+    to_translate = [key for key in template if not existing.get(key) and key not in journaled]
+
+    # 정규형(대소문자, 공백, 끝 문장 부호)이 같은 문자열은 한 번만 번역
+    groups = group_strings(to_translate, key) if normalize else {text: [text] for text in to_translate}
+
+    # 이미 번역된 문자열과 정규형이 같으면 API 호출 없이 재사용
+    known = {}
+    if normalize and groups:
+        for source, value in existing.items():
+            if value:
+                known.setdefault(key(source), (source, value))
+
+    reused = {rep: known[key(rep)] for rep in groups if key(rep) in known}
+    representatives = [rep for rep in groups if rep not in reused]
+
+    # 조금 바뀐 원문은 번역 메모리에서 비슷한 이전 원문을 찾아 활용
+    similar = {}
+    if fuzzy and representatives:
+        if memory is None:
+            memory = TranslationMemory()
+            memory.update(target_lang, existing)
+        for representative in representatives:
+            match = memory.lookup(representative, target_lang)
+            if match:
+                similar[representative] = match
+        representatives = [text for text in representatives if text not in similar]
+
+    return to_translate, groups, reused, similar, representatives
+
+
+def schedule(work: Dict[str, List[str]], budget: Optional[int] = None,
+             key: Callable[[str], str] = canonical_key) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """
+    언어별 번역할 원문을 글자 수 예산 안에서 우선순위 순으로 배정
+
+    우선순위가 같으면 템플릿 순서, 같은 원문은 언어 순서대로 배정하며, 예산을 넘는 항목은
+    건너뛰고 더 짧은 다음 항목을 계속 배정합니다.
+
+    Args:
+        work: {언어 코드: 번역할 원문 목록}
+        budget: 글자 수 예산 (None이면 모두 배정)
+        key: 정규형 함수 (우선순위 판단용)
+
+    Returns:
+        ({언어 코드: 이번에 번역할 원문}, {언어 코드: 다음 실행으로 미룬 원문}) - 각 목록은 우선순위 순
+    """
+    priorities = {}
+    items = []
+    for lang_index, (lang, texts) in enumerate(work.items()):
+        for position, text in enumerate(texts):
+            priority = priorities.get(text)
+            if priority is None:
+                priority = priorities[text] = string_priority(text, key(text))
+            items.append((priority, position, lang_index, lang, text))
+    items.sort(key=lambda item: item[:3])
+
+    scheduled = {lang: [] for lang in work}
+    deferred = {lang: [] for lang in work}
+    spent = 0
+    for _, _, _, lang, text in items:
+        if budget is None or spent + len(text) <= budget:
+            scheduled[lang].append(text)
+            spent += len(text)
+        else:
+            deferred[lang].append(text)
+    return scheduled, deferred
+
+
+class TranslationPlan:
+    """
+    번역 실행 계획 (언어별 과금 글자 수, 예산 배정, 키별 배분)
+
+    DeepL은 번역하는 원문의 글자 수만 과금하므로 (문맥은 과금되지 않음) 실제 번역 요청에
+    들어갈 원문만 셉니다.
+    """
+
+    def __init__(self, work: Dict[str, List[str]], budget: Optional[int] = None, batch_size: int = PLAN_BATCH_SIZE,
+                 key: Callable[[str], str] = canonical_key):
+        self.work = work
+        self.budget = budget
+        self.batch_size = batch_size
+        self.scheduled, self.deferred = schedule(work, budget, key)
+
+    def characters(self, lang: Optional[str] = None, scheduled: bool = True) -> int:
+        """과금 글자 수 (lang이 None이면 모든 언어, scheduled가 False이면 예산과 무관한 전체)"""
+        source = self.scheduled if scheduled else self.work
+        langs = [lang] if lang else list(source)
+        return sum(len(text) for lang in langs for text in source.get(lang, ()))
+
+    def assign_keys(self, pool) -> Dict[str, int]:
+        """
+        배정된 원문을 키 풀의 선택 규칙대로 배치 단위로 나눴을 때 키별 글자 수
+
+        Args:
+            pool: 남은 글자 수를 조회한 DeepLKeyPool (계산 중에 예약한 글자 수는 되돌림)
+
+        Returns:
+            {키 표시: 글자 수}, 어느 키로도 보낼 수 없는 글자 수는 '(한도 부족)'
+        """
+        assigned = {}
+        reserved = []
+        for lang, texts in self.scheduled.items():
+            for start in range(0, len(texts), self.batch_size):
+                chars = sum(len(text) for text in texts[start:start + self.batch_size])
+                if not any(key.remaining is None or key.remaining >= chars for key in pool.live):
+                    assigned['(한도 부족)'] = assigned.get('(한도 부족)', 0) + chars
+                    continue
+                key = pool.acquire(chars)
+                reserved.append((key, chars))
+                assigned[key.label] = assigned.get(key.label, 0) + chars
+
+        for key, chars in reserved:
+            pool.release(key, refund=chars)
+        return assigned
+
+    def report(self, pool=None) -> List[str]:
+        """사람이 읽는 계획 요약 (한 줄씩)"""
+        lines = []
+        for lang in self.work:
+            total = self.characters(lang, scheduled=False)
+            line = f"{lang}: {len(self.work[lang])}개 항목, {total:,}자"
+            if self.budget is not None:
+                line += f" (이번 실행 {len(self.scheduled[lang])}개 {self.characters(lang):,}자, 미룸 {len(self.deferred[lang])}개)"
+            lines.append(line)
+
+        total = self.characters(scheduled=False)
+        if self.budget is None:
+            lines.append(f"합계: {total:,}자")
+        else:
+            lines.append(f"합계: {total:,}자 중 {self.characters():,}자 배정 (예산 {self.budget:,}자)")
+
+        if pool is not None:
+            for label, chars in self.assign_keys(pool).items():
+                lines.append(f"  키 {label}: {chars:,}자")
+        return lines
+
+
+def plan_translation(template_file: str, languages: List[str], directory: str = '.',
+                     normalize: bool = True, fuzzy: Optional[str] = 'context',
+                     budget: Optional[int] = None, catalog: Optional[TranslationCatalog] = None) -> TranslationPlan:
+    """
+    API를 호출하지 않고 언어별로 번역할 원문과 과금 글자 수 계산
+
+    기존 번역 파일, 중단된 실행의 저널, 정규화 재사용을 update_translation_json과 같은 기준으로
+    반영합니다. 'context' 모드에서 비슷한 이전 번역이 있는 원문도 번역 요청을 보내므로 그대로
+    세고, 'prefill' 모드에서만 번역 메모리로 채울 원문을 뺍니다.
+
+    Args:
+        template_file: 추출 결과 템플릿 파일
+        languages: 대상 언어 코드 목록
+        directory: 번역 파일이 있는 디렉토리
+        budget: 글자 수 예산 (None이면 제한 없음)
+        catalog: 이미 불러온 번역 카탈로그 (없으면 디렉토리에서 불러옴)
+
+    Returns:
+        TranslationPlan
+    """
+    from cursor_backends import TranslationBackend
+
+    with open(template_file, 'r', encoding='utf-8') as f:
+        template = list(json.load(f))
+
+    languages = [lang.lower() for lang in languages]
+    catalog = catalog if catalog is not None else TranslationCatalog.from_directory(directory, languages)
+    memory = TranslationMemory(catalog=catalog) if fuzzy == 'prefill' else None
+
+    # 정규형은 원문 ID마다 한 번만 계산 (여러 언어가 같은 원문 표를 공유)
+    catalog.ids(template)
+    canonical, source_ids = catalog.canonical_keys(), catalog.sources._ids
+    key = lambda text: canonical[source_ids[text]] if text in source_ids else canonical_key(text)
+
+    work = {}
+    for lang in languages:
+        journal_file = os.path.join(directory, f"cursor_translations_{lang}.json.journal.jsonl")
+        journaled = [source for source, _ in TranslationBackend._read_journal(journal_file)]
+        *_, representatives = pending_strings(
+            template, catalog.translations(lang), lang, journaled, normalize,
+            memory, fuzzy if fuzzy == 'prefill' else None, key)
+        work[lang] = representatives
+
+    return TranslationPlan(work, budget, key=key)
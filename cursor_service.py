@@ -0,0 +1,313 @@
+import os
+import hmac
+import json
+import uuid
+import secrets
+import threading
+import logging
+from pathlib import Path
+from urllib.parse import urlsplit
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional
+
+from cursor_extractor import CursorExtractor, ExtractionCache
+from cursor_patcher import ReplacementTable, TableCache
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+
+# 완료된 작업 기록을 이 개수까지만 보관
+MAX_FINISHED_JOBS = 1000
+
+# 설치본마다 한 번 만드는 서비스 토큰 (요청의 Authorization: Bearer <토큰> 헤더와 비교)
+TOKEN_FILE = Path.home() / '.cursor_translator' / 'service_token'
+
+# 요청의 Host/Origin으로 허용하는 이름 (다른 사이트가 브라우저로 보내는 요청 차단)
+LOCAL_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+# 요청에서 파일 경로로 받는 필드 (허용된 디렉토리 안의 경로만 받음)
+PATH_FIELDS = ('bundle', 'translation_file', 'strings_file')
+
+
+def load_service_token(token_file=TOKEN_FILE) -> str:
+    """서비스 토큰 읽기 (없으면 소유자만 읽을 수 있는 파일로 새로 만듦)"""
+    token_file = Path(token_file)
+    if token_file.exists():
+        token = token_file.read_text(encoding='utf-8').strip()
+        if token:
+            return token
+    token_file.parent.mkdir(parents=True, exist_ok=True)
+    token = secrets.token_hex(32)
+    fd = os.open(token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+    return token
+
+
+def known_roots(translations_dir='.') -> List[Path]:
+    """작업 경로로 허용하는 디렉토리 (작업 디렉토리, 번역 파일 디렉토리, 알려진 Cursor 설치 경로)"""
+    from cursor_finder import CursorFinder
+
+    roots = [Path.cwd(), Path(translations_dir)]
+    installation = CursorFinder().find_cursor_installation()
+    if installation:
+        roots.append(Path(installation))
+    return roots
+
+
+def _is_local(value: Optional[str]) -> bool:
+    """Host 헤더 또는 Origin 값이 이 컴퓨터를 가리키는지 여부"""
+    if not value:
+        return False
+    host = urlsplit(value if '//' in value else f"//{value}").hostname
+    return host in LOCAL_HOSTS
+
+
+class TranslationService:
+    """
+    여러 설치본을 한 프로세스에서 패치하는 상주 서비스
+
+    번역 사전으로 만든 치환표와 추출 캐시를 메모리에 유지하고, 작업은 크기가 제한된
+    작업자 풀에서 동시에 처리합니다. 같은 번들에 대한 작업은 순서대로 처리됩니다.
+    작업 요청의 파일 경로는 allowed_roots 안에 있어야 합니다.
+    """
+
+    def __init__(self, patch_file: Callable, translations_dir='.', workers=4, max_pending=64, cached_languages=8,
+                 allowed_roots: Optional[Iterable] = None, full_verify=False):
+        """
+        Args:
+            patch_file: (번들 경로, ReplacementTable, 백업 여부, 전체 검증 여부, 검증 프로세스 풀)
+                        -> 적용된 위치 수 또는 None
+            translations_dir: cursor_translations_<언어>.json 파일이 있는 디렉토리
+            workers: 동시에 처리할 작업 수
+            max_pending: 대기 중인 작업이 이보다 많으면 새 작업을 거부
+            cached_languages: 메모리에 유지할 치환표 수
+            allowed_roots: 작업 경로로 허용할 디렉토리 (기본값: known_roots)
+            full_verify: 패치 전후 번들 전체를 토큰화하여 검증할지 여부
+        """
+        self.patch_file = patch_file
+        self.translations_dir = Path(translations_dir)
+        self.max_pending = max_pending
+        self.allowed_roots = [Path(root).resolve() for root in
+                              (allowed_roots if allowed_roots is not None else known_roots(translations_dir))]
+        self.full_verify = full_verify
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        # 전체 검증용 프로세스 풀은 작업자 스레드가 아닌 시작 시점에 한 번만 만듦
+        self.verify_executor = ProcessPoolExecutor(max_workers=2) if full_verify else None
+        self.extraction_cache = ExtractionCache()
+
+        self.tables = TableCache(capacity=cached_languages)
+        self.jobs = {}
+        self._bundle_locks = {}
+        self._lock = threading.Lock()
+        self._extract_lock = threading.Lock()
+        self._table_lock = threading.Lock()
+
+    def replacement_table(self, translation_file) -> ReplacementTable:
+        """번역 파일의 치환표 (사전 내용이 같으면 메모리 또는 디스크 캐시 재사용)"""
+        with self._table_lock:
+            return self.tables.load(translation_file)
+
+    def is_allowed(self, path) -> bool:
+        """경로가 허용된 디렉토리 안에 있는지 여부 (심볼릭 링크와 .. 은 풀어서 판단)"""
+        resolved = Path(path).resolve()
+        return any(resolved == root or root in resolved.parents for root in self.allowed_roots)
+
+    def _bundle_lock(self, bundle):
+        with self._lock:
+            return self._bundle_locks.setdefault(str(Path(bundle).resolve()), threading.Lock())
+
+    def submit(self, request: Dict) -> Optional[str]:
+        """
+        작업 등록
+
+        Args:
+            request: {'action': 'patch'|'extract', 'bundle': 번들 경로, 'language': 언어 코드,
+                      'translation_file': 번역 파일 경로(선택), 'backup': 백업 여부(기본값 True)}
+
+        Returns:
+            작업 ID, 대기 중인 작업이 너무 많으면 None
+
+        Raises:
+            ValueError: 요청 형식이 잘못되었거나 허용되지 않은 경로인 경우
+        """
+        action = request.get('action', 'patch')
+        if action not in ('patch', 'extract'):
+            raise ValueError(f"지원하지 않는 작업: {action}")
+        if not request.get('bundle'):
+            raise ValueError("bundle 경로가 필요합니다.")
+        if action == 'patch' and not (request.get('language') or request.get('translation_file')):
+            raise ValueError("language 또는 translation_file이 필요합니다.")
+        if action == 'patch' and request.get('language') and not str(request['language']).isalnum():
+            raise ValueError(f"잘못된 언어 코드: {request['language']}")
+        for field in PATH_FIELDS:
+            if request.get(field) and not self.is_allowed(request[field]):
+                raise ValueError(f"허용되지 않은 경로입니다 ({field}): {request[field]}")
+
+        with self._lock:
+            pending = sum(1 for job in self.jobs.values() if job['status'] in ('queued', 'running'))
+            if pending >= self.max_pending:
+                return None
+            job_id = uuid.uuid4().hex
+            self.jobs[job_id] = {'id': job_id, 'status': 'queued', 'request': request, 'result': None, 'error': None}
+            self._prune_jobs()
+            self.jobs[job_id]['future'] = self.executor.submit(self._run, job_id)
+        return job_id
+
+    def _prune_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] in ('done', 'failed')]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def _run(self, job_id):
+        job = self.jobs[job_id]
+        request = job['request']
+        job['status'] = 'running'
+        try:
+            if request.get('action', 'patch') == 'extract':
+                job['result'] = self._extract(request)
+            else:
+                job['result'] = self._patch(request)
+            job['status'] = 'done'
+        except Exception as e:
+            job['error'] = str(e)
+            job['status'] = 'failed'
+            logger.error(f"작업 {job_id} 실패: {e}")
+
+    def _patch(self, request):
+        translation_file = request.get('translation_file') or \
+            self.translations_dir / f"cursor_translations_{request['language'].lower()}.json"
+        table = self.replacement_table(translation_file)
+
+        with self._bundle_lock(request['bundle']):
+            applied = self.patch_file(Path(request['bundle']), table, request.get('backup', True),
+                                      self.full_verify, self.verify_executor)
+        if applied is None:
+            raise RuntimeError("적용된 번역이 없거나 패치에 실패했습니다.")
+        return {'positions': applied}
+
+    def _extract(self, request):
+        bundle = Path(request['bundle'])
+        strings_file = request.get('strings_file') or bundle.with_name(bundle.name + '.strings.txt')
+        # 추출 캐시는 하나의 파일로 저장되므로 한 번에 하나씩 처리
+        with self._extract_lock:
+            extractor = CursorExtractor(bundle, strings_file)
+            output = extractor.extract_all_strings(cache_file=self.extraction_cache)
+        return {'strings_file': str(output)}
+
+    def status(self, job_id) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        if not job:
+            return None
+        return {key: value for key, value in job.items() if key != 'future'}
+
+    def wait(self, job_id, timeout=None) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        if job and job.get('future'):
+            job['future'].result(timeout)
+        return self.status(job_id)
+
+    def health(self) -> Dict:
+        with self._lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return {'status': 'ok', 'jobs': counts, 'cached_tables': len(self.tables)}
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        if self.verify_executor:
+            self.verify_executor.shutdown(wait=True)
+        self.extraction_cache.save()
+
+
+def _make_handler(service: TranslationService, token: str):
+    class Handler(BaseHTTPRequestHandler):
+        def _authorized(self) -> bool:
+            """로컬 요청이고 서비스 토큰이 맞는지 확인 (아니면 403 응답)"""
+            origin = self.headers.get('Origin')
+            if not _is_local(self.headers.get('Host')) or (origin is not None and not _is_local(origin)):
+                self._send(403, {'error': '로컬 요청만 받습니다.'})
+                return False
+            scheme, _, value = (self.headers.get('Authorization') or '').partition(' ')
+            if scheme.lower() != 'bearer' or not hmac.compare_digest(value.strip(), token):
+                self._send(403, {'error': '서비스 토큰이 필요합니다.'})
+                return False
+            return True
+
+        def _send(self, code, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path == '/health':
+                self._send(200, service.health())
+            elif self.path.startswith('/jobs/'):
+                status = service.status(self.path[len('/jobs/'):])
+                self._send(200, status) if status else self._send(404, {'error': '작업을 찾을 수 없습니다.'})
+            else:
+                self._send(404, {'error': '알 수 없는 경로'})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            if self.path != '/jobs':
+                self._send(404, {'error': '알 수 없는 경로'})
+                return
+            # 브라우저가 확인 없이 보낼 수 있는 form/text 요청은 받지 않음
+            if (self.headers.get('Content-Type') or '').split(';')[0].strip().lower() != 'application/json':
+                self._send(415, {'error': 'Content-Type: application/json이 필요합니다.'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                job_id = service.submit(request)
+            except (ValueError, AttributeError) as e:
+                self._send(400, {'error': str(e)})
+                return
+
+            if job_id is None:
+                self._send(503, {'error': '대기 중인 작업이 너무 많습니다.'})
+            elif request.get('wait'):
+                self._send(200, service.wait(job_id))
+            else:
+                self._send(202, {'id': job_id, 'status': 'queued'})
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return Handler
+
+
+def serve(patch_file: Callable, host='127.0.0.1', port=DEFAULT_PORT, workers=4, translations_dir='.',
+          full_verify=False):
+    """
+    HTTP 서비스 실행 (Ctrl+C로 종료)
+
+    POST /jobs        {"bundle": "...", "language": "ko", "wait": true} 형식으로 작업 등록
+    GET  /jobs/<id>   작업 상태 조회
+    GET  /health      서비스 상태
+
+    모든 요청에는 Authorization: Bearer <TOKEN_FILE의 토큰> 헤더가 필요합니다.
+    """
+    token = load_service_token()
+    service = TranslationService(patch_file, translations_dir, workers, full_verify=full_verify)
+    server = ThreadingHTTPServer((host, port), _make_handler(service, token))
+    logger.info(f"번역 서비스 시작: http://{host}:{server.server_port} (작업자 {workers}개, 토큰: {TOKEN_FILE})")
+    logger.info(f"허용된 경로: {', '.join(str(root) for root in service.allowed_roots)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("번역 서비스를 종료합니다.")
+    finally:
+        server.server_close()
+        service.shutdown()
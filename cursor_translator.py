@@ -1,16 +1,158 @@
 import os
 import json
+import time
 import requests
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
+
+from cursor_backends import TranslationBackend, BackendUnavailable, BACKEND_NAMES, create_backend
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class DeepLTranslator:
+# DeepL API 엔드포인트 (Free 키는 ':fx'로 끝남)
+DEEPL_FREE_API = "https://api-free.deepl.com/v2"
+DEEPL_PRO_API = "https://api.deepl.com/v2"
+
+# 응답 상태 코드
+QUOTA_EXCEEDED = 456   # 이번 기간의 글자 수 한도 소진
+TOO_MANY_REQUESTS = 429
+FORBIDDEN = 403        # 잘못된 키
+
+REQUEST_TIMEOUT = 30
+
+# /usage를 조회하지 않은 키의 남은 글자 수로 가정하는 값 (Pro 키의 무제한 한도와 같은 크기)
+UNKNOWN_REMAINING = 10 ** 12
+
+
+def deepl_api_base(api_key: str) -> str:
+    """API 키 종류에 맞는 엔드포인트 (Free 키: api-free.deepl.com, Pro 키: api.deepl.com)"""
+    return DEEPL_FREE_API if api_key.endswith(':fx') else DEEPL_PRO_API
+
+
+def parse_api_keys(api_keys: Union[str, List[str], None]) -> List[str]:
+    """쉼표나 공백으로 구분한 키 문자열(또는 목록)을 중복 없는 키 목록으로 변환"""
+    if not api_keys:
+        return []
+    if isinstance(api_keys, str):
+        api_keys = api_keys.replace(',', ' ').split()
+    return list(dict.fromkeys(key.strip() for key in api_keys if key and key.strip()))
+
+
+class DeepLKey:
+    """키 풀의 API 키 하나 (엔드포인트, 남은 글자 수, 관측한 지연 시간)"""
+
+    def __init__(self, api_key: str, latency: float = 1.0):
+        self.api_key = api_key
+        self.base_url = deepl_api_base(api_key)
+        self.remaining: Optional[int] = None   # 남은 글자 수 (조회 전에는 None)
+        self.latency = latency                 # 요청 하나의 평균 처리 시간 (초, 지수 이동 평균)
+        self.in_flight = 0
+        self.exhausted = False
+
+    @property
+    def label(self) -> str:
+        """로그용 키 표시 (앞 8자만)"""
+        return f"{self.api_key[:8]}...{' (Free)' if self.base_url == DEEPL_FREE_API else ' (Pro)'}"
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"DeepL-Auth-Key {self.api_key}"}
+
+
+class DeepLKeyPool:
+    """
+    여러 DeepL API 키에 요청을 나누어 보내는 키 풀
+
+    요청마다 남은 글자 수가 많고 응답이 빠른 키를 고르며, 한도를 소진한 키(456)나
+    잘못된 키(403)는 실행 중에 바로 제외합니다. 여러 스레드에서 함께 사용할 수 있습니다.
+    """
+
+    def __init__(self, api_keys: Union[str, List[str], None], latency: float = 1.0):
+        self.keys = [DeepLKey(api_key, latency) for api_key in parse_api_keys(api_keys)]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def live(self) -> List[DeepLKey]:
+        return [key for key in self.keys if not key.exhausted]
+
+    def refresh_usage(self) -> List[DeepLKey]:
+        """
+        각 키의 /usage를 조회하여 남은 글자 수 갱신 (글자 수가 차감되지 않는 요청)
+
+        Returns:
+            사용할 수 있는 키 목록
+        """
+        for key in self.keys:
+            try:
+                response = requests.get(f"{key.base_url}/usage", headers=key.headers, timeout=REQUEST_TIMEOUT)
+                if response.status_code in (FORBIDDEN, QUOTA_EXCEEDED):
+                    self.drop(key, "잘못된 키" if response.status_code == FORBIDDEN else "한도 소진")
+                    continue
+                response.raise_for_status()
+                usage = response.json()
+                key.remaining = max(0, usage.get('character_limit', 0) - usage.get('character_count', 0))
+                if key.remaining == 0:
+                    self.drop(key, "한도 소진")
+                else:
+                    logger.info(f"DeepL 키 {key.label}: 남은 글자 수 {key.remaining:,}")
+            except Exception as e:
+                self.drop(key, f"사용량 조회 실패: {e}")
+        return self.live
+
+    def drop(self, key: DeepLKey, reason: str):
+        with self._lock:
+            if not key.exhausted:
+                key.exhausted = True
+                logger.warning(f"DeepL 키 {key.label}를 제외합니다 ({reason}). 남은 키: {len(self.live)}개")
+
+    def acquire(self, chars: int) -> Optional[DeepLKey]:
+        """
+        chars 글자를 보낼 키 선택 (남은 글자 수 / (지연 x 진행 중인 요청 수)가 가장 큰 키)
+
+        선택한 키의 남은 글자 수에서 chars를 미리 빼 두므로 동시에 요청해도 한 키에 몰리지 않습니다.
+
+        Returns:
+            사용할 키, 남은 키가 없으면 None
+        """
+        with self._lock:
+            live = self.live
+            if not live:
+                return None
+            # 한도가 충분한 키를 우선하고, 없으면 가장 많이 남은 키로 시도 (부족하면 456으로 제외됨)
+            enough = [key for key in live if key.remaining is None or key.remaining >= chars] or live
+            key = max(enough, key=lambda key: (key.remaining if key.remaining is not None else UNKNOWN_REMAINING)
+                      / (max(key.latency, 0.01) * (1 + key.in_flight)))
+            key.in_flight += 1
+            if key.remaining is not None:
+                key.remaining = max(0, key.remaining - chars)
+            return key
+
+    def release(self, key: DeepLKey, elapsed: Optional[float] = None, refund: int = 0):
+        """요청을 마친 키 반환 (elapsed로 지연 시간 갱신, 보내지 못한 글자 수는 refund로 되돌림)"""
+        with self._lock:
+            key.in_flight -= 1
+            if elapsed is not None:
+                key.latency = 0.7 * key.latency + 0.3 * elapsed
+            if refund and key.remaining is not None:
+                key.remaining += refund
+
+
+class DeepLTranslator(TranslationBackend):
     """DeepL API를 사용한 번역 클래스"""
     
+    name = 'deepl'
+    max_batch_size = 50          # DeepL은 요청당 최대 50개 텍스트
+    max_concurrency = 4          # 키 하나당 동시 요청 수
+    cost_per_char = 20 / 1000000  # DeepL API Pro: 100만 자당 20 EUR
+    latency = 1.0
+    xml_placeholders = True      # tag_handling=xml로 자리표시자 태그를 보존
+    
     SAMPLE_TRANSLATIONS = {
         # 영어 -> 한국어 샘플 번역
         'ko': {
@@ -92,29 +234,80 @@ class DeepLTranslator:
         }
     }
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Union[str, List[str], None] = None):
         """
         DeepL 번역기 초기화
         
         Args:
-            api_key: DeepL API 키 (선택사항)
+            api_key: DeepL API 키 (선택사항), 쉼표로 구분하거나 목록으로 여러 키 지정 가능
         """
-        self.api_key = api_key
-        self.api_url = "https://api-free.deepl.com/v2/translate"
+        self.pool = DeepLKeyPool(api_key, latency=self.latency)
+        self.api_key = self.pool.keys[0].api_key if self.pool.keys else None
         self.has_valid_key = False
         
-        if self.api_key:
-            try:
-                # API 키 유효성 테스트
-                self.translate_text("test", target_lang="EN")
-                self.has_valid_key = True
-                logger.info("DeepL API 키가 유효합니다.")
-            except Exception as e:
-                logger.warning(f"DeepL API 키가 유효하지 않습니다: {str(e)}")
+        if self.pool.keys:
+            # /usage 조회로 키 유효성 확인 (번역 요청과 달리 글자 수가 차감되지 않음)
+            live = self.pool.refresh_usage()
+            self.has_valid_key = bool(live)
+            if live:
+                # 배치는 키마다 max_concurrency개까지 동시에 요청되고 진행 중인 요청 수로 키에 나뉨
+                self.max_concurrency = DeepLTranslator.max_concurrency * len(live)
+                logger.info(f"DeepL API 키 {len(live)}/{len(self.pool)}개가 유효합니다.")
+            else:
+                logger.warning("유효한 DeepL API 키가 없습니다. 샘플 번역만 사용 가능합니다.")
         else:
             logger.info("DeepL API 키가 제공되지 않았습니다. 샘플 번역만 사용 가능합니다.")
     
-    def translate_text(self, text: str, target_lang: str) -> str:
+    def _post_translate(self, payload: Dict) -> Dict:
+        """
+        키 풀의 키로 /translate 요청
+        
+        한도를 소진했거나(456) 잘못된 키(403)는 풀에서 제외하고 다른 키로 다시 보냅니다.
+        
+        Returns:
+            응답 JSON
+        
+        Raises:
+            BackendUnavailable: 풀에 남은 키가 없는 경우 (모든 키의 한도 소진 또는 잘못된 키)
+            RuntimeError: 남은 키가 모두 요청 제한(429)에 걸린 경우
+        """
+        texts = payload["text"]
+        chars = sum(len(text) for text in texts) if isinstance(texts, list) else len(texts)
+        
+        for _ in range(2 * len(self.pool)):
+            key = self.pool.acquire(chars)
+            if key is None:
+                break
+            started = time.monotonic()
+            try:
+                response = requests.post(f"{key.base_url}/translate", data=payload, headers=key.headers,
+                                         timeout=REQUEST_TIMEOUT)
+            except Exception:
+                self.pool.release(key, refund=chars)
+                raise
+            elapsed = time.monotonic() - started
+            
+            if response.status_code in (QUOTA_EXCEEDED, FORBIDDEN):
+                self.pool.release(key, refund=chars)
+                self.pool.drop(key, "한도 소진" if response.status_code == QUOTA_EXCEEDED else "잘못된 키")
+                continue
+            if response.status_code == TOO_MANY_REQUESTS:
+                # 다음 선택에서 밀리도록 지연 시간을 늘리고 다른 키로 재시도
+                self.pool.release(key, elapsed=elapsed + self.latency * 5, refund=chars)
+                continue
+            
+            if response.ok:
+                self.pool.release(key, elapsed=elapsed)
+            else:
+                self.pool.release(key, refund=chars)
+            response.raise_for_status()
+            return response.json()
+        
+        if not self.pool.live:
+            raise BackendUnavailable("사용할 수 있는 DeepL API 키가 없습니다 (모든 키의 한도 소진).")
+        raise RuntimeError("DeepL 요청 제한(429)으로 번역하지 못했습니다.")
+    
+    def translate_text(self, text: str, target_lang: str) -> Optional[str]:
         """
         단일 텍스트 번역
         
@@ -123,7 +316,8 @@ class DeepLTranslator:
             target_lang: 대상 언어 코드 (예: EN, KO, JA)
             
         Returns:
-            번역된 텍스트
+            번역된 텍스트, 번역하지 못하면 (샘플 번역 없음, 요청 실패 포함) None
+            (원문을 번역으로 저장하지 않도록)
         """
         if not text:
             return ""
@@ -133,34 +327,78 @@ class DeepLTranslator:
             lang_code = target_lang.lower()
             if lang_code in self.SAMPLE_TRANSLATIONS and text in self.SAMPLE_TRANSLATIONS[lang_code]:
                 return self.SAMPLE_TRANSLATIONS[lang_code][text]
-            return text  # 샘플 번역이 없으면 원본 반환
+            return None
             
         # DeepL API 호출
         payload = {
-            "auth_key": self.api_key,
             "text": text,
             "target_lang": target_lang.upper()
         }
         
         try:
-            response = requests.post(self.api_url, data=payload)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self._post_translate(payload)
             if "translations" in result and result["translations"]:
                 return result["translations"][0]["text"]
-            return text
+            logger.error("번역 오류: 응답에 번역이 없습니다.")
+            return None
+        except BackendUnavailable:
+            raise
         except Exception as e:
             logger.error(f"번역 오류: {str(e)}")
-            return text
+            return None
     
-    def batch_translate(self, texts: List[str], target_lang: str) -> List[str]:
+    @property
+    def protects_placeholders(self) -> bool:
+        # 샘플 번역은 원문 그대로 조회해야 하므로 실제 API를 쓸 때만 보호
+        return bool(self.api_key and self.has_valid_key)
+    
+    def _translate_masked(self, texts: List[str], target_lang: str, context: Optional[str] = None) -> List[Optional[str]]:
+        return self._request_batch(texts, target_lang, tag_handling="xml", context=context)
+    
+    def _request_batch(self, texts: List[str], target_lang: str, tag_handling: Optional[str] = None,
+                       context: Optional[str] = None) -> List[Optional[str]]:
+        """
+        DeepL API 배치 요청
+        
+        Returns:
+            번역된 텍스트 목록, 요청이 실패하면 모든 항목이 None (원문을 번역으로 저장하지 않도록)
+        
+        Raises:
+            BackendUnavailable: 풀에 남은 키가 없는 경우 (남은 배치도 모두 실패하므로 실행을 중단)
+        """
+        payload = {
+            "text": texts,
+            "target_lang": target_lang.upper()
+        }
+        if tag_handling:
+            payload["tag_handling"] = tag_handling
+        if context:
+            payload["context"] = context
+        
+        try:
+            result = self._post_translate(payload)
+        except BackendUnavailable:
+            raise
+        except Exception as e:
+            logger.error(f"배치 번역 오류: {str(e)}")
+            return [None] * len(texts)
+        
+        translations = result.get("translations") or []
+        if len(translations) != len(texts):
+            logger.error(f"배치 번역 오류: 요청 {len(texts)}개에 번역 {len(translations)}개가 돌아왔습니다.")
+            return [None] * len(texts)
+        return [t["text"] for t in translations]
+    
+    def batch_translate(self, texts: List[str], target_lang: str, tag_handling: Optional[str] = None,
+                        context: Optional[str] = None) -> List[str]:
         """
         텍스트 배치 번역
         
         Args:
             texts: 번역할 텍스트 목록
             target_lang: 대상 언어 코드
+            tag_handling: DeepL 태그 처리 방식 (예: "xml", 자리표시자 토큰 보존용)
+            context: 번역에 참고할 문맥 (번역되지 않으며 과금되지 않음)
             
         Returns:
             번역된 텍스트 목록
@@ -179,129 +417,30 @@ class DeepLTranslator:
                     results.append(text)  # 샘플 번역이 없으면 원본 반환
             return results
             
-        # DeepL API 배치 요청
-        payload = {
-            "auth_key": self.api_key,
-            "text": texts,
-            "target_lang": target_lang.upper()
-        }
-        
-        try:
-            response = requests.post(self.api_url, data=payload)
-            response.raise_for_status()
-            
-            result = response.json()
-            if "translations" in result:
-                return [t["text"] for t in result["translations"]]
-            return texts
-        except Exception as e:
-            logger.error(f"배치 번역 오류: {str(e)}")
-            return texts
-    
-    def translate_file(self, input_file: str, output_file: str, target_lang: str) -> Tuple[int, int]:
-        """
-        파일 내 텍스트 번역
-        
-        Args:
-            input_file: 번역할 텍스트가 있는 파일 경로
-            output_file: 번역 결과를 저장할 파일 경로
-            target_lang: 대상 언어 코드
-            
-        Returns:
-            (번역된 항목 수, 총 항목 수)
-        """
-        if not os.path.exists(input_file):
-            logger.error(f"입력 파일이 존재하지 않습니다: {input_file}")
-            return (0, 0)
-            
-        with open(input_file, 'r', encoding='utf-8') as f:
-            texts = [line.strip() for line in f if line.strip()]
-            
-        translated = self.batch_translate(texts, target_lang)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for text in translated:
-                f.write(f"{text}\n")
-                
-        return (len(translated), len(texts))
+        # DeepL API 배치 요청 (실패한 항목은 원문 그대로)
+        translated = self._request_batch(texts, target_lang, tag_handling, context)
+        return [result if result is not None else text for text, result in zip(texts, translated)]
     
-    def update_translation_json(self, template_file: str, output_file: str, target_lang: str) -> Tuple[int, int]:
-        """
-        번역 JSON 파일 업데이트
-        
-        Args:
-            template_file: 템플릿 JSON 파일 경로
-            output_file: 출력 JSON 파일 경로
-            target_lang: 대상 언어 코드
-            
-        Returns:
-            (번역된 항목 수, 총 항목 수)
-        """
-        if not os.path.exists(template_file):
-            logger.error(f"템플릿 파일이 존재하지 않습니다: {template_file}")
-            return (0, 0)
-            
-        # 기존 번역 파일 로드 (있는 경우)
-        existing_translations = {}
-        if os.path.exists(output_file):
-            try:
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    existing_translations = json.load(f)
-            except Exception as e:
-                logger.warning(f"기존 번역 파일을 로드하는 중 오류 발생: {str(e)}")
-                
-        # 템플릿 로드
-        with open(template_file, 'r', encoding='utf-8') as f:
-            template = json.load(f)
-            
-        # 번역 필요한 항목 필터링
-        to_translate = []
-        keys_to_translate = []
-        
-        for key, value in template.items():
-            # 이미 번역된 항목은 건너뛰기
-            if key in existing_translations and existing_translations[key]:
-                continue
-                
-            to_translate.append(key)
-            keys_to_translate.append(key)
-            
-        # 번역 실행
-        if to_translate:
-            translated_texts = self.batch_translate(to_translate, target_lang)
-            
-            # 번역 결과 저장
-            for i, key in enumerate(keys_to_translate):
-                if i < len(translated_texts):
-                    template[key] = translated_texts[i]
-        
-        # 기존 번역 추가
-        for key, value in existing_translations.items():
-            if key in template and value:
-                template[key] = value
-                
-        # 결과 저장
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(template, f, ensure_ascii=False, indent=2)
-            
-        # 번역된 항목 수 계산
-        translated_count = sum(1 for value in template.values() if value)
-        return (translated_count, len(template))
-
+    def is_miss(self, source: str, result: str) -> bool:
+        # 샘플 모드에서 원문이 그대로 돌아온 항목은 미번역으로 취급
+        if not self.api_key or not self.has_valid_key:
+            return not result or result == source
+        return not result
 
 def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='DeepL API를 사용한 Cursor IDE 번역')
-    parser.add_argument('--api-key', help='DeepL API 키')
+    parser.add_argument('--api-key', help='DeepL API 키 (쉼표로 구분하여 여러 개 지정 가능)')
     parser.add_argument('--target-lang', default='KO', help='대상 언어 코드 (예: KO, JA, ZH)')
     parser.add_argument('--template', default='cursor_translations_template.json', help='번역 템플릿 파일')
     parser.add_argument('--output', help='출력 파일')
+    parser.add_argument('--backend', default='deepl', choices=BACKEND_NAMES, help='번역 백엔드 (기본값: deepl)')
     
     args = parser.parse_args()
     
     api_key = args.api_key or os.environ.get('DEEPL_API_KEY')
-    translator = DeepLTranslator(api_key)
+    translator = create_backend(args.backend, api_key)
     
     template_file = args.template
     if not os.path.exists(template_file):
@@ -310,7 +449,11 @@ def main():
     
     output_file = args.output or f"cursor_translations_{args.target_lang.lower()}.json"
     
-    translated, total = translator.update_translation_json(template_file, output_file, args.target_lang)
+    try:
+        translated, total = translator.update_translation_json(template_file, output_file, args.target_lang)
+    except BackendUnavailable as e:
+        logger.error(f"번역이 중단되었습니다: {str(e)} 다시 실행하면 저널에서 이어서 진행합니다.")
+        return
     logger.info(f"번역 완료: {translated}/{total} 항목이 번역되었습니다.")
     logger.info(f"번역 파일이 저장되었습니다: {output_file}")
 
@@ -1,16 +1,31 @@
 import sys
+import time
+
+# 첫 화면 표시 시간은 인터프리터가 이 모듈을 읽기 시작한 시점부터 잼
+STARTUP_TIME = time.perf_counter()
+
 import os
 import json
+import glob
+import logging
 from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, QLabel, 
                            QVBoxLayout, QHBoxLayout, QWidget, QComboBox, 
                            QTextEdit, QFileDialog, QProgressBar, QMessageBox,
-                           QTabWidget, QLineEdit, QCheckBox, QGroupBox, QGridLayout)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+                           QTabWidget, QLineEdit, QCheckBox, QGroupBox, QGridLayout,
+                           QTableView, QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QAbstractTableModel, QModelIndex, QTimer
 from PyQt5.QtGui import QIcon, QFont
 
-# 커서 파인더 클래스 임포트
-from cursor_finder import CursorFinder, find_main_js_file
+# cursor_finder, cursor_editor 등은 처음 필요할 때 임포트 (첫 화면 표시를 늦추지 않도록)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 첫 화면 표시 시간 기준 (초)
+FIRST_PAINT_BUDGET = 1.0
+
+SETTINGS_FILE = Path.home() / '.cursor_translator' / 'settings.json'
 
 # 이 파일 없으면 import 오류 날 수 있으므로 주석 처리
 # 실제 코드 통합 시 import 활성화
@@ -26,20 +41,111 @@ class WorkerThread(QThread):
         self.function = function
         self.args = args
         self.kwargs = kwargs
+        self.result = None
 
     def run(self):
         try:
             result = self.function(*self.args, **self.kwargs)
+            self.result = result
             self.finished.emit(True, "작업이 완료되었습니다.")
         except Exception as e:
             self.finished.emit(False, str(e))
 
 
+class FilterThread(QThread):
+    """번역 편집기 검색/필터를 UI 스레드 밖에서 실행"""
+    results = pyqtSignal(int, list)
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, store, generation, **conditions):
+        """
+        Args:
+            store: 번역 편집기 저장소
+            generation: 검색 요청 번호 (늦게 끝난 이전 검색 결과를 버리기 위함)
+            conditions: TranslationEditorStore.filter 인자 (UI 스레드에서 만든 edits 스냅샷 포함)
+        """
+        super().__init__()
+        self.store = store
+        self.generation = generation
+        self.conditions = conditions
+
+    def run(self):
+        try:
+            self.results.emit(self.generation, self.store.filter(**self.conditions))
+        except Exception as e:
+            self.failed.emit(self.generation, str(e))
+
+
+class TranslationTableModel(QAbstractTableModel):
+    """
+    번역 편집기 표 모델
+
+    보이는 행의 데이터만 저장소에서 읽으므로 항목이 수만 개여도 행을 미리 만들지 않습니다.
+    """
+    COLUMNS = ['원문', '번역', '유형']
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.ids = list(store.rows)
+
+    def set_ids(self, ids):
+        self.beginResetModel()
+        self.ids = ids
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        source_id = self.ids[index.row()]
+        if role == Qt.FontRole and source_id in self.store.edits:
+            font = QFont()
+            font.setBold(True)
+            return font
+        if role not in (Qt.DisplayRole, Qt.EditRole, Qt.ToolTipRole):
+            return None
+        if index.column() == 0:
+            return self.store.source(source_id)
+        if index.column() == 1:
+            return self.store.translation(source_id)
+        return self.store.type_of(source_id)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == 1:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.column() != 1 or role != Qt.EditRole:
+            return False
+        self.store.set_translation(self.ids[index.row()], value)
+        self.dataChanged.emit(self.index(index.row(), 0), self.index(index.row(), len(self.COLUMNS) - 1))
+        return True
+
+
 class CursorTranslatorApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, measure_startup=False):
         super().__init__()
-        self.initUI()
         self.cursor_path = None
+        self.measure_startup = measure_startup
+        self.first_paint_time = None
+        self.startup_worker = None
+        self.editor_tab_ready = False
+        self.editor_store = None
+        self.editor_generation = 0
+        self.editor_threads = []
         self.languages = {
             "한국어": "ko",
             "영어": "en",
@@ -53,8 +159,65 @@ class CursorTranslatorApp(QMainWindow):
             "이탈리아어": "it",
             "포르투갈어": "pt"
         }
-        self.load_saved_settings()
-        self.find_cursor_installation()
+        self.initUI()
+        # 설정, 설치 경로, 번역 파일 정보는 창을 띄운 뒤 백그라운드에서 불러옴
+        QTimer.singleShot(0, self.load_startup_state)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.first_paint_time is None:
+            self.first_paint_time = time.perf_counter() - STARTUP_TIME
+            if self.first_paint_time > FIRST_PAINT_BUDGET:
+                logger.warning(f"첫 화면 표시가 느립니다: {self.first_paint_time:.3f}초 (기준 {FIRST_PAINT_BUDGET}초)")
+            else:
+                logger.info(f"첫 화면 표시: {self.first_paint_time:.3f}초")
+            if self.measure_startup:
+                QTimer.singleShot(0, self.close)
+
+    def load_startup_state(self):
+        self.startup_worker = WorkerThread(self._read_startup_state)
+        self.startup_worker.finished.connect(self.on_startup_state_loaded)
+        self.startup_worker.start()
+
+    def _read_startup_state(self):
+        """저장된 설정, 캐시된 설치 경로, 번역 파일 정보 (UI 스레드 밖에서 실행)"""
+        from cursor_finder import CursorFinder
+        
+        settings = self.load_saved_settings()
+        
+        # 설치 경로는 검색하지 않고 캐시된 값만 사용 (없을 때만 검색)
+        cursor_path = settings.get('cursor_path')
+        if not cursor_path or not os.path.exists(cursor_path):
+            cursor_path = CursorFinder().cached_installation()
+        
+        translation_files = {}
+        for path in glob.glob('cursor_translations_*.json'):
+            lang_code = os.path.basename(path)[len('cursor_translations_'):-len('.json')]
+            stat = os.stat(path)
+            translation_files[lang_code] = (stat.st_size, stat.st_mtime)
+        
+        return settings, cursor_path, translation_files
+
+    def on_startup_state_loaded(self, success, message):
+        if not success:
+            self.status_label.setText(f"설정을 불러오지 못했습니다: {message}")
+            return
+        settings, cursor_path, translation_files = self.startup_worker.result
+        self.apply_loaded_settings(settings)
+        
+        for index in range(self.lang_combo.count()):
+            lang_code = self.languages[self.lang_combo.itemText(index)]
+            if lang_code in translation_files:
+                size, mtime = translation_files[lang_code]
+                modified = time.strftime('%Y-%m-%d %H:%M', time.localtime(mtime))
+                self.lang_combo.setItemData(index, f"번역 파일 {size // 1024} KB, {modified} 수정", Qt.ToolTipRole)
+        
+        if cursor_path:
+            self.cursor_path = cursor_path
+            self.path_label.setText(str(cursor_path))
+            self.status_label.setText(f"준비됨 (번역 파일 {len(translation_files)}개)")
+        elif not self.measure_startup:
+            self.find_cursor_installation()
 
     def initUI(self):
         self.setWindowTitle('Cursor 번역기')
@@ -73,6 +236,10 @@ class CursorTranslatorApp(QMainWindow):
         self.translation_tab = QWidget()
         self.tabs.addTab(self.translation_tab, "번역")
         
+        # 번역 편집 탭 (처음 열 때 번역 파일을 불러옴)
+        self.editor_tab = QWidget()
+        self.tabs.addTab(self.editor_tab, "번역 편집")
+        
         # 설정 탭
         self.settings_tab = QWidget()
         self.tabs.addTab(self.settings_tab, "설정")
@@ -81,10 +248,11 @@ class CursorTranslatorApp(QMainWindow):
         self.about_tab = QWidget()
         self.tabs.addTab(self.about_tab, "정보")
         
-        # 각 탭의 UI 설정
+        # 각 탭의 UI 설정 (번역 편집 탭은 처음 열 때 구성)
         self.setup_translation_tab()
         self.setup_settings_tab()
         self.setup_about_tab()
+        self.tabs.currentChanged.connect(self.on_tab_changed)
         
         # 상태 표시줄
         self.statusBar().showMessage('준비')
@@ -96,7 +264,7 @@ class CursorTranslatorApp(QMainWindow):
         path_group = QGroupBox("Cursor 설치 경로")
         path_layout = QHBoxLayout()
         
-        self.path_label = QLabel("경로를 찾는 중...")
+        self.path_label = QLabel("경로를 불러오는 중...")
         path_layout.addWidget(self.path_label)
         
         self.find_path_btn = QPushButton("경로 찾기")
@@ -177,6 +345,146 @@ class CursorTranslatorApp(QMainWindow):
         
         layout.addLayout(button_layout)
 
+    def setup_editor_tab(self):
+        from cursor_editor import KEY_TYPES
+        
+        layout = QVBoxLayout(self.editor_tab)
+        
+        # 언어, 검색, 필터
+        filter_layout = QHBoxLayout()
+        self.editor_lang_combo = QComboBox()
+        for lang in self.languages.keys():
+            self.editor_lang_combo.addItem(lang)
+        self.editor_lang_combo.currentIndexChanged.connect(self.load_editor_store)
+        filter_layout.addWidget(self.editor_lang_combo)
+        
+        self.editor_search_input = QLineEdit()
+        self.editor_search_input.setPlaceholderText("원문 또는 번역문 검색")
+        filter_layout.addWidget(self.editor_search_input)
+        
+        self.editor_state_combo = QComboBox()
+        self.editor_state_combo.addItems(["전체", "미번역", "변경됨"])
+        filter_layout.addWidget(self.editor_state_combo)
+        
+        self.editor_type_combo = QComboBox()
+        self.editor_type_combo.addItem("모든 유형")
+        self.editor_type_combo.addItems(KEY_TYPES)
+        filter_layout.addWidget(self.editor_type_combo)
+        layout.addLayout(filter_layout)
+        
+        # 입력이 멈춘 뒤에 검색하도록 잠시 기다림
+        self.editor_filter_timer = QTimer(self)
+        self.editor_filter_timer.setSingleShot(True)
+        self.editor_filter_timer.setInterval(150)
+        self.editor_filter_timer.timeout.connect(self.run_editor_filter)
+        self.editor_search_input.textChanged.connect(self.editor_filter_timer.start)
+        self.editor_state_combo.currentIndexChanged.connect(self.run_editor_filter)
+        self.editor_type_combo.currentIndexChanged.connect(self.run_editor_filter)
+        
+        # 표 (행 높이를 고정하여 보이는 행만 그리도록 함)
+        self.editor_table = QTableView()
+        self.editor_table.setWordWrap(False)
+        self.editor_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.editor_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.editor_table.verticalHeader().setDefaultSectionSize(24)
+        self.editor_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.editor_table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.editor_table)
+        
+        # 저장
+        bottom_layout = QHBoxLayout()
+        self.editor_count_label = QLabel("")
+        bottom_layout.addWidget(self.editor_count_label)
+        bottom_layout.addStretch()
+        self.editor_save_btn = QPushButton("편집 내용 저장")
+        self.editor_save_btn.clicked.connect(self.save_editor_changes)
+        bottom_layout.addWidget(self.editor_save_btn)
+        layout.addLayout(bottom_layout)
+
+    def on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.editor_tab and not self.editor_tab_ready:
+            self.setup_editor_tab()
+            self.editor_tab_ready = True
+            self.load_editor_store()
+
+    def load_editor_store(self):
+        """선택한 언어의 번역 파일을 백그라운드에서 불러옴"""
+        if self.editor_store is not None and self.editor_store.edits:
+            response = QMessageBox.question(
+                self, "저장하지 않은 편집", "저장하지 않은 편집 내용이 있습니다. 버리고 다른 언어를 불러올까요?",
+                QMessageBox.Yes | QMessageBox.No)
+            if response == QMessageBox.No:
+                # 아직 불러와 있는 언어로 선택을 되돌림 (다시 묻지 않도록 신호는 막음)
+                loaded = [i for i in range(self.editor_lang_combo.count())
+                          if self.languages[self.editor_lang_combo.itemText(i)].lower() == self.editor_store.lang]
+                if loaded:
+                    self.editor_lang_combo.blockSignals(True)
+                    self.editor_lang_combo.setCurrentIndex(loaded[0])
+                    self.editor_lang_combo.blockSignals(False)
+                return
+        
+        lang_code = self.languages[self.editor_lang_combo.currentText()]
+        self.editor_count_label.setText("번역 파일을 불러오는 중...")
+        self.editor_loader = WorkerThread(self._load_editor_store, lang_code)
+        self.editor_loader.finished.connect(self.on_editor_store_loaded)
+        self.editor_loader.start()
+
+    def _load_editor_store(self, lang_code):
+        from cursor_editor import TranslationEditorStore
+        
+        store = TranslationEditorStore(lang_code)
+        store.prepare()
+        return store
+
+    def on_editor_store_loaded(self, success, message):
+        if not success:
+            self.editor_count_label.setText(f"불러오기 실패: {message}")
+            return
+        self.editor_store = self.editor_loader.result
+        self.editor_model = TranslationTableModel(self.editor_store, self)
+        self.editor_table.setModel(self.editor_model)
+        self.run_editor_filter()
+
+    def run_editor_filter(self):
+        """현재 검색어와 필터로 백그라운드 검색 (이전 검색 결과는 버림)"""
+        if self.editor_store is None:
+            return
+        self.editor_generation += 1
+        state = self.editor_state_combo.currentText()
+        key_type = self.editor_type_combo.currentText() if self.editor_type_combo.currentIndex() > 0 else None
+        # 편집 내용은 UI 스레드에서 바뀌므로 검색 스레드에는 복사본을 넘김
+        thread = FilterThread(self.editor_store, self.editor_generation,
+                              query=self.editor_search_input.text().strip(),
+                              untranslated=state == "미번역", changed=state == "변경됨", key_type=key_type,
+                              edits=dict(self.editor_store.edits))
+        thread.results.connect(self.on_editor_filtered)
+        thread.failed.connect(self.on_editor_filter_failed)
+        thread.finished.connect(lambda: self.editor_threads.remove(thread))
+        self.editor_threads.append(thread)
+        thread.start()
+
+    def on_editor_filtered(self, generation, ids):
+        if generation != self.editor_generation:
+            return
+        self.editor_model.set_ids(ids)
+        self.editor_count_label.setText(f"{len(ids)} / {len(self.editor_store)}개 항목")
+
+    def on_editor_filter_failed(self, generation, message):
+        if generation != self.editor_generation:
+            return
+        self.editor_count_label.setText(f"검색 실패: {message}")
+
+    def save_editor_changes(self):
+        if self.editor_store is None:
+            return
+        try:
+            saved = self.editor_store.save()
+        except Exception as e:
+            QMessageBox.warning(self, "저장 오류", str(e))
+            return
+        self.editor_model.layoutChanged.emit()
+        self.status_label.setText(f"번역 편집 {saved}개 항목을 저장했습니다.")
+
     def setup_settings_tab(self):
         layout = QVBoxLayout(self.settings_tab)
         
@@ -270,13 +578,15 @@ class CursorTranslatorApp(QMainWindow):
         self.worker.start()
 
     def _find_cursor_path(self):
+        from cursor_finder import CursorFinder
+        
         finder = CursorFinder()
         return finder.find_cursor_installation()
 
     def on_path_search_finished(self, success, message):
-        if success and message:
-            self.cursor_path = message
-            self.path_label.setText(str(message))
+        if success and self.worker.result:
+            self.cursor_path = self.worker.result
+            self.path_label.setText(str(self.worker.result))
             self.status_label.setText("Cursor 설치 경로를 찾았습니다.")
         else:
             self.path_label.setText("경로를 찾을 수 없습니다. 수동으로 선택해주세요.")
@@ -381,7 +691,7 @@ class CursorTranslatorApp(QMainWindow):
         self.status_label.setText("준비됨")
 
     def save_settings(self):
-        settings_path = Path.home() / '.cursor_translator' / 'settings.json'
+        settings_path = SETTINGS_FILE
         settings_path.parent.mkdir(parents=True, exist_ok=True)
         
         settings = {
@@ -415,18 +725,17 @@ class CursorTranslatorApp(QMainWindow):
                 self.status_label.setText(f"설정 로드 오류: {str(e)}")
 
     def load_saved_settings(self):
-        """저장된 설정 자동 로드"""
-        settings_path = Path.home() / '.cursor_translator' / 'settings.json'
+        """저장된 설정 파일 읽기 (UI에는 적용하지 않으므로 백그라운드에서 호출 가능)"""
+        settings_path = SETTINGS_FILE
         
         if settings_path.exists():
             try:
                 with open(settings_path, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                
-                self.apply_loaded_settings(settings)
+                    return json.load(f)
             except Exception:
                 # 오류 발생 시 기본 설정 사용
                 pass
+        return {}
 
     def apply_loaded_settings(self, settings):
         """로드된 설정 적용"""
@@ -456,10 +765,23 @@ class CursorTranslatorApp(QMainWindow):
 
 
 def main():
+    # --measure-startup: 첫 화면을 그리면 종료하고, 기준 시간을 넘으면 종료 코드 1 반환
+    measure_startup = '--measure-startup' in sys.argv
     app = QApplication(sys.argv)
-    ex = CursorTranslatorApp()
+    ex = CursorTranslatorApp(measure_startup=measure_startup)
     ex.show()
-    sys.exit(app.exec_())
+    status = app.exec_()
+    if ex.startup_worker is not None:
+        ex.startup_worker.wait()
+    if measure_startup:
+        if ex.first_paint_time is None:
+            # 창이 그려지기 전에 종료된 경우 (디스플레이 없음, 초기화 실패 등)도 기준 초과로 처리
+            print(f"첫 화면이 표시되지 않았습니다 (기준 {FIRST_PAINT_BUDGET}초)")
+            status = 1
+        else:
+            print(f"첫 화면 표시: {ex.first_paint_time:.3f}초 (기준 {FIRST_PAINT_BUDGET}초)")
+            status = 0 if ex.first_paint_time <= FIRST_PAINT_BUDGET else 1
+    sys.exit(status)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,230 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+from pathlib import Path
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# inotify 이벤트 마스크 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _Inotify:
+    """ctypes로 구현한 최소한의 inotify 래퍼 (디렉토리 하나만 감시)"""
+
+    # 업데이트는 보통 새 파일을 쓴 뒤 이름을 바꾸므로 파일이 아닌 디렉토리를 감시하고,
+    # 디렉토리 자체가 지워지거나 옮겨지는 경우(IN_DELETE_SELF, IN_MOVE_SELF)도 받음
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+    def __init__(self, directory):
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.directory = directory
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        # 감시하던 디렉토리가 사라져 감시가 해제되었는지 여부 (IN_IGNORED 등)
+        self.lost = False
+
+        try:
+            self.wd = self._add_watch()
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def _add_watch(self):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(self.directory), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch 실패: {self.directory}")
+        return wd
+
+    def rewatch(self):
+        """
+        같은 경로에 감시를 다시 등록 (업데이트가 디렉토리를 통째로 교체한 경우)
+
+        Raises:
+            OSError: 디렉토리가 아직 없는 등 등록할 수 없는 경우
+        """
+        # 옮겨진 디렉토리의 감시는 옛 inode를 따라가므로 해제 (이미 해제되었으면 무시됨)
+        self._libc.inotify_rm_watch(self.fd, self.wd)
+        self.wd = self._add_watch()
+        self.lost = False
+
+    def read_names(self, timeout):
+        """
+        이벤트가 올 때까지 대기한 뒤 이벤트가 발생한 파일 이름 목록 반환
+
+        Returns:
+            파일 이름 집합 (timeout 동안 이벤트가 없으면 빈 집합)
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        names = set()
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return names
+            raise
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            if wd == self.wd and mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                self.lost = True
+            names.add(os.fsdecode(buffer[offset:offset + length].rstrip(b'\0')))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class BundleWatcher:
+    """
+    workbench 번들 변경 감시기
+
+    Linux에서는 inotify로 이벤트가 올 때까지 잠들어 있고, inotify를 쓸 수 없거나
+    이벤트가 전달되지 않는 파일 시스템(WSL의 /mnt/c 등)에서는 stat 폴링으로 대체합니다.
+    """
+
+    def __init__(self, file_path, debounce=5.0, poll_interval=30.0):
+        """
+        Args:
+            file_path: 감시할 번들 파일 경로
+            debounce: 마지막 변경 후 이 시간(초) 동안 조용해야 변경 완료로 판단
+            poll_interval: 폴링 모드에서 stat 간격(초)
+        """
+        self.file_path = Path(file_path)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.signature = self._signature()
+        self._inotify = None
+
+        if sys.platform.startswith('linux') and not str(self.file_path.resolve()).startswith('/mnt/'):
+            try:
+                self._inotify = _Inotify(self.file_path.parent)
+                logger.info(f"inotify로 감시합니다: {self.file_path}")
+            except (OSError, AttributeError) as e:
+                logger.warning(f"inotify를 사용할 수 없어 폴링으로 대체합니다: {e}")
+
+        if not self._inotify:
+            logger.info(f"{self.poll_interval}초 간격 폴링으로 감시합니다: {self.file_path}")
+
+    def _signature(self):
+        """파일 교체 여부를 판단하기 위한 (inode, 크기, 수정 시각)"""
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def mark_current(self):
+        """현재 파일 상태를 기준으로 삼음 (자신이 쓴 변경을 다시 감지하지 않도록)"""
+        self.signature = self._signature()
+
+    def _watching(self):
+        """inotify 이벤트를 받을 수 있는 상태인지 여부 (감시 디렉토리가 사라졌으면 다시 등록 시도)"""
+        if not self._inotify:
+            return False
+        if self._inotify.lost:
+            try:
+                self._inotify.rewatch()
+                logger.info(f"교체된 디렉토리를 다시 감시합니다: {self.file_path.parent}")
+            except OSError:
+                return False
+        return True
+
+    def _wait_for_event(self, timeout):
+        """번들 관련 이벤트가 있으면 True, timeout 동안 없으면 False"""
+        if self._watching():
+            names = self._inotify.read_names(timeout)
+            if self._inotify.lost:
+                # 디렉토리가 지워지거나 옮겨져 감시가 해제됨 (IN_IGNORED), 다시 생길 때까지 stat 폴링
+                logger.warning(f"감시 디렉토리가 사라져 다시 생길 때까지 폴링합니다: {self.file_path.parent}")
+                return True
+            return self.file_path.name in names
+
+        time.sleep(self.poll_interval if timeout is None else timeout)
+        return self._signature() != self.signature
+
+    def _wait_for_quiet(self):
+        """번들 이벤트 없이 debounce 시간이 지날 때까지 대기 (inotify 모드)"""
+        deadline = time.monotonic() + self.debounce
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if not self._watching():
+                # 감시 디렉토리가 사라지면 호출자가 stat 결과로 안정 여부를 판단
+                return
+            if self._wait_for_event(remaining):
+                deadline = time.monotonic() + self.debounce
+
+    def wait_for_change(self):
+        """번들이 바뀌고 debounce 시간 동안 더 이상 바뀌지 않을 때까지 대기"""
+        while True:
+            if self._watching():
+                # 이벤트가 올 때까지 블록 (CPU 사용 없음)
+                if not self._wait_for_event(None):
+                    continue
+            elif not self._wait_for_event(self.poll_interval):
+                continue
+
+            # 업데이트가 여러 번에 걸쳐 쓰는 동안은 기다림
+            last = self._signature()
+            while True:
+                if self._watching():
+                    self._wait_for_quiet()
+                else:
+                    time.sleep(self.debounce)
+                current = self._signature()
+                if current == last:
+                    break
+                last = current
+
+            if last is None:
+                # 번들이 사라진 상태도 하나의 안정 상태로 보고, 다시 생길 때까지 poll_interval 간격으로 확인
+                if self.signature is not None:
+                    logger.warning(f"번들이 사라졌습니다. 다시 생길 때까지 기다립니다: {self.file_path}")
+                    self.signature = None
+                continue
+            if last != self.signature:
+                return
+
+    def watch(self, callback):
+        """변경될 때마다 callback을 호출 (Ctrl+C로 종료)"""
+        try:
+            while True:
+                self.wait_for_change()
+                logger.info(f"번들 변경 감지: {self.file_path}")
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"변경 처리 중 오류 발생: {e}")
+                self.mark_current()
+        except KeyboardInterrupt:
+            logger.info("감시를 종료합니다.")
+        finally:
+            if self._inotify:
+                self._inotify.close()
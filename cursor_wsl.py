@@ -0,0 +1,251 @@
+import os
+import json
+import shutil
+import subprocess
+import hashlib
+import platform
+import logging
+from pathlib import Path
+from contextlib import contextmanager
+
+from cursor_checksums import file_sha256
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# WSL 쪽(ext4) 작업 디렉토리
+STAGING_DIR = Path.home() / '.cache' / 'cursor_translator' / 'staging'
+
+# Windows 상호 운용(cmd.exe, reg.exe) 조회 결과 캐시
+INTEROP_CACHE_FILE = Path.home() / '.cursor_translator' / 'wsl_interop.json'
+
+# Cursor 제거 정보가 등록되는 레지스트리 키
+UNINSTALL_KEYS = [
+    r'HKCU\Software\Microsoft\Windows\CurrentVersion\Uninstall',
+    r'HKLM\Software\Microsoft\Windows\CurrentVersion\Uninstall',
+]
+
+# 9P 파일 시스템은 요청 수가 곧 비용이므로 큰 단위로 한 번에 읽고 씀
+COPY_BUFFER_SIZE = 16 * 1024 * 1024
+
+
+def is_wsl() -> bool:
+    """WSL 환경 여부"""
+    return 'microsoft' in platform.uname().release.lower()
+
+
+def is_windows_mount(path) -> bool:
+    """/mnt/c 처럼 9P로 마운트된 Windows 드라이브 아래의 경로인지 여부"""
+    parts = Path(path).absolute().parts
+    return len(parts) > 2 and parts[1] == 'mnt' and len(parts[2]) == 1 and parts[2].isalpha()
+
+
+def _run(command, timeout=5):
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def _run_windows(command_line, timeout=5):
+    """
+    cmd.exe로 명령을 실행하여 표준 출력 반환 (실패하면 None)
+
+    콘솔 코드 페이지를 UTF-8로 바꿔 한글 사용자 이름 등이 깨지지 않게 하고,
+    작업 디렉토리를 /mnt/c 로 두어 cmd.exe가 UNC 경로 경고를 출력하지 않도록 합니다.
+    """
+    command = ['cmd.exe', '/d', '/c', f'chcp 65001>nul&{command_line}']
+    try:
+        result = subprocess.run(command, capture_output=True, timeout=timeout, cwd='/mnt/c' if os.path.isdir('/mnt/c') else None)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode('utf-8', errors='replace').replace('\r', '')
+
+
+def to_wsl_path(windows_path):
+    """Windows 경로를 WSL 경로로 변환 (wslpath가 없으면 /mnt/<드라이브> 규칙 사용)"""
+    if not windows_path:
+        return None
+    output = _run(['wslpath', '-u', windows_path])
+    if output and output.strip():
+        return output.strip()
+    if len(windows_path) > 2 and windows_path[1] == ':':
+        return f"/mnt/{windows_path[0].lower()}" + windows_path[2:].replace('\\', '/')
+    return None
+
+
+def _query_windows_environment():
+    """cmd.exe 한 번 호출로 LOCALAPPDATA, APPDATA 조회"""
+    output = _run_windows('echo %LOCALAPPDATA%&echo %APPDATA%')
+    if not output:
+        return {}
+    lines = [line.strip() for line in output.splitlines() if line.strip()]
+    values = {}
+    for name, value in zip(('LOCALAPPDATA', 'APPDATA'), lines):
+        # 정의되지 않은 변수는 %NAME% 그대로 출력됨
+        if value and not value.startswith('%'):
+            values[name] = value
+    return values
+
+
+def _parse_registry_query(output):
+    """reg.exe query /s 출력을 {키: {값 이름: 데이터}}로 변환"""
+    keys = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith('HKEY_'):
+            current = keys.setdefault(line.strip(), {})
+        elif current is not None and line.startswith('    '):
+            parts = line.strip().split(None, 2)
+            if len(parts) == 3 and parts[1].startswith('REG_'):
+                current[parts[0]] = parts[2]
+    return keys
+
+
+def _query_install_location():
+    """제거 정보 레지스트리에서 Cursor의 InstallLocation 조회"""
+    for uninstall_key in UNINSTALL_KEYS:
+        output = _run_windows(f'reg.exe query "{uninstall_key}" /s /f Cursor /d')
+        if not output:
+            continue
+        for key, values in _parse_registry_query(output).items():
+            if not values.get('DisplayName', '').lower().startswith('cursor'):
+                continue
+            # /d 검색은 일치한 값만 출력하므로 InstallLocation이 없으면 해당 키만 다시 조회
+            if 'InstallLocation' not in values:
+                values = _parse_registry_query(_run_windows(f'reg.exe query "{key}" /v InstallLocation') or '').get(key, {})
+            if values.get('InstallLocation'):
+                return values['InstallLocation'].rstrip('\\')
+    return None
+
+
+def windows_locations(refresh=False):
+    """
+    Windows 상호 운용으로 조회한 경로 (WSL 경로로 변환, 캐시 사용)
+
+    Returns:
+        {'LOCALAPPDATA': ..., 'APPDATA': ..., 'install': ...} - 알아내지 못한 항목은 없음
+    """
+    if not refresh:
+        try:
+            with open(INTEROP_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            # 캐시가 가리키는 경로가 아직 있으면 그대로 사용
+            if cached and all(os.path.exists(path) for path in cached.values()):
+                return cached
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    locations = {}
+    for name, value in _query_windows_environment().items():
+        path = to_wsl_path(value)
+        if path:
+            locations[name] = path
+
+    install = to_wsl_path(_query_install_location())
+    if install:
+        locations['install'] = install
+
+    if locations:
+        try:
+            INTEROP_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(INTEROP_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(locations, f, ensure_ascii=False)
+        except OSError:
+            pass
+    return locations
+
+
+def find_cursor_install(refresh=False):
+    """WSL에서 Cursor 설치 경로 후보 (레지스트리의 InstallLocation -> %LOCALAPPDATA%/Programs/cursor 순)"""
+    locations = windows_locations(refresh)
+    candidates = []
+    if locations.get('install'):
+        candidates.append(locations['install'])
+    if locations.get('LOCALAPPDATA'):
+        default = os.path.join(locations['LOCALAPPDATA'], 'Programs', 'cursor')
+        if default not in candidates:
+            candidates.append(default)
+    return candidates
+
+
+def find_settings_file(refresh=False):
+    """WSL에서 Windows 쪽 Cursor settings.json 경로 (%APPDATA%/Cursor/User/settings.json)"""
+    appdata = windows_locations(refresh).get('APPDATA')
+    if not appdata:
+        return None
+    return Path(appdata) / 'Cursor' / 'User' / 'settings.json'
+
+
+def _sequential_copy(source, destination):
+    """큰 버퍼로 한 번에 순차 복사"""
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+
+@contextmanager
+def staged_bundle(file_path, staging_dir=None):
+    """
+    /mnt/c 의 번들을 WSL 쪽 디렉토리로 가져와 작업한 뒤, 바뀌었으면 한 번에 되돌려 씀
+
+    원격 파일은 (크기, 수정 시각)이 같으면 다시 복사하지 않습니다. Windows 드라이브가 아닌
+    경로는 그대로 돌려주므로 호출하는 쪽은 환경을 구분할 필요가 없습니다.
+
+    사용 예:
+        with staged_bundle(js_file_path) as local_path:
+            patch_js_file(local_path, table)
+
+    Yields:
+        작업할 로컬 파일 경로
+    """
+    file_path = Path(file_path)
+    if not is_windows_mount(file_path):
+        yield file_path
+        return
+
+    staging_dir = Path(staging_dir) if staging_dir else STAGING_DIR
+    key = hashlib.sha256(str(file_path).encode('utf-8')).hexdigest()[:16]
+    work_dir = staging_dir / key
+    work_dir.mkdir(parents=True, exist_ok=True)
+    local_path = work_dir / file_path.name
+    meta_file = work_dir / 'staged.json'
+
+    # /mnt/c 에 대한 stat은 여기서 한 번만
+    stat = os.stat(file_path)
+    try:
+        with open(meta_file, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        meta = {}
+
+    if not (local_path.exists() and meta.get('size') == stat.st_size and meta.get('mtime_ns') == stat.st_mtime_ns
+            and meta.get('sha256') == file_sha256(local_path)):
+        _sequential_copy(file_path, local_path)
+        meta = {'source': str(file_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                'sha256': file_sha256(local_path)}
+        with open(meta_file, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        logger.info(f"번들을 WSL 작업 디렉토리로 가져왔습니다: {local_path}")
+    else:
+        logger.info(f"변경되지 않은 번들의 로컬 사본을 사용합니다: {local_path}")
+
+    yield local_path
+
+    # 바뀌었을 때만 한 번의 순차 쓰기 후 원자적 교체
+    digest = file_sha256(local_path)
+    if digest == meta['sha256']:
+        return
+
+    temp_file = file_path.with_name(file_path.name + '.tmp')
+    _sequential_copy(local_path, temp_file)
+    shutil.copymode(file_path, temp_file)
+    os.replace(temp_file, file_path)
+
+    stat = os.stat(file_path)
+    meta.update({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest})
+    with open(meta_file, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    logger.info(f"변경된 번들을 Windows 드라이브에 저장했습니다: {file_path}")
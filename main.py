@@ -2,26 +2,48 @@ import os
 import re
 import json
 import shutil
+import tempfile
+import hashlib
 import requests
 import datetime
 from pathlib import Path
 import argparse
+from contextlib import contextmanager
 import sys
+import time
 import logging
+import multiprocessing
 
 # 모듈 경로 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # 모듈 임포트
-from cursor_finder import CursorFinder, find_main_js_file, find_settings_json
+from cursor_finder import CursorFinder, find_main_js_file, find_settings_json, find_nls_messages_file
 from cursor_backup import backup_cursor_files
 from cursor_extractor import CursorExtractor, extract_ui_strings, save_extracted_strings, load_previous_translations, get_new_strings_for_translation
-from cursor_translator import DeepLTranslator, save_translations, update_translations, load_translations
+from cursor_translator import DeepLTranslator, DeepLKeyPool, deepl_api_base, parse_api_keys, save_translations, update_translations, load_translations
+from cursor_watcher import BundleWatcher
+from cursor_wsl import staged_bundle
+from cursor_asar import AsarIntegrityError, find_asar_archive, staged_asar_file
+from cursor_checksums import file_sha256, refresh_checksum
+from cursor_backends import BACKEND_NAMES, BackendUnavailable, create_backend
+from cursor_planner import plan_translation
+from cursor_memory import TranslationMemory
+from cursor_catalog import TranslationCatalog
+from cursor_bundles import BundleStore, ORIGINAL as BUNDLE_ORIGINAL
+from cursor_service import serve, DEFAULT_PORT as DEFAULT_SERVICE_PORT
+from cursor_patcher import TableCache, patch_bundle, verify_patch, build_report, save_report, make_reverse_log, reverse_patch
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 번역 파일별 치환표 캐시 (감시/서비스 모드에서는 최근 언어를 메모리에 유지)
+table_cache = TableCache()
+
+# 번들을 쓰면서 해시를 계산하는 단위
+WRITE_CHUNK_SIZE = 4 * 1024 * 1024
+
 class CursorTranslator:
     def __init__(self, deepl_api_key=None, cursor_path=None):
         self.deepl_api_key = deepl_api_key
@@ -212,8 +234,10 @@ class CursorTranslator:
         print(f"{target_lang}로 {len(texts)}개 텍스트 번역 중...")
         translations = {}
         
-        # DeepL API 엔드포인트
-        url = "https://api-free.deepl.com/v2/translate"  # 무료 API 사용, 유료는 다른 URL
+        # DeepL API 엔드포인트 (키 종류에 따라 Free/Pro)
+        api_key = parse_api_keys(self.deepl_api_key)[0]
+        url = f"{deepl_api_base(api_key)}/translate"
+        headers = {"Authorization": f"DeepL-Auth-Key {api_key}"}
         
         # 한 번에 너무 많은 텍스트를 보내지 않도록 분할
         chunk_size = 50
@@ -221,13 +245,12 @@ class CursorTranslator:
             chunk = texts[i:i + chunk_size]
             
             params = {
-                "auth_key": self.deepl_api_key,
                 "text": chunk,
                 "target_lang": target_lang.upper()
             }
             
             try:
-                response = requests.post(url, data=params)
+                response = requests.post(url, data=params, headers=headers)
                 response.raise_for_status()
                 result = response.json()
                 
@@ -286,6 +309,27 @@ class CursorTranslationApp:
         with open('cursor_translator_app.py', 'w', encoding='utf-8') as f:
             f.write(app_code)
 
+@contextmanager
+def open_bundle(cursor_path):
+    """
+    설치 경로의 workbench 번들 경로
+
+    resources/app이 app.asar로 묶여 있으면 아카이브 전체를 풀지 않고 번들만 꺼내 작업한 뒤,
+    바뀌었으면 아카이브에 다시 넣습니다 (설치본이 아카이브 무결성을 검사하면 넣지 않고 오류를 기록).
+    번들을 찾지 못하면 None을 돌려줍니다.
+    """
+    js_file_path = find_main_js_file(Path(cursor_path)) if cursor_path else None
+    archive = None if js_file_path else find_asar_archive(cursor_path)
+    if not archive:
+        yield js_file_path
+        return
+    
+    try:
+        with staged_asar_file(archive) as local_path:
+            yield local_path
+    except AsarIntegrityError as e:
+        logger.error(f"번들 변경 내용을 저장하지 못했습니다: {e}")
+
 def create_backup(cursor_path, js_file_path):
     """원본 파일 백업"""
     if not cursor_path or not js_file_path or not os.path.exists(js_file_path):
@@ -297,7 +341,7 @@ def create_backup(cursor_path, js_file_path):
     backup_dir.mkdir(parents=True, exist_ok=True)
     
     # 타임스탬프로 백업 파일 이름 생성
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_file = backup_dir / f"workbench.desktop.main.js.{timestamp}"
     
     try:
@@ -315,15 +359,46 @@ def restore_backup(backup_file, js_file_path):
         return False
         
     try:
-        shutil.copy2(backup_file, js_file_path)
+        with open(backup_file, 'rb') as f:
+            digest = atomic_write_bytes(js_file_path, f.read())
+        refresh_checksum(js_file_path, digest)
         logger.info(f"백업에서 복원 완료: {js_file_path}")
         return True
     except Exception as e:
         logger.error(f"복원 중 오류 발생: {e}")
         return False
 
-def apply_translations(js_file_path, translation_file, backup=True):
-    """번역 적용"""
+def atomic_write_text(file_path, content):
+    """같은 디렉토리의 임시 파일에 쓴 뒤 교체하여, 실행 중인 Cursor가 쓰다 만 파일을 읽지 않도록 저장"""
+    atomic_write_bytes(file_path, content.encode('utf-8'))
+
+def atomic_write_bytes(file_path, data):
+    """
+    atomic_write_text의 바이트 버전
+
+    Returns:
+        쓴 내용의 SHA-256 다이제스트 (쓰는 동안 계산하므로 파일을 다시 읽지 않음)
+    """
+    file_path = Path(file_path)
+    temp_file = file_path.with_name(file_path.name + '.tmp')
+    digest = hashlib.sha256()
+    view = memoryview(data)
+    with open(temp_file, 'wb') as f:
+        for start in range(0, len(view), WRITE_CHUNK_SIZE):
+            chunk = view[start:start + WRITE_CHUNK_SIZE]
+            digest.update(chunk)
+            f.write(chunk)
+    shutil.copymode(file_path, temp_file)
+    os.replace(temp_file, file_path)
+    return digest.digest()
+
+def apply_translations(js_file_path, translation_file, backup=True, full_verify=False):
+    """
+    번역 적용
+
+    번들을 바이트로 한 번만 훑으며 사전에 있는 문자열 리터럴을 찾아, JS 리터럴로 이스케이프된
+    번역문으로 치환합니다. 치환된 구간은 저장 전에 다시 검사합니다.
+    """
     if not js_file_path or not os.path.exists(js_file_path):
         logger.error(f"JS 파일이 존재하지 않습니다: {js_file_path}")
         return False
@@ -332,77 +407,421 @@ def apply_translations(js_file_path, translation_file, backup=True):
         logger.error(f"번역 파일이 존재하지 않습니다: {translation_file}")
         return False
     
-    # 번역 파일 로드
+    # 번역 파일의 치환표 로드 (사전이 바뀌지 않았으면 캐시 사용)
     try:
-        with open(translation_file, 'r', encoding='utf-8') as f:
-            translations = json.load(f)
+        translations = table_cache.load(translation_file)
     except Exception as e:
         logger.error(f"번역 파일 로드 중 오류 발생: {e}")
         return False
     
-    # 원본 파일 로드
+    return patch_js_file(js_file_path, translations, backup, full_verify) is not None
+
+def patch_js_file(js_file_path, translations, backup=True, full_verify=False, verify_executor=None):
+    """
+    번들 파일에 번역 사전(또는 미리 만든 ReplacementTable) 적용
+
+    저장한 뒤 디스크의 번들을 다시 읽어 검증하고, 실패하면 백업(백업이 없으면 메모리의 원본)으로 되돌립니다.
+    WSL에서 /mnt/c 의 번들은 로컬 사본에서 작업한 뒤 한 번에 되돌려 씁니다.
+
+    Args:
+        full_verify: 패치 전후 번들 전체를 백그라운드 프로세스에서 토큰화하여 문자열 리터럴 수 비교
+        verify_executor: full_verify에 쓸 프로세스 풀 (없으면 검증마다 새로 만듦)
+
+    Returns:
+        적용된 위치 수, 실패했거나 적용된 번역이 없으면 None
+    """
+    with staged_bundle(js_file_path) as local_path:
+        patched = _patch_local_file(local_path, translations, backup, full_verify, verify_executor)
+    if patched is None:
+        return None
+    
+    # Windows 드라이브로 되돌려 쓰기까지 끝난 뒤에만 기록 (복사에 실패하면 예외로 여기까지 오지 않음)
+    digest, edits, reverse_log = patched
+    # 설치가 손상되었다는 경고가 뜨지 않도록 product.json의 체크섬 갱신
+    refresh_checksum(js_file_path, digest)
+    save_reverse_log(reverse_log)
+    applied = len({original for _, _, _, original in edits})
+    logger.info(f"번역 적용 완료: {applied}개 항목, {len(edits)}개 위치 적용됨 (검증 통과)")
+    return len(edits)
+
+def _patch_local_file(js_file_path, translations, backup, full_verify, verify_executor=None):
+    """
+    patch_js_file의 실제 처리 (로컬 경로 기준)
+    
+    Returns:
+        (패치된 번들의 SHA-256 다이제스트, 적용된 치환 목록, 역패치 기록), 실패했거나 적용된 번역이 없으면 None
+    """
+    js_file_path = Path(js_file_path)
+    
+    # 원본 파일 로드 (디코딩하지 않고 바이트 그대로 사용)
     try:
-        with open(js_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        with open(js_file_path, 'rb') as f:
+            data = f.read()
     except Exception as e:
         logger.error(f"JS 파일 로드 중 오류 발생: {e}")
-        return False
+        return None
     
     # 백업 생성
+    backup_file = None
     if backup:
-        cursor_path = js_file_path.parents[4]  # 'resources/app/out/vs/workbench' 상위 디렉토리
-        create_backup(cursor_path, js_file_path)
+        backup_file = create_backup(js_file_path.parent, js_file_path)
     
-    # 번역 적용 (정규식으로 찾아 바꾸기)
-    modified_content = content
-    replacements = 0
-    
-    # 번역 사전 정렬 (길이가 긴 텍스트부터 처리)
-    sorted_translations = sorted(translations.items(), key=lambda x: len(x[0]), reverse=True)
+    # 번역 적용 (한 번의 스캔으로 리터럴 단위 치환 후 치환 구간 검증)
+    try:
+        patched, edits, regions = patch_bundle(data, translations)
+    except ValueError as e:
+        logger.error(f"번역 적용 중단: {e}")
+        return None
     
-    for original, translated in sorted_translations:
-        if not translated:  # 번역이 없는 항목은 건너뛰기
-            continue
-            
-        # 원본이 너무 짧으면 건너뛰기 (오탐지 방지)
-        if len(original) < 3:
-            continue
-        
-        # 치환 패턴 생성
-        patterns = [
-            f'"{original}"',  # "텍스트"
-            f"'{original}'",  # '텍스트'
-        ]
-        
-        for pattern in patterns:
-            # 치환할 번역문 생성
-            if "'" in pattern:
-                replacement = f"'{translated}'"
-            else:
-                replacement = f'"{translated}"'
-                
-            # 치환 횟수 카운트
-            old_content = modified_content
-            modified_content = modified_content.replace(pattern, replacement)
-            if old_content != modified_content:
-                replacements += 1
+    if not edits:
+        logger.warning("적용된 번역이 없습니다.")
+        return None
     
     # 변경된 내용 저장
-    if replacements > 0:
+    try:
+        digest = atomic_write_bytes(js_file_path, patched)
+    except Exception as e:
+        logger.error(f"변경된 내용 저장 중 오류 발생: {e}")
+        return None
+    
+    # 저장된 번들 검증 (실패 시 자동 롤백)
+    try:
+        with open(js_file_path, 'rb') as f:
+            written = f.read()
+        problems = verify_patch(data, written, edits, regions, full_verify, verify_executor)
+    except Exception as e:
+        problems = [f"검증 중 오류 발생: {e}"]
+    if problems:
+        for problem in problems:
+            logger.error(f"패치 검증 실패: {problem}")
+        rollback_patch(js_file_path, data, backup_file)
+        return None
+    
+    return digest, edits, make_reverse_log(data, patched, edits, regions)
+
+def rollback_patch(js_file_path, original, backup_file=None):
+    """검증에 실패한 패치를 되돌림 (백업 파일이 원본과 같으면 백업에서, 아니면 메모리의 원본으로)"""
+    original_sha256 = hashlib.sha256(original).hexdigest()
+    if backup_file and os.path.exists(backup_file) and file_sha256(backup_file) == original_sha256:
+        restored = restore_backup(backup_file, js_file_path)
+    else:
         try:
-            with open(js_file_path, 'w', encoding='utf-8') as f:
-                f.write(modified_content)
-            logger.info(f"번역 적용 완료: {replacements}개 항목 적용됨")
-            return True
+            atomic_write_bytes(js_file_path, original)
+            restored = True
         except Exception as e:
-            logger.error(f"변경된 내용 저장 중 오류 발생: {e}")
+            logger.error(f"롤백 중 오류 발생: {e}")
+            restored = False
+    
+    if restored and file_sha256(js_file_path) == original_sha256:
+        logger.info(f"패치 전 상태로 롤백 완료: {js_file_path}")
+        return True
+    logger.error(f"롤백에 실패했습니다. --restore로 백업에서 직접 복원하세요: {js_file_path}")
+    return False
+
+def _reverse_log_dir():
+    """역패치 기록 디렉토리 (백업 디렉토리 아래)"""
+    return Path.home() / '.cursor_translator' / 'backups' / 'reverse'
+
+def save_reverse_log(log):
+    """역패치 기록 저장 (패치된 번들의 해시로 찾을 수 있도록 파일 이름으로 사용)"""
+    log_dir = _reverse_log_dir()
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_file = log_dir / f"{log['patched_sha256']}.json"
+    try:
+        with open(log_file, 'w', encoding='utf-8') as f:
+            json.dump(log, f, separators=(',', ':'))
+        logger.info(f"역패치 기록 저장 완료: {log_file} ({len(log['edits'])}개 위치)")
+    except Exception as e:
+        logger.warning(f"역패치 기록 저장 중 오류 발생: {e}")
+
+def revert_with_reverse_logs(data):
+    """
+    역패치 기록이 남아 있는 동안 차례로 되돌린 번들 데이터
+
+    Returns:
+        (되돌린 데이터, 사용한 기록 파일 목록) - 기록이 없으면 입력 그대로
+
+    Raises:
+        ValueError: 기록이 번들과 맞지 않거나 손상된 경우
+    """
+    used_logs = []
+    while True:
+        log_file = _reverse_log_dir() / f"{hashlib.sha256(data).hexdigest()}.json"
+        if not log_file.exists():
+            return data, used_logs
+        try:
+            with open(log_file, 'r', encoding='utf-8') as f:
+                data = reverse_patch(data, json.load(f))
+        except (KeyError, json.JSONDecodeError) as e:
+            raise ValueError(f"역패치 기록이 손상되었습니다: {log_file} ({e})")
+        used_logs.append(log_file)
+
+def unapply_translations(js_file_path):
+    """
+    백업 사본 없이 역패치 기록으로 번역 적용을 되돌림
+
+    번역을 여러 번 적용한 경우 기록이 남아 있는 동안 차례로 되돌립니다.
+    복원 결과는 적용 전 번들의 해시와 비교하여 검증합니다.
+    """
+    try:
+        with open(js_file_path, 'rb') as f:
+            data = f.read()
+    except Exception as e:
+        logger.error(f"JS 파일 로드 중 오류 발생: {e}")
+        return False
+    
+    try:
+        data, used_logs = revert_with_reverse_logs(data)
+    except ValueError as e:
+        logger.error(f"역패치 실패: {e}")
+        return False
+    
+    if not used_logs:
+        logger.error("현재 번들에 해당하는 역패치 기록이 없습니다. --restore로 백업에서 복원하세요.")
+        return False
+    
+    try:
+        digest = atomic_write_bytes(js_file_path, data)
+    except Exception as e:
+        logger.error(f"복원된 내용 저장 중 오류 발생: {e}")
+        return False
+    refresh_checksum(js_file_path, digest)
+    
+    for log_file in used_logs:
+        log_file.unlink()
+    logger.info(f"번역 적용 되돌리기 완료: {js_file_path} ({len(used_logs)}회 적용분, 원본 해시 확인됨)")
+    return True
+
+def build_language_bundles(js_file_path, languages):
+    """
+    언어별 번역 번들을 설치 디렉토리에 미리 만들어 둠 (cursor_translations_<언어>.json 사용)
+
+    Returns:
+        만들어진(또는 이미 최신인) 언어 목록
+    """
+    store = BundleStore(js_file_path, resolve_original=lambda data: revert_with_reverse_logs(data)[0])
+    # 여러 언어의 원문은 한 번만 보관
+    catalog = TranslationCatalog.from_directory('.', languages)
+    built = []
+    for language in languages:
+        language = language.lower()
+        if language not in catalog.columns:
+            logger.error(f"번역 파일이 존재하지 않습니다: cursor_translations_{language}.json")
+            continue
+        try:
+            if store.build(language, catalog.translations(language)):
+                built.append(language)
+        except ValueError as e:
+            logger.error(f"{language} 번들 생성 실패: {e}")
+    return built
+
+def coverage_report(languages=None, template_file="cursor_translations_template.json"):
+    """
+    언어별 번역률 표시 (템플릿이 있으면 템플릿의 원문 기준)
+
+    Returns:
+        {언어 코드: (번역된 항목 수, 전체 항목 수)}
+    """
+    catalog = TranslationCatalog.from_directory('.', languages)
+    source_ids = None
+    if os.path.exists(template_file):
+        with open(template_file, 'r', encoding='utf-8') as f:
+            source_ids = catalog.ids(json.load(f))
+    
+    coverage = catalog.coverage(source_ids)
+    if not coverage:
+        logger.info("번역 파일이 없습니다.")
+    for language, (translated, total) in coverage.items():
+        percent = translated / total * 100 if total else 0.0
+        logger.info(f"{language}: {translated}/{total} ({percent:.1f}%)")
+    return coverage
+
+def plan_report(languages, api_key=None, budget=None, fuzzy='context', template_file="cursor_translations_template.json"):
+    """
+    번역 API를 호출하지 않고 언어별(키가 있으면 키별) 과금 글자 수 미리 보기
+
+    키별 배분은 각 키의 /usage(글자 수가 차감되지 않음)로 조회한 남은 글자 수를 기준으로 합니다.
+
+    Returns:
+        예산과 키 한도 안에서 모두 번역할 수 있으면 True
+    """
+    if not os.path.exists(template_file):
+        logger.error(f"템플릿 파일이 존재하지 않습니다: {template_file}")
+        logger.info("먼저 --extract 옵션으로 번역 템플릿을 생성하세요.")
+        return False
+    
+    started = time.perf_counter()
+    plan = plan_translation(template_file, languages, fuzzy=None if fuzzy == 'off' else fuzzy, budget=budget)
+    logger.info(f"번역 계획 ({(time.perf_counter() - started) * 1000:.0f} ms)")
+    
+    pool = None
+    if api_key:
+        pool = DeepLKeyPool(api_key)
+        pool.refresh_usage()
+    lines = plan.report(pool)
+    for line in lines:
+        logger.info(line)
+    
+    fits = not any(plan.deferred.values())
+    if pool is not None:
+        fits = fits and '(한도 부족)' not in plan.assign_keys(pool)
+    return fits
+
+def switch_language(js_file_path, language):
+    """미리 만든 언어 번들로 설치된 번들 교체 ('original' 또는 'en'은 원본)"""
+    language = language.lower()
+    if language == 'en':
+        language = BUNDLE_ORIGINAL
+    store = BundleStore(js_file_path, resolve_original=lambda data: revert_with_reverse_logs(data)[0])
+    try:
+        if not store.switch(language):
             return False
-    else:
-        logger.warning("적용된 번역이 없습니다.")
+    except (OSError, ValueError) as e:
+        logger.error(f"언어 전환 중 오류 발생: {e}")
         return False
+    # 미리 만든 번들의 해시는 상태 파일에 있으므로 다시 읽지 않음
+    refresh_checksum(js_file_path, bytes.fromhex(store.state['bundles'][language]['sha256']))
+    return True
+
+def dry_run_translations(js_file_path, translation_file, report_file):
+    """
+    번들을 수정하지 않고 번역 적용 결과를 미리 확인하여 보고서 저장
 
-def extract_and_translate(cursor_path, target_lang, api_key=None, test_mode=False):
-    """텍스트 추출 및 번역"""
+    Args:
+        js_file_path: workbench JS 파일 경로
+        translation_file: 번역 파일 경로
+        report_file: 보고서 경로 (.csv 또는 .json)
+
+    Returns:
+        보고서 딕셔너리, 실패 시 None
+    """
+    try:
+        translations = table_cache.load(translation_file)
+        with open(js_file_path, 'rb') as f:
+            data = f.read()
+    except Exception as e:
+        logger.error(f"드라이런 준비 중 오류 발생: {e}")
+        return None
+    
+    report = build_report(data, translations)
+    try:
+        save_report(report, report_file)
+    except Exception as e:
+        logger.error(f"보고서 저장 중 오류 발생: {e}")
+        return None
+    
+    multiple = sum(1 for counts in report['entries'].values() if counts['occurrences'] > 1)
+    logger.info(f"드라이런: {report['applied_positions']}개 위치에 적용 예정 (번들은 수정하지 않음)")
+    logger.info(f"  일치 없음: {len(report['unmatched'])}개, 여러 곳 일치: {multiple}개, "
+                f"겹침: {len(report['overlaps'])}개, 모호함: {len(report['ambiguous'])}개, 적용 불가: {len(report['rejected'])}개")
+    logger.info(f"보고서 저장 완료: {report_file}")
+    return report
+
+def apply_nls_translations(nls_file, translation_file):
+    """
+    NLS 메시지 테이블 번역 적용
+    
+    JS 번들을 수정하지 않고 nls.messages.json 배열의 각 메시지를 번역문으로 바꾼 사본을 씁니다.
+    원본 테이블은 nls.messages.json.original로 보관되며, 번역은 항상 이 원본을 기준으로 다시 만들어집니다.
+    """
+    nls_file = Path(nls_file)
+    original_file = nls_file.with_name(nls_file.name + '.original')
+    state_file = nls_file.with_name(nls_file.name + '.translator.json')
+    
+    try:
+        with open(translation_file, 'r', encoding='utf-8') as f:
+            translations = json.load(f)
+    except Exception as e:
+        logger.error(f"번역 파일 로드 중 오류 발생: {e}")
+        return False
+    
+    state = {}
+    if state_file.exists():
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except Exception:
+            state = {}
+    
+    # 원본은 처음 한 번만 보관하고, 이후에는 현재 테이블이 우리가 쓴 번역본도 보관된 원본도 아닐 때
+    # (Cursor 업데이트로 새 테이블이 설치된 경우) 상태 기록이 기존 원본과 일치하는 경우에만 교체
+    if not original_file.exists():
+        shutil.copy2(nls_file, original_file)
+        logger.info(f"원본 NLS 테이블 보관: {original_file}")
+    elif file_sha256(nls_file) not in (state.get('applied_sha256'), state.get('original_sha256')):
+        if state.get('original_sha256') and state['original_sha256'] == file_sha256(original_file):
+            shutil.copy2(nls_file, original_file)
+            logger.info(f"업데이트된 원본 NLS 테이블 보관: {original_file}")
+        else:
+            # 상태 파일이 없거나 손상된 경우 현재 테이블이 이전 번역본일 수 있으므로 원본을 덮어쓰지 않음
+            logger.warning(f"상태 기록이 원본과 맞지 않아 기존 원본 NLS 테이블을 유지합니다: {original_file}")
+    
+    try:
+        with open(original_file, 'r', encoding='utf-8') as f:
+            messages = json.load(f)
+    except Exception as e:
+        logger.error(f"NLS 테이블 로드 중 오류 발생: {e}")
+        return False
+    
+    if not isinstance(messages, list):
+        logger.error(f"지원하지 않는 NLS 테이블 형식입니다: {nls_file}")
+        return False
+    
+    replacements = 0
+    localized = []
+    for message in messages:
+        translated = translations.get(message) if isinstance(message, str) else None
+        if translated:
+            localized.append(translated)
+            replacements += 1
+        else:
+            localized.append(message)
+    
+    try:
+        atomic_write_text(nls_file, json.dumps(localized, ensure_ascii=False))
+        
+        with open(state_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'lang': Path(translation_file).stem.rsplit('_', 1)[-1],
+                'original_sha256': file_sha256(original_file),
+                'applied_sha256': file_sha256(nls_file),
+            }, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        logger.error(f"NLS 테이블 저장 중 오류 발생: {e}")
+        return False
+    
+    logger.info(f"NLS 번역 적용 완료: {len(messages)}개 중 {replacements}개 메시지 번역됨")
+    return True
+
+def restore_nls_table(nls_file):
+    """보관해 둔 원본 NLS 메시지 테이블 복원"""
+    nls_file = Path(nls_file)
+    original_file = nls_file.with_name(nls_file.name + '.original')
+    state_file = nls_file.with_name(nls_file.name + '.translator.json')
+    
+    if not original_file.exists():
+        logger.error(f"원본 NLS 테이블이 없습니다: {original_file}")
+        return False
+    
+    try:
+        os.replace(original_file, nls_file)
+        if state_file.exists():
+            state_file.unlink()
+        logger.info(f"원본 NLS 테이블 복원 완료: {nls_file}")
+        return True
+    except Exception as e:
+        logger.error(f"NLS 테이블 복원 중 오류 발생: {e}")
+        return False
+
+def extract_and_translate(cursor_path, target_lang, api_key=None, test_mode=False, all_files=False, backend='deepl', fuzzy='context',
+                          char_budget=None):
+    """
+    텍스트 추출 및 번역
+
+    fuzzy가 'context' 또는 'prefill'이면 모든 언어의 번역 파일로 만든 번역 메모리에서
+    조금 바뀐 원문의 이전 번역을 찾아 활용합니다 ('off'이면 사용하지 않음).
+    char_budget이 있으면 그 글자 수까지만 메뉴, 설정 문자열부터 번역합니다.
+    """
     if test_mode:
         # 테스트 모드: 샘플 데이터 생성
         logger.info("테스트 모드로 실행합니다.")
@@ -415,25 +834,89 @@ def extract_and_translate(cursor_path, target_lang, api_key=None, test_mode=Fals
             logger.error("Cursor 설치 경로가 지정되지 않았습니다.")
             return False
             
-        js_file_path = find_main_js_file(Path(cursor_path))
-        if not js_file_path:
-            logger.error("workbench.desktop.main.js 파일을 찾을 수 없습니다.")
-            return False
+        with open_bundle(cursor_path) as js_file_path:
+            if not js_file_path:
+                logger.error("workbench.desktop.main.js 파일을 찾을 수 없습니다.")
+                return False
             
-        extractor = CursorExtractor(js_file_path)
-        strings_file = extractor.extract_strings()
-        template_file = extractor.generate_translation_template()
+            app_dir = Path(cursor_path) / 'resources' / 'app'
+            if all_files and not app_dir.is_dir():
+                logger.warning("app.asar로 묶인 설치본은 workbench 번들에서만 추출합니다.")
+                all_files = False
+            
+            with staged_bundle(js_file_path) as local_path:
+                extractor = CursorExtractor(local_path)
+                if all_files:
+                    # 다른 리소스 파일은 설치 위치에서 찾음 (변경되지 않은 파일은 추출 캐시 사용)
+                    strings_file = extractor.extract_all_strings(app_dir=app_dir)
+                else:
+                    strings_file = extractor.extract_strings()
+                template_file = extractor.generate_translation_template()
     
     # 번역 실행
     output_file = f"cursor_translations_{target_lang.lower()}.json"
-    translator = DeepLTranslator(api_key)
+    translator = create_backend(backend, api_key)
+    fuzzy = None if fuzzy == 'off' else fuzzy
+    memory = TranslationMemory.from_directory('.') if fuzzy else None
     
-    translated, total = translator.update_translation_json(template_file, output_file, target_lang)
+    try:
+        translated, total = translator.update_translation_json(template_file, output_file, target_lang, memory=memory,
+                                                               fuzzy=fuzzy, char_budget=char_budget)
+    except BackendUnavailable as e:
+        logger.error(f"번역이 중단되었습니다: {str(e)} 다시 실행하면 저널에서 이어서 진행합니다.")
+        return False
     logger.info(f"번역 완료: {translated}/{total} 항목이 번역되었습니다.")
     logger.info(f"번역 파일이 저장되었습니다: {output_file}")
     
     return True
 
+def watch_and_apply(js_file_path, target_lang, api_key=None, debounce=5.0, poll_interval=30.0, backend='deepl', fuzzy='context'):
+    """
+    번들이 Cursor 자동 업데이트로 교체될 때마다 번역을 다시 적용
+    
+    새 번들에서 문자열을 추출하고, 번역 파일에 없는 문자열만 번역한 뒤 원자적으로 다시 적용합니다.
+    """
+    js_file_path = Path(js_file_path)
+    translation_file = f"cursor_translations_{target_lang.lower()}.json"
+    translator = create_backend(backend, api_key)
+    fuzzy = None if fuzzy == 'off' else fuzzy
+    # 번역 메모리는 한 번만 만들고 새 번역이 생길 때마다 추가
+    memory = TranslationMemory.from_directory('.') if fuzzy else None
+    
+    def on_change():
+        # 사용자가 편집 중인 공용 템플릿(cursor_translations_template.json)과 문자열 파일을 덮어쓰지 않도록
+        # 업데이트마다 임시 디렉토리에서 추출
+        with tempfile.TemporaryDirectory(prefix='cursor_translator_') as work_dir:
+            template_file = os.path.join(work_dir, "template.json")
+            with staged_bundle(js_file_path) as local_path:
+                extractor = CursorExtractor(local_path, strings_file=os.path.join(work_dir, "strings.txt"))
+                extractor.extract_strings()
+                extractor.generate_translation_template(template_file)
+            
+            # 이미 번역된 번들에서 추출된 번역문은 새 원문으로 취급하지 않음
+            if os.path.exists(translation_file):
+                with open(translation_file, 'r', encoding='utf-8') as f:
+                    translated_values = {v for v in json.load(f).values() if v}
+                with open(template_file, 'r', encoding='utf-8') as f:
+                    template = json.load(f)
+                template = {k: v for k, v in template.items() if k not in translated_values}
+                with open(template_file, 'w', encoding='utf-8') as f:
+                    json.dump(template, f, ensure_ascii=False, indent=2)
+            
+            try:
+                translated, total = translator.update_translation_json(template_file, translation_file, target_lang,
+                                                                       memory=memory, fuzzy=fuzzy)
+            except BackendUnavailable as e:
+                # 미번역 항목이 원문으로 저장되지 않았으므로 다음 업데이트 때 저널에서 이어서 진행
+                logger.error(f"번역이 중단되어 적용하지 않습니다: {str(e)}")
+                return
+        logger.info(f"번역 갱신: {translated}/{total} 항목")
+        apply_translations(js_file_path, translation_file)
+    
+    watcher = BundleWatcher(js_file_path, debounce=debounce, poll_interval=poll_interval)
+    logger.info(f"Cursor 업데이트 감시 시작 ({target_lang}): {js_file_path}")
+    watcher.watch(on_change)
+
 def list_backups():
     """백업 목록 표시"""
     backup_dir = Path.home() / '.cursor_translator' / 'backups'
@@ -452,7 +935,7 @@ def list_backups():
         for i, backup in enumerate(backups):
             timestamp = backup.name.split('.')[-1]
             try:
-                date = datetime.strptime(timestamp, "%Y%m%d_%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
+                date = datetime.datetime.strptime(timestamp, "%Y%m%d_%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
                 logger.info(f"{i+1}. {date} - {backup}")
             except:
                 logger.info(f"{i+1}. {backup}")
@@ -464,26 +947,69 @@ def main():
     
     # 기본 옵션
     parser.add_argument('--cursor-path', help='Cursor 설치 경로')
-    parser.add_argument('--api-key', help='DeepL API 키')
+    parser.add_argument('--api-key', help='DeepL API 키 (쉼표로 구분하여 여러 개 지정 가능)')
     parser.add_argument('--target-lang', default='ko', help='대상 언어 코드 (기본값: ko)')
     parser.add_argument('--test-mode', action='store_true', help='테스트 모드')
+    parser.add_argument('--backend', default='deepl', choices=BACKEND_NAMES, help='번역 백엔드 (기본값: deepl, 오프라인: dictionary/argos/fake, auto: 비용 순으로 연결)')
+    parser.add_argument('--all-files', action='store_true', help='workbench 외 모든 JS 번들과 NLS 파일에서 추출')
+    parser.add_argument('--fuzzy', default='context', choices=['context', 'prefill', 'off'],
+                        help='조금 바뀐 원문의 이전 번역 활용 (context: 문맥으로 함께 번역, prefill: API 호출 없이 채우고 검토 목록에 기록, 기본값: context)')
+    parser.add_argument('--nls', action='store_true', help='JS 번들 대신 NLS 메시지 테이블(nls.messages.json)에 번역 적용/복원')
     
     # 동작 모드
     mode_group = parser.add_mutually_exclusive_group()
     mode_group.add_argument('--extract', action='store_true', help='텍스트 추출')
     mode_group.add_argument('--translate', action='store_true', help='번역 적용')
     mode_group.add_argument('--restore', action='store_true', help='백업에서 복원')
+    mode_group.add_argument('--unapply', action='store_true', help='역패치 기록으로 번역 적용 되돌리기 (백업 사본 불필요)')
     mode_group.add_argument('--list-backups', action='store_true', help='백업 목록 표시')
+    mode_group.add_argument('--coverage', action='store_true', help='언어별 번역률 표시 (템플릿 기준)')
+    mode_group.add_argument('--plan', metavar='LANGS', help='번역 API 호출 없이 언어별/키별 과금 글자 수 미리 보기 (쉼표로 구분, 예: ko,ja)')
+    mode_group.add_argument('--build-bundles', metavar='LANGS', help='언어별 번역 번들 미리 만들기 (쉼표로 구분, 예: ko,ja)')
+    mode_group.add_argument('--switch-lang', metavar='LANG', help='미리 만든 언어 번들로 즉시 전환 (원본은 original 또는 en)')
+    mode_group.add_argument('--serve', action='store_true', help='여러 설치본을 패치하는 상주 HTTP 서비스 실행')
+    mode_group.add_argument('--watch', action='store_true', help='Cursor 업데이트를 감시하여 번역 자동 재적용')
     
     # 백업 관련 옵션
     parser.add_argument('--no-backup', action='store_true', help='백업 건너뛰기')
+    parser.add_argument('--budget', type=int, help='번역 API로 보낼 최대 글자 수 (메뉴, 설정 문자열부터 배정, --plan과 번역에 적용)')
+    parser.add_argument('--full-verify', action='store_true', help='번역 적용 후 번들 전체를 토큰화하여 문자열 리터럴 수까지 검증')
     parser.add_argument('--backup-index', type=int, help='복원할 백업 인덱스 (--list-backups로 확인)')
     
+    # 드라이런 옵션
+    parser.add_argument('--dry-run', action='store_true', help='--translate와 함께 사용: 번들을 수정하지 않고 항목별 일치 보고서만 생성')
+    parser.add_argument('--report', help='드라이런 보고서 경로 (.json 또는 .csv, 기본값: cursor_apply_report_<언어>.json)')
+    
+    # 감시 모드 옵션
+    parser.add_argument('--debounce', type=float, default=5.0, help='변경 후 재적용까지 대기 시간(초, 기본값: 5)')
+    parser.add_argument('--poll-interval', type=float, default=30.0, help='inotify를 쓸 수 없을 때 폴링 간격(초, 기본값: 30)')
+    
+    # 서비스 모드 옵션
+    parser.add_argument('--port', type=int, default=DEFAULT_SERVICE_PORT, help=f'서비스 포트 (기본값: {DEFAULT_SERVICE_PORT})')
+    parser.add_argument('--service-workers', type=int, default=4, help='서비스에서 동시에 처리할 작업 수 (기본값: 4)')
+    
     args = parser.parse_args()
     
     # API 키는 환경 변수에서도 가져올 수 있음
     api_key = args.api_key or os.environ.get('DEEPL_API_KEY')
     
+    # 번역률 표시는 번역 파일만 사용
+    if args.coverage:
+        coverage_report()
+        return
+    
+    # 비용 계획은 템플릿과 번역 파일만 사용 (CI에서 예산/한도 초과 시 종료 코드 1)
+    if args.plan:
+        languages = [lang.strip() for lang in args.plan.split(',') if lang.strip()]
+        if not plan_report(languages, api_key, args.budget, args.fuzzy):
+            sys.exit(1)
+        return
+    
+    # 서비스 모드는 작업마다 번들 경로를 받으므로 설치 경로 탐색이 필요 없음
+    if args.serve:
+        serve(patch_js_file, port=args.port, workers=args.service_workers, full_verify=args.full_verify)
+        return
+    
     # Cursor 경로 찾기
     cursor_path = args.cursor_path
     if not cursor_path and not args.test_mode:
@@ -501,6 +1027,15 @@ def main():
         list_backups()
         return
         
+    elif args.restore and args.nls:
+        js_file_path = find_main_js_file(Path(cursor_path)) if cursor_path else None
+        nls_file = find_nls_messages_file(js_file_path)
+        if not nls_file:
+            logger.error("nls.messages.json 파일을 찾을 수 없습니다.")
+            return
+        restore_nls_table(nls_file)
+        return
+        
     elif args.restore:
         backups = list_backups()
         if not backups:
@@ -517,18 +1052,46 @@ def main():
                 logger.error("복원을 위해 Cursor 설치 경로가 필요합니다.")
                 return
                 
-            js_file_path = find_main_js_file(Path(cursor_path))
+            with open_bundle(cursor_path) as js_file_path:
+                if not js_file_path:
+                    logger.error("workbench.desktop.main.js 파일을 찾을 수 없습니다.")
+                    return
+                
+                restore_backup(selected_backup, js_file_path)
+        else:
+            logger.error(f"유효하지 않은 백업 인덱스: {backup_index}")
+        return
+        
+    elif args.unapply:
+        with open_bundle(cursor_path) as js_file_path:
             if not js_file_path:
                 logger.error("workbench.desktop.main.js 파일을 찾을 수 없습니다.")
                 return
-                
-            restore_backup(selected_backup, js_file_path)
+            unapply_translations(js_file_path)
+        return
+        
+    elif args.build_bundles or args.switch_lang:
+        js_file_path = find_main_js_file(Path(cursor_path)) if cursor_path else None
+        if not js_file_path:
+            logger.error("workbench.desktop.main.js 파일을 찾을 수 없습니다.")
+            return
+        if args.build_bundles:
+            build_language_bundles(js_file_path, [lang.strip() for lang in args.build_bundles.split(',') if lang.strip()])
         else:
-            logger.error(f"유효하지 않은 백업 인덱스: {backup_index}")
+            switch_language(js_file_path, args.switch_lang)
+        return
+        
+    elif args.watch:
+        js_file_path = find_main_js_file(Path(cursor_path)) if cursor_path else None
+        if not js_file_path:
+            logger.error("workbench.desktop.main.js 파일을 찾을 수 없습니다.")
+            return
+        watch_and_apply(js_file_path, args.target_lang, api_key, args.debounce, args.poll_interval, args.backend, args.fuzzy)
         return
         
     elif args.extract:
-        extract_and_translate(cursor_path, args.target_lang, api_key, args.test_mode)
+        extract_and_translate(cursor_path, args.target_lang, api_key, args.test_mode, args.all_files, args.backend, args.fuzzy,
+                              args.budget)
         return
         
     elif args.translate:
@@ -549,16 +1112,33 @@ def main():
             logger.info(f"총 {len(translations)}개 항목, 번역된 항목: {sum(1 for v in translations.values() if v)}")
             return
             
-        js_file_path = find_main_js_file(Path(cursor_path))
-        if not js_file_path:
-            logger.error("workbench.desktop.main.js 파일을 찾을 수 없습니다.")
-            return
+        with open_bundle(cursor_path) as js_file_path:
+            if not js_file_path:
+                logger.error("workbench.desktop.main.js 파일을 찾을 수 없습니다.")
+                return
+        
+            if args.dry_run:
+                report_file = args.report or f"cursor_apply_report_{args.target_lang.lower()}.json"
+                dry_run_translations(js_file_path, translation_file, report_file)
+                return
+        
+            if args.nls:
+                # NLS 테이블만 다시 쓰므로 JS 번들은 건드리지 않음
+                nls_file = find_nls_messages_file(js_file_path)
+                if not nls_file:
+                    logger.error("nls.messages.json 파일을 찾을 수 없습니다. --nls 없이 번들 패치 방식을 사용하세요.")
+                    return
+                apply_nls_translations(nls_file, translation_file)
+                return
             
-        apply_translations(js_file_path, translation_file, not args.no_backup)
-        return
+            apply_translations(js_file_path, translation_file, not args.no_backup, args.full_verify)
+            return
     
     # 기본 동작: 추출 및 번역 
-    extract_and_translate(cursor_path, args.target_lang, api_key, args.test_mode)
+    extract_and_translate(cursor_path, args.target_lang, api_key, args.test_mode, args.all_files, args.backend, args.fuzzy,
+                          args.budget)
 
 if __name__ == "__main__":
+        # PyInstaller로 묶은 실행 파일에서 작업자 프로세스(추출 샤드, 전체 검증)가 main()을 다시 실행하지 않도록
+        multiprocessing.freeze_support()
         main()
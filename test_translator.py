@@ -4,9 +4,15 @@
 import os
 import sys
 import json
+import base64
+import hashlib
 import shutil
+import struct
 import unittest
 import tempfile
+import time
+import threading
+import http.client
 import platform
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -16,6 +22,22 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
     import main
     import extract_strings
+    import cursor_extractor
+    import cursor_placeholders
+    import cursor_normalize
+    import cursor_memory
+    import cursor_catalog
+    import cursor_backends
+    import cursor_patcher
+    import cursor_bundles
+    import cursor_asar
+    import cursor_checksums
+    import cursor_editor
+    import cursor_finder
+    import cursor_translator
+    import cursor_planner
+    import cursor_service
+    import cursor_watcher
 except ImportError:
     print("main.py 또는 extract_strings.py 모듈을 찾을 수 없습니다.")
     print("테스트 파일은 프로젝트 루트 디렉토리에서 실행해야 합니다.")
@@ -275,6 +297,872 @@ class TestCursorTranslator(unittest.TestCase):
                     except Exception:
                         pass
 
+class TestStringExtraction(unittest.TestCase):
+    """샤드 병렬 추출과 파일별 추출 캐시 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.app_dir = os.path.join(self.temp_dir, "resources", "app")
+        self.js_file = os.path.join(self.app_dir, "out", "vs", "workbench", "workbench.desktop.main.js")
+        os.makedirs(os.path.dirname(self.js_file))
+        with open(self.js_file, 'w', encoding='utf-8') as f:
+            for i in range(3000):
+                f.write(f'var a{i}={{"label":"Open Folder {i}",\'title\':\'Close Editor {i}\'}};\n')
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _extract(self, path, workers, **kwargs):
+        strings_file = os.path.join(self.temp_dir, f"strings_{workers}.txt")
+        extractor = cursor_extractor.CursorExtractor(path, strings_file=strings_file)
+        with open(extractor.extract_strings(workers=workers, **kwargs), 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def test_sharded_matches_single_pass(self):
+        """샤드로 나누어 병렬 스캔한 결과가 단일 패스 결과와 같은지 확인"""
+        with patch('cursor_extractor.SHARD_SIZE', 4096):
+            self.assertGreater(len(cursor_extractor._plan_shards(self.js_file, 4096)), 1)
+            sharded = self._extract(self.js_file, 2)
+        single = self._extract(self.js_file, 1)
+        self.assertEqual(sharded, single)
+        self.assertEqual(len(single.splitlines()), 6000)
+    
+    def test_cache_skips_unchanged_files(self):
+        """두 번째 실행에서는 바뀐 파일만 다시 스캔하는지 확인"""
+        other_file = os.path.join(self.app_dir, "out", "main.js")
+        with open(other_file, 'w', encoding='utf-8') as f:
+            f.write('x={"label":"Quit Cursor"};')
+        cache_file = os.path.join(self.temp_dir, "extract_cache.json")
+        extractor = cursor_extractor.CursorExtractor(self.js_file, strings_file=os.path.join(self.temp_dir, "all.txt"))
+        
+        scanned = []
+        scan = cursor_extractor._scan_resource_file
+        def counting_scan(path):
+            scanned.append(os.path.basename(path))
+            return scan(path)
+        
+        with patch('cursor_extractor._scan_resource_file', side_effect=counting_scan):
+            extractor.extract_all_strings(workers=1, cache_file=cache_file)
+            self.assertEqual(sorted(scanned), ["main.js", "workbench.desktop.main.js"])
+            
+            scanned.clear()
+            extractor.extract_all_strings(workers=1, cache_file=cache_file)
+            self.assertEqual(scanned, [])
+            
+            with open(other_file, 'w', encoding='utf-8') as f:
+                f.write('x={"label":"Quit Cursor Now"};')
+            extractor.extract_all_strings(workers=1, cache_file=cache_file)
+            self.assertEqual(scanned, ["main.js"])
+        
+        with open(extractor.strings_file, 'r', encoding='utf-8') as f:
+            strings = f.read().splitlines()
+        self.assertIn("Quit Cursor Now", strings)
+        self.assertNotIn("Quit Cursor", strings)
+    
+    def test_all_files_shards_large_bundles_and_prunes_cache(self):
+        """전체 추출에서 큰 번들을 샤드로 나누어도 결과가 같고, 사라진 파일의 캐시 항목이 정리되는지 확인"""
+        other_file = os.path.join(self.app_dir, "out", "main.js")
+        with open(other_file, 'w', encoding='utf-8') as f:
+            f.write('x={"label":"Quit Cursor"};')
+        extractor = cursor_extractor.CursorExtractor(self.js_file, strings_file=os.path.join(self.temp_dir, "all.txt"))
+        
+        outputs = []
+        for workers in (1, 2):
+            with patch('cursor_extractor.SHARD_SIZE', 4096):
+                extractor.extract_all_strings(workers=workers, cache_file=os.path.join(self.temp_dir, f"cache_{workers}.json"))
+            with open(extractor.strings_file, 'r', encoding='utf-8') as f:
+                outputs.append(f.read())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(len(outputs[0].splitlines()), 6001)
+        
+        cache_file = os.path.join(self.temp_dir, "cache_1.json")
+        os.remove(other_file)
+        extractor.extract_all_strings(workers=1, cache_file=cache_file)
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(list(json.load(f)['files']), [self.js_file])
+
+class TestPlaceholderProtection(unittest.TestCase):
+    """번역 전 자리표시자 보호 테스트"""
+    
+    def test_round_trip(self):
+        """토큰으로 치환한 뒤 그대로 복원되는지 확인"""
+        text = 'Open {0} in ${name} with Ctrl+Shift+P &&File <b>bold</b> a < b\\n'
+        for xml in (False, True):
+            masked, tokens = cursor_placeholders.protect(text, xml=xml)
+            self.assertNotIn('{0}', masked)
+            self.assertEqual(cursor_placeholders.restore(masked, tokens, xml=xml), text)
+    
+    def test_lost_token_rejected(self):
+        """번역 결과에서 토큰이 사라지면 거부되는지 확인"""
+        masked, tokens = cursor_placeholders.protect('Open {0} and {1}', xml=True)
+        self.assertIsNone(cursor_placeholders.restore('열기 <x id="0"/>', tokens, xml=True))
+
+class TestSourceNormalization(unittest.TestCase):
+    """번역 전 원문 정규화 및 중복 제거 테스트"""
+    
+    def test_group_and_expand(self):
+        """문장 부호/대소문자만 다른 문자열이 한 그룹으로 묶이고 번역이 원문 형태로 확장되는지 확인"""
+        groups = cursor_normalize.group_strings(["Save As...", "Save As…", "save as", "Open"])
+        self.assertEqual(groups, {"Save As...": ["Save As...", "Save As…", "save as"], "Open": ["Open"]})
+        
+        expand = cursor_normalize.expand_translation
+        self.assertEqual(expand("Save As…", "Save As...", "Enregistrer sous..."), "Enregistrer sous…")
+        self.assertEqual(expand("save as", "Save As...", "Enregistrer sous..."), "enregistrer sous")
+
+class TestTranslationCatalog(unittest.TestCase):
+    """언어 간 공유 원문 표 테스트"""
+    
+    def test_shared_sources_and_coverage(self):
+        """원문은 한 번만 등록되고 번역률과 병합이 ID 단위로 계산되는지 확인"""
+        catalog = cursor_catalog.TranslationCatalog()
+        catalog.merge('ko', {"Open File": "파일 열기", "Close": "닫기", "Save": ""})
+        catalog.merge('ja', {"Open File": "ファイルを開く"})
+        self.assertEqual(len(catalog.sources), 2)
+        
+        template_ids = catalog.ids(["Open File", "Close", "Save"])
+        self.assertEqual(catalog.coverage(template_ids), {'ja': (1, 3), 'ko': (2, 3)})
+        self.assertEqual(catalog.missing('ja', template_ids), template_ids[1:])
+        
+        changed = catalog.merge('ja', {"Open File": "開く", "Close": "閉じる"}, overwrite=False)
+        self.assertEqual(changed, [template_ids[1]])
+        self.assertEqual(catalog.translations('ja'), {"Open File": "ファイルを開く", "Close": "閉じる"})
+
+class TestTranslationMemory(unittest.TestCase):
+    """조금 바뀐 원문의 이전 번역 재사용 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_lookup(self):
+        """기준 이상으로 비슷하고 해당 언어 번역이 있는 원문만 찾는지 확인"""
+        memory = cursor_memory.TranslationMemory()
+        memory.update('ko', {"Enable auto-run mode": "자동 실행 모드 사용", "Open File": "파일 열기"})
+        
+        source, translated, score = memory.lookup("Enable auto-run mode for agents", 'ko')
+        self.assertEqual((source, translated), ("Enable auto-run mode", "자동 실행 모드 사용"))
+        self.assertGreaterEqual(score, memory.threshold)
+        self.assertIsNone(memory.lookup("Enable auto-run mode for agents", 'ja'))
+        self.assertIsNone(memory.lookup("Close Window", 'ko'))
+    
+    def test_context_and_prefill(self):
+        """context 모드는 이전 번역을 문맥으로 넘기고, prefill 모드는 API 호출 없이 채우는지 확인"""
+        calls = []
+        
+        class RecordingBackend(cursor_backends.FakeBackend):
+            def translate_protected(self, texts, target_lang, context=None):
+                calls.append((list(texts), context))
+                return super().translate_protected(texts, target_lang, context)
+        
+        template_file = os.path.join(self.temp_dir, "template.json")
+        output_file = os.path.join(self.temp_dir, "out.json")
+        with open(template_file, 'w', encoding='utf-8') as f:
+            json.dump({"Enable auto-run mode for agents": ""}, f)
+        
+        for fuzzy in ('context', 'prefill'):
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump({"Enable auto-run mode": "자동 실행 모드 사용"}, f, ensure_ascii=False)
+            del calls[:]
+            RecordingBackend().update_translation_json(template_file, output_file, 'ko', fuzzy=fuzzy)
+            with open(output_file, 'r', encoding='utf-8') as f:
+                result = json.load(f)["Enable auto-run mode for agents"]
+            
+            if fuzzy == 'context':
+                self.assertEqual(calls, [(["Enable auto-run mode for agents"], "Enable auto-run mode\n자동 실행 모드 사용")])
+                self.assertEqual(result, "[ko] Enable auto-run mode for agents")
+            else:
+                self.assertEqual(calls, [])
+                self.assertEqual(result, "자동 실행 모드 사용")
+                self.assertTrue(os.path.exists(output_file + ".fuzzy.json"))
+    
+    def test_context_requests_batched(self):
+        """context 모드에서 비슷한 이전 번역이 있는 항목을 항목마다가 아니라 배치로 요청하는지 확인"""
+        calls = []
+        
+        class RecordingBackend(cursor_backends.FakeBackend):
+            def translate_protected(self, texts, target_lang, context=None):
+                calls.append((list(texts), context))
+                return super().translate_protected(texts, target_lang, context)
+        
+        template_file = os.path.join(self.temp_dir, "template.json")
+        output_file = os.path.join(self.temp_dir, "out.json")
+        with open(template_file, 'w', encoding='utf-8') as f:
+            json.dump({"Enable auto-run mode for agents": "", "Enable auto-run mode for tools": "",
+                       "Open recent files now": ""}, f)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump({"Enable auto-run mode": "자동 실행 모드 사용", "Open recent files": "최근 파일 열기"}, f,
+                      ensure_ascii=False)
+        
+        RecordingBackend().update_translation_json(template_file, output_file, 'ko', fuzzy='context')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(calls[0][0]), ["Enable auto-run mode for agents", "Enable auto-run mode for tools",
+                                               "Open recent files now"])
+        self.assertEqual(calls[0][1], "Enable auto-run mode\n자동 실행 모드 사용\nOpen recent files\n최근 파일 열기")
+
+class TestBundlePatcher(unittest.TestCase):
+    """번들 문자열 리터럴 치환 테스트"""
+    
+    def test_escaped_literals(self):
+        """따옴표/줄바꿈이 있는 번역문이 이스케이프되고, 다른 문자열 안의 일치는 치환되지 않는지 확인"""
+        source = b"""a="Open File",b='Don\\'t save',c="say \\"Open File\\" now",d='Open File'"""
+        translations = {"Open File": '"파일" 열기', "Don\\'t save": "저장 안 함\n(되돌릴 수 없음)"}
+        
+        patched, edits, _ = cursor_patcher.patch_bundle(source, translations)
+        self.assertEqual(len(edits), 3)
+        self.assertEqual(
+            patched.decode('utf-8'),
+            """a="\\"파일\\" 열기",b='저장 안 함\\n(되돌릴 수 없음)',c="say \\"Open File\\" now",d='\\"파일\\" 열기'"""
+        )
+    
+    def test_dry_run_report(self):
+        """드라이런 보고서가 위치 수, 일치 없음, 겹침을 구분하는지 확인"""
+        source = b'a="Open File",b="Open File",c="Say \'Open File\' now"'
+        translations = {"Open File": "파일 열기", "Say 'Open File' now": "지금 말하기", "Missing": "없음"}
+        
+        report = cursor_patcher.build_report(source, translations)
+        self.assertEqual(report['entries']["Open File"], {'occurrences': 2, 'overlapped': 1})
+        self.assertEqual(report['unmatched'], ["Missing"])
+        self.assertEqual(report['overlaps'][0]['inside'], "Say 'Open File' now")
+    
+    def test_reverse_patch(self):
+        """역패치 기록으로 원본이 정확히 복원되고, 변경된 번들에는 적용되지 않는지 확인"""
+        source = b'a="Open File",b=\'Close\''
+        patched, edits, regions = cursor_patcher.patch_bundle(source, {"Open File": "파일\n열기", "Close": "닫기"})
+        log = cursor_patcher.make_reverse_log(source, patched, edits, regions)
+        
+        self.assertEqual(cursor_patcher.reverse_patch(patched, log), source)
+        with self.assertRaises(ValueError):
+            cursor_patcher.reverse_patch(patched + b';', log)
+    
+    def test_verify_patch(self):
+        """정상 패치는 검증을 통과하고, 치환 구간 주변이 깨지면 검증에 실패하는지 확인"""
+        source = b'f(a,"Open File",[1,2])'
+        patched, edits, regions = cursor_patcher.patch_bundle(source, {"Open File": "파일 (열기"})
+        self.assertEqual(cursor_patcher.verify_patch(source, patched, edits, regions, full=True), [])
+        
+        broken = patched.replace(b'[1,2]', b'[1,2')
+        self.assertTrue(cursor_patcher.verify_patch(source, broken, edits, regions))
+    
+    def test_table_cache_eviction(self):
+        """디스크의 치환표 캐시가 최근에 쓴 max_files개만 남기는지 확인"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        cache_dir = Path(temp_dir) / "tables"
+        files = []
+        for index, text in enumerate(["열기", "닫기", "저장"]):
+            files.append(os.path.join(temp_dir, f"cursor_translations_{index}.json"))
+            with open(files[-1], 'w', encoding='utf-8') as f:
+                json.dump({"Open File": text}, f, ensure_ascii=False)
+        
+        def pickle_of(translation_file):
+            with open(translation_file, 'rb') as f:
+                return cursor_patcher.TableCache(cache_dir)._cache_file(hashlib.sha256(f.read()).hexdigest())
+        
+        # 0번, 1번 치환표를 만든 뒤 0번을 다시 쓰고 2번을 만들면 가장 오래 쓰지 않은 1번이 삭제됨
+        for age, translation_file in zip((200, 100), files[:2]):
+            cursor_patcher.TableCache(cache_dir, max_files=2).load(translation_file)
+            old = time.time() - age
+            os.utime(pickle_of(translation_file), (old, old))
+        cursor_patcher.TableCache(cache_dir, max_files=2).load(files[0])
+        cursor_patcher.TableCache(cache_dir, max_files=2).load(files[2])
+        
+        self.assertEqual(sorted(cache_dir.glob('*.pickle')), sorted([pickle_of(files[0]), pickle_of(files[2])]))
+
+class TestLanguageBundles(unittest.TestCase):
+    """언어별 미리 만든 번들 전환 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.js_file = Path(self.temp_dir) / "workbench.desktop.main.js"
+        self.js_file.write_bytes(b'a="Open File"')
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_switch_and_invalidate(self):
+        """언어 전환 후 원본으로 돌아오고, 번들이 바뀌면 미리 만든 번들이 폐기되는지 확인"""
+        store = cursor_bundles.BundleStore(self.js_file)
+        self.assertIsNotNone(store.build('ko', {"Open File": "파일 열기"}))
+        
+        self.assertTrue(store.switch('ko'))
+        self.assertEqual(self.js_file.read_bytes(), 'a="파일 열기"'.encode('utf-8'))
+        self.assertTrue(store.switch(cursor_bundles.ORIGINAL))
+        self.assertEqual(self.js_file.read_bytes(), b'a="Open File"')
+        
+        # Cursor 업데이트
+        self.js_file.write_bytes(b'b="Open File"')
+        self.assertFalse(store.switch('ko'))
+    
+    def test_switch_copies_and_skips_unchanged_hash(self):
+        """전환한 번들이 미리 만든 번들과 inode를 공유하지 않고, 바뀌지 않은 번들은 다시 해시하지 않는지 확인"""
+        store = cursor_bundles.BundleStore(self.js_file)
+        prebuilt = store.build('ko', {"Open File": "파일 열기"})
+        self.assertTrue(store.switch('ko'))
+        self.assertNotEqual(os.stat(self.js_file).st_ino, os.stat(prebuilt).st_ino)
+        
+        with patch('cursor_bundles._sha256', side_effect=AssertionError("hashed")):
+            self.assertTrue(cursor_bundles.BundleStore(self.js_file).switch(cursor_bundles.ORIGINAL))
+        self.assertEqual(prebuilt.read_bytes(), 'a="파일 열기"'.encode('utf-8'))
+
+class TestAsarArchive(unittest.TestCase):
+    """app.asar 읽기/쓰기 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.archive = Path(self.temp_dir) / "resources" / "app.asar"
+        self.archive.parent.mkdir()
+        
+        # 헤더: [4][pickle 크기] + [본문 크기][JSON 길이][JSON(4바이트 정렬)], 이어서 파일 내용
+        files = {"a.txt": b"first", "b.js": b'x="Open File"', "c.txt": b"third"}
+        header = {"files": {}}
+        offset = 0
+        for name, data in files.items():
+            header["files"][name] = {"size": len(data), "offset": str(offset)}
+            offset += len(data)
+        header_json = json.dumps(header).encode('utf-8')
+        header_json += b'\0' * ((4 - len(header_json) % 4) % 4)
+        payload = struct.pack('<I', len(json.dumps(header))) + header_json
+        with open(self.archive, 'wb') as f:
+            f.write(struct.pack('<II', 4, len(payload) + 4) + struct.pack('<I', len(payload)) + payload)
+            f.write(b''.join(files.values()))
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_splice_entry(self):
+        """바뀐 항목만 교체되고 뒤따르는 항목의 오프셋이 갱신되는지 확인"""
+        with cursor_asar.AsarArchive(self.archive) as archive:
+            self.assertEqual(archive.find_file("b.js"), "b.js")
+            archive.write(self.archive, {"b.js": 'x="파일 열기"'.encode('utf-8')})
+        
+        with cursor_asar.AsarArchive(self.archive) as archive:
+            self.assertEqual(archive.read("a.txt"), b"first")
+            self.assertEqual(archive.read("b.js").decode('utf-8'), 'x="파일 열기"')
+            self.assertEqual(archive.read("c.txt"), b"third")
+    
+    def test_unchanged_entries_round_trip(self):
+        """교체하지 않은 항목은 여러 조각으로 나누어 복사해도 바이트 단위로 같게 읽히는지 확인"""
+        with cursor_asar.AsarArchive(self.archive) as archive:
+            before = {path: bytes(archive.read(path)) for path, _ in archive.entries()}
+            with patch('cursor_asar.COPY_CHUNK_SIZE', 2):
+                archive.write(self.archive, {"b.js": b'x="Open Folder"'})
+        
+        with cursor_asar.AsarArchive(self.archive) as archive:
+            self.assertEqual(archive.read("a.txt"), before["a.txt"])
+            self.assertEqual(archive.read("c.txt"), before["c.txt"])
+            archive.write(self.archive, {})
+        with cursor_asar.AsarArchive(self.archive) as archive:
+            self.assertEqual({path: bytes(archive.read(path)) for path, _ in archive.entries()},
+                             dict(before, **{"b.js": b'x="Open Folder"'}))
+    
+    def test_refuses_integrity_checked_install(self):
+        """Info.plist에 ElectronAsarIntegrity가 있거나 무결성 퓨즈가 켜진 설치본의 아카이브는 고치지 않는지 확인"""
+        original = self.archive.read_bytes()
+        plist = Path(self.temp_dir) / "Info.plist"
+        plist.write_bytes(b"<key>ElectronAsarIntegrity</key>")
+        with cursor_asar.AsarArchive(self.archive) as archive:
+            with self.assertRaises(cursor_asar.AsarIntegrityError):
+                archive.write(self.archive, {"b.js": b'x="Open Folder"'})
+        self.assertEqual(self.archive.read_bytes(), original)
+        
+        plist.unlink()
+        executable = Path(self.temp_dir) / "Cursor.exe"
+        executable.write_bytes(b"MZ" + cursor_asar.FUSE_SENTINEL + b"\x01\x06" + b"011010")
+        self.assertEqual(len(cursor_asar.integrity_protection(self.archive)), 1)
+        executable.write_bytes(b"MZ" + cursor_asar.FUSE_SENTINEL + b"\x01\x06" + b"011000")
+        self.assertEqual(cursor_asar.integrity_protection(self.archive), [])
+
+class TestProductChecksums(unittest.TestCase):
+    """product.json 체크섬 갱신 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.app_dir = Path(self.temp_dir) / "resources" / "app"
+        self.js_file = self.app_dir / "out" / "vs" / "workbench" / "workbench.desktop.main.js"
+        self.js_file.parent.mkdir(parents=True)
+        self.product_file = self.app_dir / "product.json"
+        with open(self.product_file, 'w', encoding='utf-8') as f:
+            f.write('{\n\t"checksums": {\n\t\t"vs/workbench/workbench.desktop.main.js": "old"\n\t}\n}\n')
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_refresh_checksum(self):
+        """번들의 체크섬 값만 바뀌고 서식은 유지되는지 확인"""
+        digest = hashlib.sha256(b'patched').digest()
+        self.assertTrue(cursor_checksums.refresh_checksum(self.js_file, digest))
+        self.assertFalse(cursor_checksums.refresh_checksum(self.js_file, digest))
+        
+        with open(self.product_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        expected = base64.b64encode(digest).decode('ascii').rstrip('=')
+        self.assertEqual(json.loads(content)['checksums']['vs/workbench/workbench.desktop.main.js'], expected)
+        self.assertIn('\t\t"vs/workbench', content)
+
+class TestDeepLKeyPool(unittest.TestCase):
+    """DeepL 키 풀 라우팅 테스트"""
+    
+    @staticmethod
+    def _response(status_code, body=None):
+        response = MagicMock(status_code=status_code, ok=status_code == 200)
+        response.json.return_value = body or {}
+        return response
+    
+    def test_routing_and_quota_exhaustion(self):
+        """키 종류별 엔드포인트, 남은 한도 기준 선택, 한도 소진 키 제외 확인"""
+        usage = {
+            "https://api.deepl.com/v2/usage": {"character_count": 0, "character_limit": 1000},
+            "https://api-free.deepl.com/v2/usage": {"character_count": 0, "character_limit": 500000},
+        }
+        requests_sent = []
+        
+        def post(url, data=None, headers=None, timeout=None):
+            requests_sent.append((url, headers["Authorization"]))
+            if url.startswith("https://api-free"):
+                return self._response(456)
+            return self._response(200, {"translations": [{"text": f"[ko] {text}"} for text in data["text"]]})
+        
+        with patch('cursor_translator.requests.get', side_effect=lambda url, **kwargs: self._response(200, usage[url])), \
+                patch('cursor_translator.requests.post', side_effect=post):
+            translator = cursor_translator.DeepLTranslator("pro-key, free-key:fx")
+            self.assertTrue(translator.has_valid_key)
+            self.assertEqual(translator.batch_translate(["Open", "Save"], "ko"), ["[ko] Open", "[ko] Save"])
+            self.assertEqual(translator.batch_translate(["Close"], "ko"), ["[ko] Close"])
+        
+        # 한도가 많이 남은 Free 키를 먼저 쓰고, 456 이후에는 Pro 키로만 요청
+        self.assertEqual(requests_sent, [
+            ("https://api-free.deepl.com/v2/translate", "DeepL-Auth-Key free-key:fx"),
+            ("https://api.deepl.com/v2/translate", "DeepL-Auth-Key pro-key"),
+            ("https://api.deepl.com/v2/translate", "DeepL-Auth-Key pro-key"),
+        ])
+        self.assertEqual([key.api_key for key in translator.pool.live], ["pro-key"])
+        self.assertEqual(translator.pool.live[0].remaining, 1000 - len("OpenSaveClose"))
+
+class TestTranslationBackends(unittest.TestCase):
+    """번역 백엔드 실패 처리 및 번역 파일 갱신 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_file = os.path.join(self.temp_dir, "cursor_translations_template.json")
+        self.output_file = os.path.join(self.temp_dir, "cursor_translations_ko.json")
+        with open(self.template_file, 'w', encoding='utf-8') as f:
+            json.dump({"Delete": "", "Enable auto-run mode": "", "Open {0}": ""}, f)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _deepl(self, post):
+        usage = MagicMock(status_code=200, ok=True)
+        usage.json.return_value = {"character_count": 0, "character_limit": 500000}
+        with patch('cursor_translator.requests.get', return_value=usage):
+            translator = cursor_translator.DeepLTranslator("key:fx")
+        return translator, patch('cursor_translator.requests.post', side_effect=post)
+    
+    def test_failed_requests_not_saved(self):
+        """요청이 실패한 항목은 원문을 번역으로 저장하지 않고 다음 실행에서 다시 시도하는지 확인"""
+        def post(url, **kwargs):
+            raise cursor_translator.requests.ConnectionError("network down")
+        
+        translator, failing = self._deepl(post)
+        with failing:
+            self.assertEqual(translator.translate_protected(["Delete", "Open {0}"], "ko"), [None, None])
+            self.assertEqual(translator.update_translation_json(self.template_file, self.output_file, "ko", fuzzy=None),
+                             (0, 3))
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(set(json.load(f).values()), {""})
+    
+    def test_repair_torn_journal(self):
+        """잘린 마지막 줄은 잘라내고, 줄바꿈만 빠진 완결된 줄은 살린 뒤 이어서 추가하는지 확인"""
+        journal_file = f"{self.output_file}.journal.jsonl"
+        complete = json.dumps({'key': "Delete", 'value': "삭제"}, ensure_ascii=False)
+        for tail, expected in (('{"key": "Open {0}", "val', [("Delete", "삭제")]),
+                               (complete, [("Delete", "삭제"), ("Delete", "삭제")])):
+            with open(journal_file, 'w', encoding='utf-8') as f:
+                f.write(complete + '\n' + tail)
+            cursor_backends.TranslationBackend._repair_journal(journal_file)
+            with open(journal_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'key': "Open {0}", 'value': "{0} 열기"}, ensure_ascii=False) + '\n')
+            self.assertEqual(list(cursor_backends.TranslationBackend._read_journal(journal_file)),
+                             expected + [("Open {0}", "{0} 열기")])
+    
+    def test_resume_from_journal_with_torn_tail(self):
+        """중단된 실행의 저널 항목은 다시 번역하지 않고, 잘린 마지막 줄의 항목만 다시 번역하는지 확인"""
+        journal_file = f"{self.output_file}.journal.jsonl"
+        with open(journal_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'key': "Delete", 'value': "삭제"}, ensure_ascii=False) + '\n')
+            f.write('{"key": "Open {0}", "value": "{0} 열')
+        
+        backend = cursor_backends.FakeBackend()
+        with patch.object(backend, 'batch_translate', wraps=backend.batch_translate) as batch_translate:
+            self.assertEqual(backend.update_translation_json(self.template_file, self.output_file, "ko", fuzzy=None),
+                             (3, 3))
+        sent = [text for call in batch_translate.call_args_list for text in call.args[0]]
+        self.assertEqual(sorted(sent), ["Enable auto-run mode", "Open {0}"])
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {"Delete": "삭제", "Enable auto-run mode": "[ko] Enable auto-run mode",
+                                            "Open {0}": "[ko] Open {0}"})
+        self.assertFalse(os.path.exists(journal_file))
+    
+    def test_router_falls_through_on_miss(self):
+        """사전에 없는 항목만 다음 백엔드로 넘어가는지 확인"""
+        dictionary = cursor_backends.DictionaryBackend({"ko": {"Delete": "삭제"}})
+        fake = cursor_backends.FakeBackend()
+        router = cursor_backends.BackendRouter([dictionary, fake])
+        self.assertEqual([backend.name for backend in router.backends], ["dictionary", "fake"])
+        
+        with patch.object(fake, 'batch_translate', wraps=fake.batch_translate) as fallback:
+            self.assertEqual(router.translate_protected(["Delete", "Open {0}"], "ko"), ["삭제", "[ko] Open {0}"])
+        fallback.assert_called_once_with(["Open {0}"], "ko")
+    
+    def test_batches_sent_concurrently_in_order(self):
+        """배치가 max_concurrency개까지 동시에 보호된 채로 요청되고 저널에는 요청 순서대로 기록되는지 확인"""
+        class SlowBackend(cursor_backends.TranslationBackend):
+            name = 'slow'
+            max_concurrency = 2
+            
+            def __init__(self):
+                self.lock = threading.Lock()
+                self.active = 0
+                self.peak = 0
+                self.received = []
+            
+            def batch_translate(self, texts, target_lang):
+                with self.lock:
+                    self.active += 1
+                    self.peak = max(self.peak, self.active)
+                    self.received.extend(texts)
+                time.sleep(0.05)
+                with self.lock:
+                    self.active -= 1
+                return [f"[{target_lang}] {text}" for text in texts]
+        
+        backend = SlowBackend()
+        self.assertEqual(backend.update_translation_json(self.template_file, self.output_file, "ko",
+                                                         batch_size=1, fuzzy=None), (3, 3))
+        self.assertEqual(backend.peak, 2)
+        self.assertNotIn("Open {0}", backend.received)
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["Open {0}"], "[ko] Open {0}")
+        
+        batches = [([text], None) for text in ("a", "b", "c", "d", "e")]
+        self.assertEqual(list(backend.translate_batches(batches, "ko")),
+                         [["[ko] a"], ["[ko] b"], ["[ko] c"], ["[ko] d"], ["[ko] e"]])
+        self.assertEqual(backend.peak, 2)
+    
+    def test_translate_text_failure_returns_none(self):
+        """단일 텍스트 번역이 실패하면 원문 대신 None을 돌려주는지 확인"""
+        def post(url, **kwargs):
+            raise cursor_translator.requests.ConnectionError("network down")
+        
+        translator, failing = self._deepl(post)
+        with failing:
+            self.assertIsNone(translator.translate_text("Delete", "ko"))
+    
+    def test_exhausted_pool_stops_run(self):
+        """키 풀이 실행 도중 소진되면 남은 항목을 저장하지 않고 중단하며, 다음 실행이 저널에서 이어가는지 확인"""
+        sent = []
+        
+        def post(url, data=None, **kwargs):
+            sent.extend(data["text"])
+            response = MagicMock(status_code=200, ok=True)
+            response.json.return_value = {"translations": [{"text": f"[ko] {text}"} for text in data["text"]]}
+            return response
+        
+        def exhaust_after_first(url, data=None, **kwargs):
+            if sent:
+                return MagicMock(status_code=456, ok=False)
+            return post(url, data)
+        
+        translator, exhausting = self._deepl(exhaust_after_first)
+        # 첫 배치 다음부터 소진되도록 배치를 하나씩 보냄
+        translator.max_concurrency = 1
+        with exhausting:
+            with self.assertRaises(cursor_backends.BackendUnavailable):
+                translator.update_translation_json(self.template_file, self.output_file, "ko", batch_size=1, fuzzy=None)
+        self.assertFalse(os.path.exists(self.output_file))
+        journal_file = f"{self.output_file}.journal.jsonl"
+        self.assertEqual(len(list(cursor_backends.TranslationBackend._read_journal(journal_file))), 1)
+        
+        sent.clear()
+        translator, working = self._deepl(post)
+        with working:
+            self.assertEqual(translator.update_translation_json(self.template_file, self.output_file, "ko", fuzzy=None),
+                             (3, 3))
+        self.assertEqual(len(sent), 2)
+        self.assertFalse(os.path.exists(journal_file))
+
+class TestTranslationService(unittest.TestCase):
+    """번역 서비스의 요청 검증 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.bundle = os.path.join(self.temp_dir, "workbench.desktop.main.js")
+        self.service = cursor_service.TranslationService(lambda *args: 1, self.temp_dir, workers=1,
+                                                          allowed_roots=[self.temp_dir])
+        self.server = cursor_service.ThreadingHTTPServer(
+            ('127.0.0.1', 0), cursor_service._make_handler(self.service, "secret"))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.port = self.server.server_port
+    
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.executor.shutdown(wait=True)
+        shutil.rmtree(self.temp_dir)
+    
+    def _post(self, body, headers):
+        connection = http.client.HTTPConnection('127.0.0.1', self.port)
+        connection.request('POST', '/jobs', json.dumps(body), headers)
+        status = connection.getresponse().status
+        connection.close()
+        return status
+    
+    def test_rejects_paths_outside_allowed_roots(self):
+        """허용된 디렉토리 밖의 경로는 거부하는지 확인"""
+        for request in ({'bundle': '/etc/passwd', 'language': 'ko'},
+                        {'bundle': self.bundle, 'translation_file': os.path.join(self.temp_dir, '..', 'x.json')},
+                        {'bundle': self.bundle, 'language': '../ko'}):
+            with self.assertRaises(ValueError):
+                self.service.submit(request)
+        job_id = self.service.submit({'bundle': self.bundle, 'language': 'ko'})
+        self.assertIn('future', self.service.jobs[job_id])
+    
+    def test_requires_token_local_host_and_json(self):
+        """토큰, 로컬 Host/Origin, JSON Content-Type이 없는 요청은 거부하는지 확인"""
+        body = {'bundle': self.bundle, 'action': 'extract'}
+        ok = {'Authorization': 'Bearer secret', 'Content-Type': 'application/json'}
+        self.assertEqual(self._post(body, {'Content-Type': 'application/json'}), 403)
+        self.assertEqual(self._post(body, dict(ok, Authorization='Bearer wrong')), 403)
+        self.assertEqual(self._post(body, dict(ok, Host='evil.example')), 403)
+        self.assertEqual(self._post(body, dict(ok, Origin='http://evil.example')), 403)
+        self.assertEqual(self._post(body, dict(ok, **{'Content-Type': 'text/plain'})), 415)
+        self.assertEqual(self._post(body, dict(ok, Origin='http://localhost:8765')), 202)
+
+class TestTranslationPlanner(unittest.TestCase):
+    """번역 비용 계획과 글자 수 예산 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_file = os.path.join(self.temp_dir, "cursor_translations_template.json")
+        self.ko_file = os.path.join(self.temp_dir, "cursor_translations_ko.json")
+        sources = ["Open File", "open file", "Save", "Files that were opened recently appear here.", "Settings"]
+        with open(self.template_file, 'w', encoding='utf-8') as f:
+            json.dump({source: "" for source in sources}, f)
+        with open(self.ko_file, 'w', encoding='utf-8') as f:
+            json.dump({"Save": "저장"}, f, ensure_ascii=False)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_plan_and_budget(self):
+        """정규화된 미번역 원문만 세고, 예산 안에서 설정 문자열부터 번역하는지 확인"""
+        plan = cursor_planner.plan_translation(self.template_file, ["ko"], self.temp_dir, budget=17)
+        self.assertEqual(plan.work["ko"], ["Open File", "Files that were opened recently appear here.", "Settings"])
+        self.assertEqual(plan.scheduled["ko"], ["Settings", "Open File"])
+        self.assertEqual(plan.deferred["ko"], ["Files that were opened recently appear here."])
+        self.assertEqual(plan.characters("ko"), 17)
+        
+        backend = cursor_backends.FakeBackend()
+        backend.update_translation_json(self.template_file, self.ko_file, "ko", fuzzy=None, char_budget=17)
+        with open(self.ko_file, 'r', encoding='utf-8') as f:
+            translated = json.load(f)
+        self.assertEqual(translated["Open File"], "[ko] Open File")
+        self.assertTrue(translated["open file"])
+        self.assertEqual(translated["Settings"], "[ko] Settings")
+        self.assertEqual(translated["Files that were opened recently appear here."], "")
+        
+        plan = cursor_planner.plan_translation(self.template_file, ["ko"], self.temp_dir)
+        self.assertEqual(plan.work["ko"], ["Files that were opened recently appear here."])
+
+class TestCursorFinder(unittest.TestCase):
+    """Cursor 설치 경로 캐시 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cursor_path = Path(self.temp_dir) / "cursor"
+        (self.cursor_path / "resources").mkdir(parents=True)
+        (self.cursor_path / "resources" / "app.asar").write_bytes(b"")
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_cached_installation_skips_discovery(self):
+        """캐시된 경로가 있으면 시스템 검색 없이 사용하는지 확인"""
+        with patch.object(Path, 'home', return_value=Path(self.temp_dir)):
+            finder = cursor_finder.CursorFinder()
+            with patch.dict(os.environ, {'CURSOR_PATH': ''}):
+                self.assertIsNone(finder.cached_installation())
+            
+            finder._save_cached_path(str(self.cursor_path))
+            with patch.object(finder, '_find_in_linux') as mock_find, \
+                    patch.object(finder, '_find_in_wsl') as mock_wsl:
+                self.assertEqual(finder.find_cursor_installation(), str(self.cursor_path))
+                mock_find.assert_not_called()
+                mock_wsl.assert_not_called()
+
+class TestNlsTables(unittest.TestCase):
+    """NLS 메시지 테이블 번역 적용 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.nls_file = os.path.join(self.temp_dir, "nls.messages.json")
+        self.original_file = self.nls_file + ".original"
+        self.state_file = self.nls_file + ".translator.json"
+        self.translation_file = os.path.join(self.temp_dir, "cursor_translations_ko.json")
+        with open(self.nls_file, 'w', encoding='utf-8') as f:
+            json.dump(["Open", "Save"], f)
+        with open(self.translation_file, 'w', encoding='utf-8') as f:
+            json.dump({"Open": "열기", "Save": "저장", "Close": "닫기"}, f, ensure_ascii=False)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _load(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def test_missing_state_keeps_original(self):
+        """상태 파일이 없거나 손상되어도 번역된 테이블로 원본을 덮어쓰지 않는지 확인"""
+        self.assertTrue(main.apply_nls_translations(self.nls_file, self.translation_file))
+        self.assertEqual(self._load(self.nls_file), ["열기", "저장"])
+        
+        os.remove(self.state_file)
+        self.assertTrue(main.apply_nls_translations(self.nls_file, self.translation_file))
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            f.write('{"applied_sha256": ')
+        self.assertTrue(main.apply_nls_translations(self.nls_file, self.translation_file))
+        self.assertEqual(self._load(self.original_file), ["Open", "Save"])
+    
+    def test_updated_table_replaces_original(self):
+        """업데이트로 새 테이블이 설치되면 원본 보관본을 새 테이블로 바꾸는지 확인"""
+        self.assertTrue(main.apply_nls_translations(self.nls_file, self.translation_file))
+        with open(self.nls_file, 'w', encoding='utf-8') as f:
+            json.dump(["Open", "Save", "Close"], f)
+        self.assertTrue(main.apply_nls_translations(self.nls_file, self.translation_file))
+        self.assertEqual(self._load(self.original_file), ["Open", "Save", "Close"])
+        self.assertEqual(self._load(self.nls_file), ["열기", "저장", "닫기"])
+
+class TestBundleWatcher(unittest.TestCase):
+    """번들 변경 감시 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.bundle_dir = os.path.join(self.temp_dir, "workbench")
+        self.js_file = os.path.join(self.bundle_dir, "workbench.desktop.main.js")
+        os.makedirs(self.bundle_dir)
+        with open(self.js_file, 'w', encoding='utf-8') as f:
+            f.write('x={"label":"Open"};')
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_removed_directory_waits_without_spinning(self):
+        """감시 디렉토리가 지워진 채로 남아 있으면 변경으로 보고하지 않고 간격을 두고 기다리는지 확인"""
+        watcher = cursor_watcher.BundleWatcher(self.js_file, debounce=0.05, poll_interval=0.05)
+        signature = watcher._signature
+        calls = []
+        def counting_signature():
+            calls.append(1)
+            return signature()
+        watcher._signature = counting_signature
+        
+        thread = threading.Thread(target=watcher.wait_for_change, daemon=True)
+        thread.start()
+        shutil.rmtree(self.bundle_dir)
+        time.sleep(0.5)
+        self.assertTrue(thread.is_alive())
+        self.assertIsNone(watcher.signature)
+        self.assertLess(len(calls), 30)
+        
+        # 번들이 다시 생기면 변경으로 보고
+        os.makedirs(self.bundle_dir)
+        with open(self.js_file, 'w', encoding='utf-8') as f:
+            f.write('x={"label":"Open Folder"};')
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+        if watcher._inotify:
+            watcher._inotify.close()
+
+class TestTranslationEditor(unittest.TestCase):
+    """번역 편집기 데이터 테스트"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, "cursor_translations_template.json.previous"), 'w', encoding='utf-8') as f:
+            json.dump({"Open File": "", "Save": ""}, f)
+        with open(os.path.join(self.temp_dir, "cursor_translations_template.json"), 'w', encoding='utf-8') as f:
+            json.dump({"Open File": "", "Save": "", "Open &&Recent": "", "Opened {0} files.": ""}, f)
+        self.ko_file = os.path.join(self.temp_dir, "cursor_translations_ko.json")
+        with open(self.ko_file, 'w', encoding='utf-8') as f:
+            json.dump({"Open File": "파일 열기", "Save": "저장"}, f, ensure_ascii=False, indent=2)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_filter(self):
+        """검색어, 미번역, 변경됨, 유형 필터 확인"""
+        store = cursor_editor.TranslationEditorStore('ko', self.temp_dir)
+        source = lambda ids: [store.source(source_id) for source_id in ids]
+        self.assertEqual(source(store.filter("OPEN")), ["Open File", "Open &&Recent", "Opened {0} files."])
+        self.assertEqual(source(store.filter("열기")), ["Open File"])
+        self.assertEqual(source(store.filter(untranslated=True)), ["Open &&Recent", "Opened {0} files."])
+        self.assertEqual(source(store.filter(changed=True)), ["Open &&Recent", "Opened {0} files."])
+        self.assertEqual(source(store.filter(key_type='menu')), ["Open &&Recent"])
+        self.assertEqual(source(store.filter(key_type='placeholder')), ["Opened {0} files."])
+    
+    def test_save_only_edited_lines(self):
+        """저장 시 편집한 줄만 바뀌는지 확인"""
+        store = cursor_editor.TranslationEditorStore('ko', self.temp_dir)
+        store.set_translation(store.filter("Save")[0], "저장하기")
+        store.set_translation(store.filter("Recent")[0], "최근 항목 열기(&&R)")
+        self.assertEqual(store.save(), 2)
+        
+        with open(self.ko_file, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[1], '  "Open File": "파일 열기",')
+        self.assertEqual(lines[2], '  "Save": "저장하기",')
+        with open(self.ko_file, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        self.assertEqual(saved["Open &&Recent"], "최근 항목 열기(&&R)")
+        self.assertEqual(store.filter(untranslated=True), store.filter("Opened"))
+    
+    def test_save_compact_file(self):
+        """indent 없이 한 줄로 저장된 번역 파일도 올바른 JSON으로 병합되는지 확인"""
+        with open(self.ko_file, 'w', encoding='utf-8') as f:
+            json.dump({"Open File": "파일 열기", "Save": "저장"}, f, ensure_ascii=False)
+        store = cursor_editor.TranslationEditorStore('ko', self.temp_dir)
+        store.set_translation(store.filter("Save")[0], "저장하기")
+        self.assertEqual(store.save(), 1)
+        
+        with open(self.ko_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {"Open File": "파일 열기", "Save": "저장하기"})
+    
+    def test_save_escaped_key(self):
+        """\\uXXXX로 이스케이프된 원문이 중복 추가되지 않고 갱신되는지 확인"""
+        with open(os.path.join(self.temp_dir, "cursor_translations_template.json"), 'w', encoding='utf-8') as f:
+            json.dump({"Open File": "", "Save…": ""}, f)
+        with open(self.ko_file, 'w', encoding='utf-8') as f:
+            json.dump({"Open File": "파일 열기", "Save…": "저장…"}, f, indent=2)
+        store = cursor_editor.TranslationEditorStore('ko', self.temp_dir)
+        store.set_translation(store.filter("Save")[0], "다른 이름으로 저장…")
+        self.assertEqual(store.save(), 1)
+        
+        with open(self.ko_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        self.assertEqual(json.loads(content), {"Open File": "파일 열기", "Save…": "다른 이름으로 저장…"})
+        self.assertEqual(content.count("Save"), 1)
+    
+    def test_filter_uses_edits_snapshot(self):
+        """검색 스레드에 넘긴 편집 내용 복사본으로 검색하는지 확인"""
+        store = cursor_editor.TranslationEditorStore('ko', self.temp_dir)
+        save_id = store.filter("Save")[0]
+        snapshot = {save_id: "보관"}
+        store.set_translation(save_id, "저장하기")
+        self.assertEqual(store.filter("보관", edits=snapshot), [save_id])
+        self.assertEqual(store.filter("보관"), [])
+
 # 테스트 실행
 if __name__ == '__main__':
     print("=" * 60)